@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Точка входа для запуска бенчмарков на локальном тестовом сервере
+"""
+
+import sys
+import os
+
+# Добавляем текущую директорию в путь Python
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.run_benchmarks import main
+
+if __name__ == "__main__":
+    sys.exit(main())
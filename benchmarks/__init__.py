@@ -0,0 +1 @@
+"""Бенчмарки парсера и локальная замена сайта DSEI"""
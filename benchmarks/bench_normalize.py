@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк нормализации текста: прежние функции utils против src/normalize.py
+
+Значения полей берутся со страниц тестового сервера (имя, должность,
+компания, страна, описание, время сессии), как при настоящем парсинге.
+
+Использование:
+    python -m benchmarks.bench_normalize [--speakers 1000] [--repeat 5]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockConfig, detail_page, listing_page
+from config.settings import SPEAKER_ENTRY_CLASS
+from src.normalize import clean_text, extract_slug_from_javascript, parse_session_time
+from src.parsing import index_by_class, parse_html, resolve_backend
+
+
+def legacy_clean_text(text: str) -> str:
+    """clean_text до переноса в src/normalize.py"""
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text.strip())
+    text = text.replace('&nbsp;', ' ')
+    text = text.replace('&amp;', '&')
+    text = text.replace('&lt;', '<')
+    text = text.replace('&gt;', '>')
+    text = text.replace('&quot;', '"')
+    text = text.replace('&#39;', "'")
+    return text.strip()
+
+
+def legacy_extract_slug(js_text: str) -> str:
+    match = re.search(r"speakers/([^'\"]+)", js_text)
+    return match.group(1) if match else ""
+
+
+def legacy_parse_session_time(time_text: str) -> str:
+    if not time_text:
+        return ""
+    match = re.search(r'(\d{2}:\d{2})\s*[–-]\s*(\d{2}:\d{2})', time_text)
+    if match:
+        return f"{match.group(1)} – {match.group(2)}"
+    return legacy_clean_text(time_text)
+
+
+def collect_samples(speakers: int) -> Dict[str, List[str]]:
+    """Сырые тексты полей и ссылок со страниц тестового сервера"""
+    config = MockConfig(speakers=speakers, page_kb=0)
+    backend = resolve_backend('auto')
+    fields, times, hrefs = [], [], []
+
+    for index in range(speakers):
+        root = parse_html(detail_page(index, config).encode('utf-8'), backend, SPEAKER_ENTRY_CLASS)
+        for (tag, class_name), node in index_by_class(root, SPEAKER_ENTRY_CLASS).items():
+            if class_name.endswith('__time'):
+                times.append(node.text())
+            elif tag in ('h2', 'span') or class_name.endswith(('__country', '__description', '__date')):
+                fields.append(node.text())
+
+    for page in range(1, config.pages + 1):
+        root = parse_html(listing_page(page, config).encode('utf-8'), backend)
+        hrefs.extend(link.attr('href') for link in root.find_all('a'))
+
+    return {'clean_text': fields, 'parse_session_time': times, 'extract_slug': hrefs}
+
+
+def run(func: Callable[[str], str], values: List[str], repeat: int) -> float:
+    """Лучшее время обработки всех values, мс"""
+    return min(timeit.repeat(lambda: [func(value) for value in values], repeat=repeat, number=1)) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Микробенчмарк нормализации текста")
+    parser.add_argument("--speakers", type=int, default=1000, help="Количество спикеров в выборке")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов замера")
+    args = parser.parse_args()
+
+    samples = collect_samples(args.speakers)
+    pairs = {
+        'clean_text': (legacy_clean_text, clean_text),
+        'parse_session_time': (legacy_parse_session_time, parse_session_time),
+        'extract_slug': (legacy_extract_slug, extract_slug_from_javascript),
+    }
+
+    print(f"=== НОРМАЛИЗАЦИЯ ({args.speakers} спикеров) ===")
+    mismatches = 0
+    for name, (legacy, current) in pairs.items():
+        values = samples[name]
+        mismatches += sum(legacy(value) != current(value) for value in values)
+        before = run(legacy, values, args.repeat)
+        after = run(current, values, args.repeat)
+        print(f"  {name:<20} {len(values):>6} значений: {before:8.2f} мс -> {after:8.2f} мс "
+              f"(x{before / after:.1f})")
+
+    if mismatches:
+        print(f"\n⚠️  Результаты различаются на {mismatches} значениях")
+        return 1
+    print("\n✅ Результаты совпадают")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Память и скорость экспорта: список Speaker против колоночной SpeakerTable
+
+Записи строятся так же, как при парсинге тестового сервера (повторяются
+страны, компании, даты и места сессий). Проверяется, что экспорт таблицы
+побайтно совпадает с выводом CSVSink и JSONLSink.
+
+Использование:
+    python -m benchmarks.bench_table [--speakers 100000]
+"""
+
+import argparse
+import filecmp
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import COMPANIES, COUNTRIES, POSITIONS, STAGES, speaker_name, speaker_slug
+from src.models import Speaker
+from src.sinks import open_sink
+from src.table import SpeakerTable
+
+
+def fresh(value: str) -> str:
+    """Копия строки отдельным объектом - как значение, заново извлеченное со страницы"""
+    return value.encode('utf-8').decode('utf-8')
+
+
+def make_speakers(count: int) -> List[Speaker]:
+    """Записи как с тестового сервера (повторяющиеся значения - разные объекты строк)"""
+    speakers = []
+    for index in range(count):
+        session = index % 40
+        speakers.append(Speaker(
+            speaker_url=f"https://www.dsei.co.uk/speakers/{speaker_slug(index)}",
+            speaker_slug=speaker_slug(index),
+            name=speaker_name(index),
+            position=fresh(POSITIONS[index % 6]),
+            company=fresh(COMPANIES[index % 6]),
+            country=fresh(COUNTRIES[index % 6]),
+            description=f"{speaker_name(index)} has more than {index % 30 + 5} years of experience in defence procurement.",
+            social_network=f"https://www.linkedin.com/in/{speaker_slug(index)}; https://twitter.com/{speaker_slug(index)}",
+            session_date=f"{9 + index % 3} September 2025",
+            session_time=f"{10 + index % 8}:00 – {11 + index % 8}:00",
+            session_location=fresh(STAGES[session % 5]),
+            session_topic_link=f"https://www.dsei.co.uk/sessions/session-{session}",
+            session_topic_title=f"Future of Defence & Security {session}",
+        ))
+    return speakers
+
+
+def measure_memory(build) -> tuple:
+    """Прирост памяти после build() в МБ (объект остается живым до конца замера)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024
+
+
+def timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def write_with_sink(speakers: List[Speaker], filename: str, output_format: str) -> None:
+    with open_sink(filename, output_format, 1000) as sink:
+        for speaker in speakers:
+            sink.write(speaker)
+        sink.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Память и экспорт: список Speaker против SpeakerTable")
+    parser.add_argument("--speakers", type=int, default=100000, help="Количество записей")
+    args = parser.parse_args()
+
+    speakers, list_mb = measure_memory(lambda: make_speakers(args.speakers))
+    table, table_mb = measure_memory(lambda: SpeakerTable.from_speakers(make_speakers(args.speakers)))
+
+    print(f"=== {args.speakers} СПИКЕРОВ ===")
+    print(f"  Память: список Speaker {list_mb:.1f} МБ, SpeakerTable {table_mb:.1f} МБ")
+
+    identical = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for output_format in ('csv', 'jsonl'):
+            sink_file = os.path.join(tmp, f'sink.{output_format}')
+            table_file = os.path.join(tmp, f'table.{output_format}')
+            sink_time = timed(lambda: write_with_sink(speakers, sink_file, output_format))
+            table_time = timed(lambda: table.export(table_file, output_format))
+            same = filecmp.cmp(sink_file, table_file, shallow=False)
+            identical = identical and same
+            print(f"  {output_format:<8} sink {sink_time:.3f} сек, таблица {table_time:.3f} сек"
+                  f"{'' if same else '  ❌ файлы различаются'}")
+
+        try:
+            parquet_file = os.path.join(tmp, 'table.parquet')
+            parquet_time = timed(lambda: table.export(parquet_file, 'parquet'))
+            print(f"  parquet  таблица {parquet_time:.3f} сек, "
+                  f"{os.path.getsize(parquet_file) / 1024 / 1024:.1f} МБ "
+                  f"(CSV {os.path.getsize(os.path.join(tmp, 'table.csv')) / 1024 / 1024:.1f} МБ)")
+            csv_load = timed(lambda: SpeakerTable.load(os.path.join(tmp, 'table.csv')))
+            parquet_load = timed(lambda: SpeakerTable.load(parquet_file))
+            print(f"  загрузка CSV {csv_load:.3f} сек, Parquet {parquet_load:.3f} сек")
+        except ValueError as e:
+            print(f"  parquet  {e}")
+
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
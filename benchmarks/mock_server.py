@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Локальная замена сайта DSEI для бенчмарков и отладки без сети
+
+Отдает синтетические страницы списка (ссылки openRemoteModal и пагинация)
+и детальные страницы с разметкой m-speaker-entry. Можно задать задержку
+ответа и долю ошибок 429/503.
+
+Запуск отдельно:
+    python -m benchmarks.mock_server --speakers 1000 --port 8765 [--latency 0.02] [--error-rate 0.05]
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+
+FIRST_NAMES = ('Alex', 'Maria', 'John', 'Olga', 'James', 'Anna', 'Peter', 'Helen', 'David', 'Sofia')
+LAST_NAMES = ('Smith', 'Brown', 'Taylor', 'Wilson', 'Evans', 'Thomas', 'Johnson', 'Roberts', 'Walker', 'Wright')
+POSITIONS = ('Chief Executive Officer', 'Director of Strategy', 'Head of Procurement',
+             'Programme Manager', 'Chief Engineer', 'Minister of Defence')
+COMPANIES = ('BAE Systems', 'Thales UK', 'Leonardo', 'QinetiQ', 'Ministry of Defence', 'Babcock')
+COUNTRIES = ('United Kingdom', 'France', 'Germany', 'Italy', 'United States', 'Poland')
+STAGES = ('Main Stage', 'Land Theatre', 'Sea Theatre', 'Air Theatre', 'Security Hub')
+
+
+@dataclass
+class MockConfig:
+    """Параметры синтетического сайта"""
+
+    speakers: int = 100
+    per_page: int = 20
+    latency: float = 0.0  # секунды на ответ
+    jitter: float = 0.0  # случайная добавка к задержке, секунды
+    error_rate: float = 0.0  # доля ответов 429/503
+    retry_after: int = 0  # значение Retry-After в ответах с ошибкой
+    page_kb: int = 30  # примерный размер "обвязки" страницы (шапка, меню, подвал)
+    seed: int = 0
+    missing: int = 0  # последние спикеры списка без детальной страницы (404)
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.speakers // self.per_page))
+
+
+def speaker_slug(index: int) -> str:
+    return f"{FIRST_NAMES[index % 10].lower()}-{LAST_NAMES[index // 10 % 10].lower()}-{index}"
+
+
+def speaker_name(index: int) -> str:
+    return f"{FIRST_NAMES[index % 10]} {LAST_NAMES[index // 10 % 10]} {index}"
+
+
+def boilerplate(page_kb: int) -> str:
+    """Шапка и меню сайта: объем разметки, которую парсер разбирает впустую"""
+    items = []
+    size = 0
+    number = 0
+    while size < page_kb * 1024:
+        item = (f'<li class="c-nav__item"><a class="c-nav__link" href="/section/{number}">'
+                f'Section {number}</a></li>')
+        items.append(item)
+        size += len(item)
+        number += 1
+    return (f'<header class="c-header"><nav class="c-nav"><ul>{"".join(items)}</ul></nav></header>'
+            '<script>window.dataLayer = window.dataLayer || []; function gtag(){dataLayer.push(arguments);}</script>'
+            '<style>.c-nav__item { display: inline-block; }</style>')
+
+
+def page_shell(body: str, config: MockConfig, title: str) -> str:
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title} | DSEI</title></head>'
+            f'<body>{boilerplate(config.page_kb)}<main>{body}</main>'
+            '<footer class="c-footer"><p>&copy; Clarion Defence &amp; Security</p></footer></body></html>')
+
+
+def listing_page(page: int, config: MockConfig) -> str:
+    """Страница списка спикеров: ссылки openRemoteModal и пагинация"""
+    start = (page - 1) * config.per_page
+    entries = []
+    for index in range(start, min(start + config.per_page, config.speakers)):
+        entries.append(
+            f'<div class="m-speakers-list__items__item">'
+            f'<a href="javascript:openRemoteModal(\'speakers/{speaker_slug(index)}\', \'speaker\')" '
+            f'aria-label="{speaker_name(index)}" class="m-speakers-list__items__item__header__title__link">'
+            f'{speaker_name(index)}</a></div>'
+        )
+    pagination = ''.join(
+        f'<li><a href="?sortby=personSurname%20asc&amp;page={number}">{number}</a></li>'
+        for number in range(1, config.pages + 1)
+    )
+    body = (f'<div class="m-speakers-list"><div class="m-speakers-list__items">{"".join(entries)}</div>'
+            f'<ul class="m-speakers-list__pagination">{pagination}</ul></div>')
+    return page_shell(body, config, f"Speakers - page {page}")
+
+
+def detail_page(index: int, config: MockConfig) -> str:
+    """Детальная страница спикера в разметке m-speaker-entry с двумя сессиями"""
+    sessions = []
+    for number in range(2):
+        session = (index + number) % 40
+        sessions.append(
+            f'<li class="m-speaker-entry__item__sessions__list__item">'
+            f'<div class="m-speaker-entry__item__sessions__list__item__date">{9 + number} September 2025</div>'
+            f'<div class="m-speaker-entry__item__sessions__list__item__time">\n  {10 + number}:00 -\n  {11 + number}:00 </div>'
+            f'<div class="m-speaker-entry__item__sessions__list__item__stream">{STAGES[session % 5]}</div>'
+            f'<a class="m-speaker-entry__item__sessions__list__item__title" href="/sessions/session-{session}">'
+            f'Future of Defence &amp; Security {session}</a></li>'
+        )
+    body = f'''<div class="m-speaker-entry"><div class="m-speaker-entry__item">
+<h2 class="m-speaker-entry__item__title">  {speaker_name(index)} </h2>
+<div class="m-speaker-entry__item__details">
+<span class="m-speaker-entry__item__details__position">{POSITIONS[index % 6]},</span>
+<span class="m-speaker-entry__item__details__company">{COMPANIES[index % 6]}</span>
+<div class="m-speaker-entry__item__details__company__country">{COUNTRIES[index % 6]}</div>
+</div>
+<div class="m-speaker-entry__item__description"><p>{speaker_name(index)} has more than {index % 30 + 5} years
+of experience in defence&nbsp;procurement.</p><p>Previously worked at {COMPANIES[(index + 1) % 6]}.</p></div>
+<ul class="m-speaker-entry__item__social"><li><a href="https://www.linkedin.com/in/{speaker_slug(index)}">LinkedIn</a></li>
+<li><a href="https://twitter.com/{speaker_slug(index)}">Twitter</a></li></ul>
+<div class="m-speaker-entry__item__sessions"><ul class="m-speaker-entry__item__sessions__list">{"".join(sessions)}</ul></div>
+</div></div>'''
+    return page_shell(body, config, speaker_name(index))
+
+
+def session_page(session: str, config: MockConfig) -> str:
+    body = f'<h1>{session}</h1><p>Session description.</p>'
+    return page_shell(body, config, session).replace(
+        '<head>', f'<head><meta property="og:description" content="About {session}">', 1)
+
+
+def make_handler(config: MockConfig):
+    slugs = {speaker_slug(index): index for index in range(config.speakers - config.missing)}
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        # HTTP/1.1 - соединения переиспользуются, как на настоящем сайте
+        protocol_version = 'HTTP/1.1'
+        # Заголовки и тело уходят отдельными записями: без TCP_NODELAY ответ ждет задержанного ACK
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_empty(self, status: int, **headers: str) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name.replace('_', '-'), value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query)
+            path = parts.path.rstrip('/')
+
+            if path == '/forums/overview/speakers':
+                try:
+                    page = int(query.get('page', ['1'])[0])
+                except ValueError:
+                    page = 1
+                body = listing_page(page, config)
+            elif path.startswith('/speakers/') and path[len('/speakers/'):] in slugs:
+                body = detail_page(slugs[path[len('/speakers/'):]], config)
+            elif path.startswith('/sessions/'):
+                body = session_page(path[len('/sessions/'):], config)
+            else:
+                self.send_empty(404)
+                return
+
+            with rng_lock:
+                delay = config.latency + rng.uniform(0, config.jitter)
+                failed = rng.random() < config.error_rate
+                status = rng.choice((429, 503))
+            if delay > 0:
+                time.sleep(delay)
+            if failed:
+                self.send_empty(status, Retry_After=str(config.retry_after))
+                return
+
+            content = body.encode('utf-8')
+            etag = '"' + hashlib.md5(content).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_empty(304, ETag=etag)
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(content)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(content)
+
+    return Handler
+
+
+def serve(config: MockConfig, port: int = 0, ready: Optional[multiprocessing.Queue] = None) -> None:
+    """Запускает сервер и обслуживает запросы до завершения процесса"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(config))
+    server.daemon_threads = True
+    if ready is not None:
+        ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+@contextmanager
+def running_server(config: MockConfig) -> Iterator[str]:
+    """Сервер в отдельном процессе (не делит GIL с парсером), отдает его базовый URL"""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(config, 0, ready), daemon=True)
+    process.start()
+    try:
+        port = ready.get(timeout=30)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальная замена сайта DSEI")
+    parser.add_argument("--speakers", type=int, default=100, help="Количество спикеров")
+    parser.add_argument("--per-page", type=int, default=20, help="Спикеров на странице списка")
+    parser.add_argument("--port", type=int, default=8765, help="Порт")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа, сек")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Случайная добавка к задержке, сек")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 429/503")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After в ответах с ошибкой, сек")
+    parser.add_argument("--page-kb", type=int, default=30, help="Размер обвязки страницы, КБ")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора ошибок")
+    parser.add_argument("--missing", type=int, default=0, help="Спикеров в конце списка без детальной страницы")
+    args = parser.parse_args()
+
+    config = MockConfig(args.speakers, args.per_page, args.latency, args.jitter,
+                        args.error_rate, args.retry_after, args.page_kb, args.seed, args.missing)
+    print(f"Сервер: http://127.0.0.1:{args.port} ({config.speakers} спикеров, {config.pages} страниц)")
+    serve(config, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки парсера на локальном тестовом сервере (без обращения к сайту)
+
+Замеряет полный прогон DSEISpeakerScraper.run() и его этапы на 100, 1000
+и 10000 спикеров, а также разбор и извлечение одной страницы каждым
+установленным HTML-парсером. Результат сохраняется в data/benchmarks/
+и сравнивается с предыдущим сохраненным результатом.
+
+Использование:
+    python benchmark.py [--sizes 100 1000] [--workers 8] [--latency 0.01] [--error-rate 0.02]
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockConfig, detail_page, listing_page, running_server
+from config.settings import (
+    BENCHMARK_DIR, BENCHMARK_SIZES, LISTING_HREF_MARKERS, SPEAKER_ENTRY_CLASS, TRANSPORT
+)
+from src.parsing import AUTO_ORDER, is_available, parse_html, parse_links
+from src.scraper import DSEISpeakerScraper
+from src.transport import TRANSPORTS
+
+# Этапы из отчета Metrics, которые попадают в результат
+STAGES = ('get_page', 'request', 'ttfb', 'parse', 'extract', 'write', 'rate_limit_wait')
+
+
+def quiet(scraper: DSEISpeakerScraper) -> DSEISpeakerScraper:
+    """Отключает построчный лог запросов: на 10000 спикеров он заметно влияет на время"""
+    scraper.logger.setLevel(logging.WARNING)
+    return scraper
+
+
+def bench_run(size: int, args) -> Dict[str, Any]:
+    """Полный прогон run() на тестовом сервере с size спикерами"""
+    config = MockConfig(speakers=size, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, page_kb=args.page_kb)
+    with running_server(config) as base_url, tempfile.TemporaryDirectory() as tmp:
+        scraper = quiet(DSEISpeakerScraper(
+            base_url=base_url,
+            max_workers=args.workers,
+            requests_per_second=0,  # без ограничения: замеряется сам парсер
+            adaptive=False,
+            output_file=os.path.join(tmp, 'speakers.csv'),
+            parser_backend=args.parser,
+            transport=args.transport,
+            metrics_file=None,
+            # Журнал во временном каталоге, чтобы не затронуть журнал настоящего прогона
+            checkpoint_file=os.path.join(tmp, 'checkpoint.jsonl')
+        ))
+
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            scraper.run()
+        wall = time.perf_counter() - started
+        report = scraper.metrics.summary()
+
+    timers = report['timers']
+    return {
+        'speakers': size,
+        'scraped': scraper.speakers_count,
+        'ok': scraper.speakers_count == size,
+        'wall': round(wall, 3),
+        'speakers_per_second': round(scraper.speakers_count / wall, 1) if wall else 0.0,
+        'requests_per_second': report['requests_per_second'],
+        'new_connections': scraper.transport.stats.new_connections,
+        'counters': report['counters'],
+        'stages': {name: {key: timers[name][key] for key in ('count', 'total', 'p50', 'p95', 'p99')}
+                   for name in STAGES if name in timers},
+    }
+
+
+def best_of(func, repeat: int, number: int) -> float:
+    """Лучшее время одного вызова func, мс"""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1000
+
+
+def bench_micro(size: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Разбор и извлечение одной страницы каждым установленным парсером, мс на вызов"""
+    config = MockConfig(speakers=size)
+    listing = listing_page(1, config).encode('utf-8')
+    detail = detail_page(1, config).encode('utf-8')
+
+    results = {}
+    for backend in (name for name in AUTO_ORDER if is_available(name)):
+        scraper = quiet(DSEISpeakerScraper(parser_backend=backend, metrics_file=None))
+        listing_root = parse_links(listing, backend, LISTING_HREF_MARKERS)
+        detail_root = parse_html(detail, backend, SPEAKER_ENTRY_CLASS)
+        results[backend] = {
+            'parse_listing': best_of(lambda: parse_html(listing, backend), repeat, 20),
+            'parse_listing_links': best_of(lambda: parse_links(listing, backend, LISTING_HREF_MARKERS), repeat, 20),
+            'parse_detail': best_of(lambda: parse_html(detail, backend, SPEAKER_ENTRY_CLASS), repeat, 20),
+            'analyze_listing': best_of(lambda: scraper.analyze_listing_page(listing_root), repeat, 20),
+            'extract_details': best_of(lambda: scraper.extract_speaker_details(detail_root, 'bench'), repeat, 50),
+        }
+        results[backend] = {name: round(value, 4) for name, value in results[backend].items()}
+        scraper.transport.close()
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def previous_result(directory: str, settings: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Последний сохраненный результат с теми же настройками - для сравнения"""
+    if not os.path.isdir(directory):
+        return None
+    for name in sorted((name for name in os.listdir(directory) if name.endswith('.json')), reverse=True):
+        with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        if result.get('settings') == settings:
+            return result
+    return None
+
+
+def change(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ''
+    return f" ({(current - previous) / previous * 100:+.1f}%)"
+
+
+def print_report(result: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> None:
+    previous_runs = {run['speakers']: run for run in (previous or {}).get('runs', [])}
+    print("\n=== ПОЛНЫЙ ПРОГОН ===")
+    for run in result['runs']:
+        before = previous_runs.get(run['speakers'], {})
+        status = '' if run['ok'] else f"  ❌ получено {run['scraped']}"
+        print(f"  {run['speakers']:>6} спикеров: {run['wall']:.2f} сек{change(run['wall'], before.get('wall'))}, "
+              f"{run['speakers_per_second']} спикеров/сек, {run['requests_per_second']} запр/сек{status}")
+        for name, stage in run['stages'].items():
+            print(f"         {name:<16} всего {stage['total']:.3f} сек, "
+                  f"p50 {stage['p50'] * 1000:.2f} мс, p95 {stage['p95'] * 1000:.2f} мс, p99 {stage['p99'] * 1000:.2f} мс")
+
+    previous_micro = (previous or {}).get('micro', {})
+    print("\n=== РАЗБОР И ИЗВЛЕЧЕНИЕ (мс на страницу) ===")
+    for backend, timings in result['micro'].items():
+        print(f"  {backend}:")
+        for name, value in timings.items():
+            print(f"    {name:<22} {value:.3f}{change(value, previous_micro.get(backend, {}).get(name))}")
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Бенчмарки парсера на локальном тестовом сервере")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BENCHMARK_SIZES),
+                        help="Количество спикеров в прогонах")
+    parser.add_argument("--workers", type=int, default=8, help="Количество потоков загрузки")
+    parser.add_argument("--parser", default="auto", help="HTML-парсер для полного прогона")
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default=TRANSPORT, help="HTTP-клиент")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа сервера, сек")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Случайная добавка к задержке, сек")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 429/503")
+    parser.add_argument("--page-kb", type=int, default=30, help="Размер обвязки страницы, КБ")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов микробенчмарков")
+    parser.add_argument("--output-dir", default=BENCHMARK_DIR, help="Каталог результатов")
+    parser.add_argument("--no-save", action="store_true", help="Не сохранять результат")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Главная функция"""
+    args = parse_args(argv)
+    settings = {
+        'workers': args.workers, 'parser': args.parser, 'transport': args.transport,
+        'latency': args.latency, 'jitter': args.jitter, 'error_rate': args.error_rate,
+        'page_kb': args.page_kb,
+    }
+    previous = previous_result(args.output_dir, settings)
+
+    runs = []
+    for size in args.sizes:
+        print(f"⏱️  Прогон на {size} спикеров...", flush=True)
+        runs.append(bench_run(size, args))
+
+    print("⏱️  Микробенчмарки разбора...", flush=True)
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'runs': runs,
+        'micro': bench_micro(max(args.sizes), args.repeat),
+    }
+
+    print_report(result, previous)
+
+    if not args.no_save:
+        os.makedirs(args.output_dir, exist_ok=True)
+        filename = os.path.join(args.output_dir, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Результат сохранен в: {filename}")
+
+    return 0 if all(run['ok'] for run in runs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,10 @@ import os
 
 # Настройки парсера
 BASE_URL = "https://www.dsei.co.uk"
-SPEAKERS_LIST_URL = "https://www.dsei.co.uk/forums/overview/speakers"
-SPEAKER_DETAIL_URL = "https://www.dsei.co.uk/speakers"
+SPEAKERS_LIST_PATH = "/forums/overview/speakers"
+SPEAKER_DETAIL_PATH = "/speakers"
+SPEAKERS_LIST_URL = BASE_URL + SPEAKERS_LIST_PATH
+SPEAKER_DETAIL_URL = BASE_URL + SPEAKER_DETAIL_PATH
 
 # Параметры запросов
 SPEAKERS_LIST_PARAMS = {
@@ -24,18 +26,133 @@ HEADERS = {
 REQUEST_TIMEOUT = 30
 DELAY_BETWEEN_REQUESTS = 1  # секунды
 
+# Транспорт: "requests" (HTTP/1.1) или "httpx" (HTTP/2, pip install 'httpx[http2]')
+TRANSPORT = "requests"
+TRANSPORT_NAMES = ("httpx", "requests")  # ключи src.transport.TRANSPORTS, для CLI без импорта транспорта
+CONNECTION_POOL_SIZE = None  # соединений на хост; None - по количеству потоков
+HTTP2_ENABLED = True  # только для httpx
+CONNECT_RETRIES = 2  # повторы неудавшегося соединения внутри транспорта
+
+# HTML-парсер: "auto" (самый быстрый из установленных), "selectolax", "lxml" или "html.parser"
+PARSER_BACKEND = "auto"
+PARSER_BACKENDS = ("selectolax", "lxml", "html.parser")  # порядок выбора для "auto"
+
+# Маркеры в href ссылок на спикеров и на страницы списка: остальные ссылки страницы списка не разбираются
+LISTING_HREF_MARKERS = ("openRemoteModal", "page=")
+
+# Префикс CSS-классов блока с данными спикера на детальной странице
+SPEAKER_ENTRY_CLASS = "m-speaker-entry"
+# Класс элемента списка сессий спикера (по одному на сессию)
+SESSION_ITEM_CLASS = "m-speaker-entry__item__sessions__list__item"
+# Обогащение сессий описанием со страниц сессий (включается флагом --enrich-sessions)
+ENRICH_SESSIONS = False
+
+# Параллельная загрузка
+MAX_WORKERS = 4  # количество потоков для загрузки детальных страниц
+REQUESTS_PER_SECOND = 1 / DELAY_BETWEEN_REQUESTS  # общий лимит для всех потоков (начальный)
+
+# Адаптивный лимит (AIMD): растет, пока ответы быстрые, и падает вдвое при 429/503/таймаутах
+ADAPTIVE_RATE_LIMIT = True
+MIN_REQUESTS_PER_SECOND = 0.2
+MAX_REQUESTS_PER_SECOND = 4
+TARGET_LATENCY = 2.0  # секунды; при более медленных ответах скорость не растет
+
+# Конвейер: детальные страницы загружаются параллельно с обходом списка
+PIPELINE_ENABLED = True
+PIPELINE_QUEUE_SIZE = 100  # максимум slug в очереди между этапами
+
+# Параллельная загрузка страниц списка после того, как известно их число
+PARALLEL_PAGINATION = True
+
 # Пути к файлам
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 
-# Создание директорий если не существуют
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(LOGS_DIR, exist_ok=True)
+
+def ensure_dirs() -> None:
+    """Создает каталоги данных и логов (импорт настроек ничего не создает)"""
+    for directory in (DATA_DIR, LOGS_DIR):
+        os.makedirs(directory, exist_ok=True)
+
 
 # Файлы результатов
 SPEAKERS_CSV_FILE = os.path.join(DATA_DIR, "speakers.csv")
+SPEAKERS_JSONL_FILE = os.path.join(DATA_DIR, "speakers.jsonl")
+# База SQLite: спикеры, сессии и ссылки в отдельных таблицах, обновляется upsert
+SPEAKERS_SQLITE_FILE = os.path.join(DATA_DIR, "speakers.sqlite")
+# Parquet: колоночный файл со сжатием (нужен pyarrow)
+SPEAKERS_PARQUET_FILE = os.path.join(DATA_DIR, "speakers.parquet")
+OUTPUT_FORMAT = "csv"
+OUTPUT_FILES = {
+    "csv": SPEAKERS_CSV_FILE,
+    "jsonl": SPEAKERS_JSONL_FILE,
+    "sqlite": SPEAKERS_SQLITE_FILE,
+    "parquet": SPEAKERS_PARQUET_FILE,
+}
+SINK_BATCH_SIZE = 50  # записей между сбросами выходного файла на диск
+PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
+PARQUET_ROW_GROUP_SIZE = 10000  # записей в группе строк (столько держится в памяти при записи)
+# Набор данных Parquet с разделами event=<событие>/run_date=<дата прогона> (--dataset)
+PARQUET_DATASET_DIR = os.path.join(DATA_DIR, "parquet")
+DATASET_EVENT = "dsei"  # событие по умолчанию
 LOG_FILE = os.path.join(LOGS_DIR, "scraper.log")
+LOG_LEVEL = "INFO"
+# Структурированный лог JSON Lines (этап, slug, URL, статус, задержка), включается флагом --log-json
+LOG_JSON_FILE = os.path.join(LOGS_DIR, "scraper.jsonl")
+# Уровень и выборка сообщений по этапам (request, listing, speaker, session):
+# например {"request": "WARNING"} или {"listing": 10} - каждое 10-е сообщение этапа ниже WARNING
+LOG_STAGE_LEVELS = {}
+LOG_SAMPLE_EVERY = {}
+# Журнал контрольных точек для продолжения прерванного прогона (--resume)
+CHECKPOINT_FILE = os.path.join(DATA_DIR, "checkpoint.jsonl")
+CHECKPOINT_INTERVAL = 20  # записей между сбросами журнала на диск
+
+# Дисковый кэш HTTP-ответов (включается флагом --cache)
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+CACHE_TTL = 6 * 60 * 60  # секунды, после истечения запись перепроверяется условным запросом
+CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# Архив сырых ответов для повторного извлечения без сети (включается флагом --archive)
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+
+# Отчет о времени этапов и счетчиках прогона
+METRICS_FILE = os.path.join(DATA_DIR, "metrics.json")
+# Результаты бенчмарков (benchmark.py) для отслеживания регрессий
+BENCHMARK_DIR = os.path.join(DATA_DIR, "benchmarks")
+BENCHMARK_SIZES = (100, 1000, 10000)  # количество спикеров в прогонах
+# Задания на несколько событий (run_jobs.py): результаты, журналы и общая очередь SQLite
+JOBS_DIR = os.path.join(DATA_DIR, "jobs")
+JOB_QUEUE_FILE = os.path.join(JOBS_DIR, "queue.sqlite")
+JOB_PROCESSES = 2  # процессов-исполнителей на машине
+JOB_LEASE_TIMEOUT = 120  # секунды; задание без продления аренды отдается другому исполнителю
+JOB_HEARTBEAT_INTERVAL = 10  # секунды между продлениями аренды и пересчетом доли лимита хоста
+JOB_MAX_ATTEMPTS = 3
+# Объединение записей одного человека из разных прогонов и событий (run.py dedupe)
+PEOPLE_FILE = os.path.join(DATA_DIR, "people.csv")  # записи с person_id
+PEOPLE_REGISTRY_FILE = os.path.join(DATA_DIR, "people.sqlite")  # person_id, устойчивые между запусками
+DEDUPE_THRESHOLD = 0.85  # минимальная оценка совпадения двух записей (0-1)
+DEDUPE_MIN_NAME_SIMILARITY = 0.8  # записи с менее похожими именами не совпадают
+DEDUPE_BLOCK_LIMIT = 50  # кандидатов на один ключ блокировки: ограничивает сравнения для частых имен
+# Результат профилирования (--profile): .prof для cProfile, .html для pyinstrument
+PROFILE_FILES = {
+    "cprofile": os.path.join(LOGS_DIR, "profile.prof"),
+    "pyinstrument": os.path.join(LOGS_DIR, "profile.html"),
+}
 
 # Максимальное количество попыток запроса
 MAX_RETRIES = 3
+
+# Повторы запросов
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF_BASE = 1  # секунды, задержка растет как base * 2^попытка со случайным разбросом
+RETRY_BACKOFF_MAX = 30
+RETRY_AFTER_MAX = 300  # верхняя граница ожидания по заголовку Retry-After
+
+# Размыкатель цепи: после N ошибок подряд запросы приостанавливаются
+CIRCUIT_FAILURE_THRESHOLD = 10
+CIRCUIT_RESET_TIMEOUT = 60  # секунды до пробного запроса
+# Сколько секунд цепь может оставаться разомкнутой (пробные запросы не проходят),
+# прежде чем прогон останавливается как неполный
+CIRCUIT_MAX_OPEN_TIME = 10 * 60
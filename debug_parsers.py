@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Проверка, что все HTML-парсеры дают одинаковый результат извлечения
+
+Использование:
+    python debug_parsers.py [каталог с сохраненными страницами]
+
+По умолчанию берутся тела ответов из дискового кэша (data/cache, см. --cache).
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import CACHE_DIR, LISTING_HREF_MARKERS, SPEAKER_ENTRY_CLASS
+from src.parsing import AUTO_ORDER, is_available, parse_html, parse_links
+from src.scraper import DSEISpeakerScraper
+
+
+def load_pages(directory):
+    """Читает все сохраненные страницы каталога (рекурсивно)"""
+    pages = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.endswith(('.body', '.html', '.htm')):
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    pages.append((path, f.read()))
+    return pages
+
+
+def extract_all(scraper, content, backend):
+    """Результат извлечения страницы как списка спикеров и как детальной страницы"""
+    # Страницы разбираются так же, как при парсинге: только ссылки или только блок спикера
+    listing = scraper.analyze_listing_page(parse_links(content, backend, LISTING_HREF_MARKERS))
+    entry = parse_html(content, backend, SPEAKER_ENTRY_CLASS)
+    speaker = scraper.extract_speaker_details(entry, 'parity-check')
+    return listing, speaker
+
+
+def check_parity():
+    directory = sys.argv[1] if len(sys.argv) > 1 else CACHE_DIR
+    pages = load_pages(directory)
+    if not pages:
+        print(f"❌ В каталоге {directory} нет сохраненных страниц")
+        return 1
+
+    backends = [name for name in AUTO_ORDER if is_available(name)]
+    print(f"Страниц: {len(pages)}, парсеры: {', '.join(backends)}")
+
+    scraper = DSEISpeakerScraper()
+    reference_backend = 'html.parser'
+    mismatches = 0
+    timings = {name: 0.0 for name in backends}
+
+    for path, content in pages:
+        results = {}
+        for backend in backends:
+            start = time.perf_counter()
+            results[backend] = extract_all(scraper, content, backend)
+            timings[backend] += time.perf_counter() - start
+
+        reference = results[reference_backend]
+        for backend, result in results.items():
+            if result != reference:
+                mismatches += 1
+                print(f"  ≠ {backend}: {path}")
+
+    print(f"\n=== ВРЕМЯ РАЗБОРА И ИЗВЛЕЧЕНИЯ ===")
+    for backend, total in timings.items():
+        print(f"  {backend}: {total:.3f} сек ({total / len(pages) * 1000:.2f} мс/стр)")
+
+    if mismatches:
+        print(f"\n❌ Расхождений: {mismatches}")
+        return 1
+
+    print(f"\n✅ Все парсеры дают одинаковый результат")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(check_parity())
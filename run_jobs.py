@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Точка входа для парсинга нескольких событий по файлу заданий
+"""
+
+import sys
+import os
+
+# Добавляем текущую директорию в путь Python
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.scheduler import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import os
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.columnar import PARTITION_COLUMNS, read_dataset, read_table
+from src.models import SPEAKER_COLUMNS
+from src.storage import SpeakerDatabase, connect_readonly
+from src.table import INTERNED_COLUMNS, SpeakerTable
+
+# Колонка с именем файла-источника во фрейме нескольких прогонов или событий
+SOURCE_COLUMN = 'source'
+# Колонки, доля заполнения которых выводится в отчете
+COVERAGE_COLUMNS = [name for name in SPEAKER_COLUMNS if name not in ('speaker_url', 'speaker_slug')]
+
+
+def _pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise ValueError("Аналитика по фреймам недоступна: pip install pandas")
+    return pandas
+
+
+def has_pandas() -> bool:
+    try:
+        _pandas()
+    except ValueError:
+        return False
+    return True
+
+
+def read_frame(filename: str, columns: Optional[Sequence[str]] = None,
+               filters: Optional[List[Tuple[str, str, object]]] = None):
+    """Читает результат парсинга в DataFrame с колонками SPEAKER_COLUMNS (или columns)
+
+    Формат - по расширению: .csv, .jsonl, .parquet или база .sqlite
+    (представление speakers_flat); каталог - набор данных Parquet с
+    разделами, к колонкам добавляются PARTITION_COLUMNS, а filters
+    отбирает разделы. Из Parquet читаются только нужные колонки.
+    Пустые значения - пустые строки, колонки INTERNED_COLUMNS - категориальные.
+    """
+    pd = _pandas()
+    columns = list(columns or SPEAKER_COLUMNS)
+    if os.path.isdir(filename):
+        frame = read_dataset(filename, columns, filters).to_pandas()
+        columns += [name for name in PARTITION_COLUMNS if name not in columns]
+    elif filename.endswith('.sqlite'):
+        with closing(connect_readonly(filename)) as conn:
+            frame = pd.read_sql_query(f"SELECT {', '.join(SPEAKER_COLUMNS)} FROM speakers_flat", conn)
+    elif filename.endswith('.parquet'):
+        frame = read_table(filename, columns).to_pandas()
+    elif filename.endswith('.jsonl'):
+        frame = pd.read_json(filename, lines=True, dtype=False, convert_dates=False)
+    else:
+        frame = pd.read_csv(filename, dtype=str, keep_default_na=False)
+
+    frame = frame.reindex(columns=columns)
+    if filters and not os.path.isdir(filename):
+        frame = _filtered(frame, filters)
+    for name in columns:
+        column = frame[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(str).where(column.notna(), "")
+        interned = name in INTERNED_COLUMNS or name in PARTITION_COLUMNS
+        frame[name] = column.fillna("").astype('category' if interned else str)
+    return frame
+
+
+def _filtered(frame, filters: List[Tuple[str, str, object]]):
+    """Отбор записей по условиям равенства (для файлов, кроме наборов данных Parquet)"""
+    for column, op, value in filters:
+        if op not in ('=', '==') or column not in frame.columns:
+            raise ValueError(f"Условие {column} {op} {value!r} применимо только к набору данных Parquet")
+        frame = frame[frame[column].fillna("") == value]
+    return frame.reset_index(drop=True)
+
+
+def load_frame(filenames: Union[str, Sequence[str]], filters: Optional[List[Tuple[str, str, object]]] = None):
+    """Объединяет результаты нескольких прогонов или событий в один DataFrame
+
+    Колонка SOURCE_COLUMN - путь файла относительно общего каталога всех
+    файлов (для файлов одного каталога - имя с расширением), для набора
+    данных Parquet - раздел <событие>/<дата прогона>.
+    """
+    pd = _pandas()
+    if isinstance(filenames, str):
+        filenames = [filenames]
+    files = [os.path.abspath(filename) for filename in filenames if not os.path.isdir(filename)]
+    common = os.path.commonpath([os.path.dirname(filename) for filename in files]) if files else ''
+    frames = []
+    for filename in filenames:
+        frame = read_frame(filename, filters=filters)
+        if os.path.isdir(filename):
+            source = frame['event'].astype(str) + '/' + frame['run_date'].astype(str)
+            frame = frame.drop(columns=list(PARTITION_COLUMNS))
+        else:
+            source = os.path.relpath(os.path.abspath(filename), common)
+        frame.insert(0, SOURCE_COLUMN, source)
+        frames.append(frame)
+    frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    # После concat категории разных файлов объединяются заново
+    for name in INTERNED_COLUMNS + (SOURCE_COLUMN,):
+        frame[name] = frame[name].astype('category')
+    return frame
+
+
+def value_counts(frame, column: str, by: Optional[str] = None):
+    """Количество записей по непустым значениям колонки (с by - по группам колонки by)"""
+    nonempty = frame[frame[column] != ""]
+    if by is None:
+        # Без сортировки: top_k отбирает первые значения частичным отбором
+        counts = nonempty[column].value_counts(sort=False)
+        return counts[counts > 0]
+    return nonempty.groupby([by, column], observed=True).size()
+
+
+def top_k(counts, k: int = 5):
+    """k самых частых значений без полной сортировки (частичный отбор nlargest)"""
+    return counts.nlargest(k, keep='first')
+
+
+def coverage(frame, columns: Sequence[str] = COVERAGE_COLUMNS, by: Optional[str] = None):
+    """Доля записей с непустым значением каждой колонки (с by - по группам)"""
+    filled = frame[list(columns)] != ""
+    if by is None:
+        return filled.mean()
+    return filled.groupby(frame[by], observed=True).mean()
+
+
+@dataclass
+class RunDiff:
+    """Отличия результата от предыдущего прогона по speaker_slug"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    changed_columns: Dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        return f"новых: {len(self.added)}, удалено: {len(self.removed)}, изменено: {len(self.changed)}"
+
+
+def diff_frames(old, new, key: str = 'speaker_slug') -> RunDiff:
+    """Сравнивает два прогона: новые, удаленные и изменившиеся записи, изменения по колонкам"""
+    columns = [name for name in SPEAKER_COLUMNS if name != key]
+    old = old.drop_duplicates(key).set_index(key)
+    new = new.drop_duplicates(key).set_index(key)
+    common = new.index.intersection(old.index, sort=False)
+    # Категории двух файлов разные, поэтому значения сравниваются как строки
+    before = old.loc[common, columns].astype(str).to_numpy()
+    after = new.loc[common, columns].astype(str).to_numpy()
+    differs = before != after
+    return RunDiff(
+        added=new.index.difference(old.index, sort=False).tolist(),
+        removed=old.index.difference(new.index, sort=False).tolist(),
+        changed=common[differs.any(axis=1)].tolist(),
+        changed_columns={name: int(count) for name, count in zip(columns, differs.sum(axis=0)) if count},
+    )
+
+
+def _print_top(title: str, counts) -> None:
+    print(f"\n{title}")
+    for value, count in counts.items():
+        print(f"  • {value}: {count} спикер(ов)")
+
+
+def report(filenames: Sequence[str], top: int = 5, previous: Optional[str] = None,
+           filters: Optional[List[Tuple[str, str, object]]] = None) -> None:
+    """Печатает отчет по одному или нескольким результатам (нужен pandas)"""
+    frame = load_frame(filenames, filters)
+    companies = value_counts(frame, 'company')
+    countries = value_counts(frame, 'country')
+    filled = coverage(frame)
+
+    print(f"\n📊 АНАЛИЗ РЕЗУЛЬТАТОВ:")
+    print(f"=" * 40)
+    print(f"Всего спикеров: {len(frame)}")
+    print(f"Уникальных компаний: {len(companies)}")
+    print(f"Уникальных стран: {len(countries)}")
+    print(f"Спикеров с социальными сетями: {int((frame['social_network'] != '').sum())}")
+    print(f"Спикеров с информацией о сессиях: {int((frame['session_date'] != '').sum())}")
+
+    _print_top(f"🏢 ТОП-{top} КОМПАНИЙ:", top_k(companies, top))
+    _print_top(f"🌍 ТОП-{top} СТРАН:", top_k(countries, top))
+
+    print(f"\n📋 ЗАПОЛНЕННОСТЬ ПОЛЕЙ:")
+    for name, share in filled.items():
+        print(f"  • {name}: {share:.0%}")
+
+    if frame[SOURCE_COLUMN].nunique() > 1:
+        print(f"\n📁 ПО ФАЙЛАМ:")
+        sizes = frame.groupby(SOURCE_COLUMN, observed=True).size()
+        per_source = coverage(frame, ['company', 'country', 'session_date'], by=SOURCE_COLUMN)
+        for source, size in sizes.items():
+            shares = ', '.join(f"{name} {share:.0%}" for name, share in per_source.loc[source].items())
+            print(f"  • {source}: {size} спикер(ов); заполнено: {shares}")
+
+    if previous:
+        changes = diff_frames(load_frame(previous), frame)
+        print(f"\n🔄 ИЗМЕНЕНИЯ ОТНОСИТЕЛЬНО {previous}: {changes.summary()}")
+        for name, count in sorted(changes.changed_columns.items(), key=lambda item: -item[1]):
+            print(f"  • {name}: {count}")
+
+
+def analyze_results(filenames: Union[str, Sequence[str]], top: int = 5, previous: Optional[str] = None,
+                    filters: Optional[List[Tuple[str, str, object]]] = None) -> bool:
+    """Выводит сводку по результату парсинга (CSV, JSONL, Parquet, база SQLite или набор данных Parquet)
+
+    С pandas отчет считается векторными операциями по фрейму и может
+    объединять несколько файлов, отбирать разделы набора данных (filters)
+    и сравнивать с предыдущим прогоном; без него - сводка по одному файлу
+    через SpeakerTable или запросы к базе.
+    """
+    filenames = [filenames] if isinstance(filenames, str) else list(filenames)
+    missing = [filename for filename in filenames + ([previous] if previous else []) if not os.path.exists(filename)]
+    if missing:
+        print(f"❌ Файл с результатами не найден: {', '.join(missing)}. Запустите сначала парсер.")
+        return False
+
+    if has_pandas():
+        report(filenames, top, previous, filters)
+        return True
+    if len(filenames) > 1 or previous or filters or os.path.isdir(filenames[0]):
+        print("❌ Отчет по нескольким файлам, набору данных и сравнение прогонов требуют pandas: pip install pandas")
+        return False
+
+    filename = filenames[0]
+    if filename.endswith('.sqlite'):
+        # Агрегаты считаются запросами GROUP BY по индексам базы
+        speakers = SpeakerDatabase(filename, readonly=True)
+    else:
+        # Колоночная таблица: агрегаты считаются прямо по колонкам, без словаря на строку
+        speakers = SpeakerTable.load(filename)
+
+    companies = speakers.value_counts('company')
+    countries = speakers.value_counts('country')
+    with_social = speakers.count_nonempty('social_network')
+    with_sessions = speakers.count_nonempty('session_date')
+
+    print(f"\n📊 АНАЛИЗ РЕЗУЛЬТАТОВ:")
+    print(f"=" * 40)
+    print(f"Всего спикеров: {len(speakers)}")
+    print(f"Уникальных компаний: {len(companies)}")
+    print(f"Уникальных стран: {len(countries)}")
+    print(f"Спикеров с социальными сетями: {with_social}")
+    print(f"Спикеров с информацией о сессиях: {with_sessions}")
+
+    # Counter.most_common(k) выбирает k значений через heapq.nlargest
+    _print_top(f"🏢 ТОП-{top} КОМПАНИЙ:", dict(companies.most_common(top)))
+    _print_top(f"🌍 ТОП-{top} СТРАН:", dict(countries.most_common(top)))
+    return True
@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+class ResponseArchive:
+    """Архив сырых HTTP-ответов с адресацией по содержимому
+
+    Тела ответов хранятся сжатыми gzip в objects/<sha[:2]>/<sha>.gz и не
+    дублируются; каждая загрузка добавляет строку в index.jsonl с URL,
+    параметрами запроса и хэшем тела. По архиву можно заново выполнить
+    извлечение данных без обращения к сайту (см. src/reextract.py).
+    """
+
+    INDEX_FILE = 'index.jsonl'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.index_file = os.path.join(directory, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest + '.gz')
+
+    def store(self, url: str, params: Optional[Mapping[str, Any]], content: bytes) -> str:
+        """Сохраняет ответ и возвращает sha256 его тела"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        record = {
+            'url': url,
+            'params': dict(params or {}),
+            'sha256': digest,
+            'fetched_at': time.time()
+        }
+        with self._lock:
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        return digest
+
+    def read(self, digest: str) -> bytes:
+        """Возвращает тело ответа по его хэшу"""
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return f.read()
+
+    def iter_index(self) -> Iterator[Dict[str, Any]]:
+        """Все записи индекса в порядке загрузки"""
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def latest(self) -> Dict[str, Dict[str, Any]]:
+        """Последняя запись для каждой пары (URL, параметры)"""
+        records = {}
+        for record in self.iter_index():
+            key = record['url'] + '?' + json.dumps(record['params'], sort_keys=True)
+            records[key] = record
+        return records
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+
+@dataclass
+class CacheEntry:
+    """Закэшированный ответ сервера"""
+    url: str
+    content: bytes
+    etag: str = ""
+    last_modified: str = ""
+    stored_at: float = 0.0
+
+
+class ResponseCache:
+    """Дисковый кэш HTTP-ответов с условной перепроверкой (ETag / Last-Modified)
+
+    Каждая запись - два файла: тело ответа (.body) и метаданные (.json).
+    Время изменения файла тела обновляется при каждом чтении, поэтому при
+    превышении max_bytes удаляются давно не использованные записи (LRU).
+    """
+
+    def __init__(self, cache_dir: str, ttl: float, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._iter_bodies())
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Ключ записи: хэш URL и отсортированных параметров запроса"""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + '.body', base + '.json'
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Возвращает запись или None, если ее нет или она повреждена"""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                content = f.read()
+            os.utime(body_path)  # отметка для LRU
+        except (OSError, ValueError):
+            return None
+
+        return CacheEntry(
+            url=meta.get('url', ''),
+            content=content,
+            etag=meta.get('etag', ''),
+            last_modified=meta.get('last_modified', ''),
+            stored_at=meta.get('stored_at', 0.0)
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Запись моложе TTL и может использоваться без обращения к сайту"""
+        return time.time() - entry.stored_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        """Заголовки условного GET-запроса для перепроверки записи"""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, key: str, url: str, content: bytes, headers: Mapping[str, str]) -> None:
+        """Сохраняет ответ вместе с его валидаторами"""
+        self._write(key, CacheEntry(
+            url=url,
+            content=content,
+            etag=headers.get('ETag', ''),
+            last_modified=headers.get('Last-Modified', ''),
+            stored_at=time.time()
+        ))
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        """Продлевает срок жизни записи после ответа 304 Not Modified"""
+        entry.stored_at = time.time()
+        _, meta_path = self._paths(key)
+        self._atomic_write(meta_path, self._meta_bytes(entry))
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+        try:
+            old_size = os.path.getsize(body_path)
+        except OSError:
+            old_size = 0
+
+        self._atomic_write(body_path, entry.content)
+        self._atomic_write(meta_path, self._meta_bytes(entry))
+
+        with self._lock:
+            self._total_bytes += len(entry.content) - old_size
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    @staticmethod
+    def _meta_bytes(entry: CacheEntry) -> bytes:
+        meta = {
+            'url': entry.url,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'stored_at': entry.stored_at
+        }
+        return json.dumps(meta, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _iter_bodies(self):
+        """(путь, время последнего использования, размер) для всех тел ответов"""
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for item in os.scandir(shard.path):
+                if item.name.endswith('.body'):
+                    stat = item.stat()
+                    yield item.path, stat.st_mtime, stat.st_size
+
+    def evict(self) -> None:
+        """Удаляет самые старые по использованию записи, пока кэш не уложится в 90% лимита"""
+        with self._lock:
+            target = self.max_bytes * 0.9
+            entries = sorted(self._iter_bodies(), key=lambda item: item[1])
+            total = sum(size for _, _, size in entries)
+
+            for body_path, _, size in entries:
+                if total <= target:
+                    break
+                meta_path = body_path[:-len('.body')] + '.json'
+                for path in (body_path, meta_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+
+            self._total_bytes = total
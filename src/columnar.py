@@ -0,0 +1,153 @@
+import glob
+import os
+import re
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.settings import PARQUET_COMPRESSION, PARQUET_COMPRESSION_LEVEL, PARQUET_ROW_GROUP_SIZE
+from src.models import SESSION_COLUMNS, SPEAKER_COLUMNS
+from src.table import INTERNED_COLUMNS
+
+# Версия схемы Parquet-файлов: увеличивается при несовместимом изменении колонок.
+# Файлы без версии (до ее появления) считаются версией 0 - колонки те же.
+SCHEMA_VERSION = 1
+SCHEMA_VERSION_KEY = b'dsei.schema_version'
+SCHEMA_TABLE_KEY = b'dsei.table'
+
+# Колонки с часто повторяющимися значениями хранятся словарем
+DICTIONARY_COLUMNS = {
+    'speakers': INTERNED_COLUMNS,
+    'sessions': ('date', 'time', 'location', 'topic_link', 'topic_title'),
+}
+TABLE_COLUMNS = {'speakers': SPEAKER_COLUMNS, 'sessions': SESSION_COLUMNS}
+
+# Разделы набора данных: DIR/event=<событие>/run_date=<ГГГГ-ММ-ДД>/speakers.parquet
+PARTITION_COLUMNS = ('event', 'run_date')
+PARTITION_VALUE_PATTERN = re.compile(r'^[\w.-]+$')
+SESSIONS_SUFFIX = '.sessions.parquet'
+PARTIAL_MARKER = '.partial.'  # неполный прогон, см. sinks.partial_filename
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet недоступен: pip install pyarrow")
+    return pyarrow
+
+
+def schema(table: str = 'speakers'):
+    """Схема Arrow таблицы speakers или sessions с версией в метаданных
+
+    Все поля - непустые строки (отсутствующее значение - пустая строка),
+    колонки DICTIONARY_COLUMNS - словарные.
+    """
+    pa = _pyarrow()
+    dictionary = set(DICTIONARY_COLUMNS[table])
+    return pa.schema(
+        [pa.field(name, pa.dictionary(pa.int32(), pa.string()) if name in dictionary else pa.string(), nullable=False)
+         for name in TABLE_COLUMNS[table]],
+        metadata={SCHEMA_VERSION_KEY: str(SCHEMA_VERSION).encode(), SCHEMA_TABLE_KEY: table.encode()},
+    )
+
+
+def writer_options() -> dict:
+    """Параметры записи: сжатие, словарное кодирование и статистика колонок для отбора"""
+    return {
+        'compression': PARQUET_COMPRESSION,
+        'compression_level': PARQUET_COMPRESSION_LEVEL,
+        'use_dictionary': True,
+        'write_statistics': True,
+    }
+
+
+def record_batch(columns: Dict[str, List[str]], table: str = 'speakers'):
+    """Пачка записей по схеме schema(table) из списков значений колонок"""
+    pa = _pyarrow()
+    target = schema(table)
+    return pa.record_batch([pa.array(columns[field.name], type=field.type) for field in target], schema=target)
+
+
+def write_table(columns: Dict[str, List[str]], filename: str, table: str = 'speakers') -> None:
+    """Записывает колонки одним файлом Parquet (через <filename>.part и атомарную замену)"""
+    pa = _pyarrow()
+    tmp_filename = filename + '.part'
+    data = pa.Table.from_batches([record_batch(columns, table)])
+    pa.parquet.write_table(data, tmp_filename, row_group_size=PARQUET_ROW_GROUP_SIZE, **writer_options())
+    os.replace(tmp_filename, filename)
+
+
+def schema_version(arrow_schema) -> int:
+    metadata = arrow_schema.metadata or {}
+    return int(metadata.get(SCHEMA_VERSION_KEY, b'0'))
+
+
+def check_schema(arrow_schema, source: str) -> None:
+    """Отказывает в чтении файла более новой версии схемы, чем знает этот код"""
+    version = schema_version(arrow_schema)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"{source}: версия схемы {version} новее поддерживаемой ({SCHEMA_VERSION}), "
+                         f"обновите парсер")
+
+
+def read_table(filename: str, columns: Optional[Sequence[str]] = None):
+    """Читает файл Parquet в таблицу Arrow (только колонки columns, если указаны)"""
+    pa = _pyarrow()
+    parquet_file = pa.parquet.ParquetFile(filename)
+    check_schema(parquet_file.schema_arrow, filename)
+    if columns is not None:
+        columns = [name for name in columns if name in parquet_file.schema_arrow.names]
+    return parquet_file.read(columns=columns)
+
+
+def partition_dir(root: str, event: str, run_date: Optional[date] = None) -> str:
+    """Каталог раздела набора данных для события и даты прогона (по умолчанию сегодня)"""
+    if not PARTITION_VALUE_PATTERN.match(event):
+        raise ValueError(f"Недопустимое имя события: {event!r} (буквы, цифры, '.', '-', '_')")
+    run_date = run_date or date.today()
+    return os.path.join(root, f"event={event}", f"run_date={run_date.isoformat()}")
+
+
+def dataset_file(root: str, event: str, run_date: Optional[date] = None) -> str:
+    """Файл спикеров в разделе набора данных; сессии - рядом, в speakers.sessions.parquet
+
+    Каждый прогон добавляет свой раздел, повторный прогон того же события
+    в тот же день заменяет файл раздела.
+    """
+    return os.path.join(partition_dir(root, event, run_date), 'speakers.parquet')
+
+
+def dataset_files(root: str, table: str = 'speakers') -> List[str]:
+    """Файлы таблицы speakers или sessions во всех разделах набора данных (без неполных прогонов)"""
+    files = glob.glob(os.path.join(root, '**', '*.parquet'), recursive=True)
+    return sorted(name for name in files
+                  if name.endswith(SESSIONS_SUFFIX) == (table == 'sessions') and PARTIAL_MARKER not in name)
+
+
+def read_dataset(root: str, columns: Optional[Sequence[str]] = None,
+                 filters: Optional[List[Tuple[str, str, object]]] = None, table: str = 'speakers'):
+    """Читает набор данных в таблицу Arrow с колонками разделов event и run_date
+
+    Читаются только колонки columns и разделы, подходящие под filters
+    (список условий ('event', '=', 'dsei') в формате pyarrow); остальные
+    файлы и колонки с диска не загружаются.
+    """
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+
+    partitioning = ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor='hive')
+    dataset = ds.dataset(dataset_files(root, table), format='parquet',
+                         partitioning=partitioning, partition_base_dir=root)
+    expression = pa.parquet.filters_to_expression(filters) if filters else None
+    for fragment in dataset.get_fragments(filter=expression):
+        check_schema(fragment.physical_schema, fragment.path)
+    if columns is not None:
+        columns = [name for name in list(columns) + list(PARTITION_COLUMNS) if name in dataset.schema.names]
+        columns = list(dict.fromkeys(columns))
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def read_rows(filename: str) -> List[dict]:
+    """Записи файла Parquet словарями поле -> строка"""
+    return read_table(filename).to_pylist()
@@ -0,0 +1,375 @@
+import csv
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from contextlib import closing
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from config.settings import DEDUPE_THRESHOLD, DEDUPE_MIN_NAME_SIMILARITY, DEDUPE_BLOCK_LIMIT
+from src.models import SPEAKER_COLUMNS
+from src.table import SpeakerTable
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+# Обращения, звания и регалии: не различают людей
+NAME_STOPWORDS = frozenset({
+    'mr', 'mrs', 'ms', 'miss', 'dr', 'prof', 'professor', 'sir', 'dame', 'lord', 'lady', 'rt', 'hon',
+    'gen', 'general', 'lt', 'col', 'maj', 'capt', 'cdr', 'cmdr', 'brig', 'adm', 'admiral', 'marshal',
+    'phd', 'obe', 'mbe', 'cbe', 'kcb', 'jr', 'sr',
+})
+# Организационно-правовые формы и служебные слова в названиях компаний
+COMPANY_STOPWORDS = frozenset({
+    'ltd', 'limited', 'inc', 'incorporated', 'plc', 'llc', 'llp', 'gmbh', 'ag', 'sa', 'sas', 'bv',
+    'corp', 'corporation', 'co', 'company', 'group', 'the', 'and', 'of',
+})
+# Веса сходства имени, компании и должности в итоговой оценке
+NAME_WEIGHT, COMPANY_WEIGHT, POSITION_WEIGHT = 0.6, 0.3, 0.1
+# Сходство инициала с полным именем на ту же букву
+INITIAL_SIMILARITY = 0.9
+# Сходство имени из одного токена (например, без имени после удаления звания) с полным именем
+PARTIAL_NAME_SIMILARITY = 0.75
+# Сходство поля, которое пусто хотя бы у одной из записей
+UNKNOWN_SIMILARITY = 0.5
+OUTPUT_COLUMNS = ['person_id'] + SPEAKER_COLUMNS
+
+
+@lru_cache(maxsize=65536)
+def tokens(text: str, stopwords: FrozenSet[str] = frozenset()) -> Tuple[str, ...]:
+    """Токены без регистра и диакритики, без стоп-слов (порядок исходный)"""
+    folded = unicodedata.normalize('NFKD', text.casefold())
+    folded = ''.join(char for char in folded if not unicodedata.combining(char))
+    return tuple(token for token in TOKEN_PATTERN.findall(folded) if token not in stopwords)
+
+
+@lru_cache(maxsize=262144)
+def token_similarity(a: str, b: str) -> float:
+    """Сходство двух разных токенов имени (имена повторяются, поэтому результат кэшируется)"""
+    if a.isdigit() or b.isdigit():
+        # Числа совпадают только точно: 1 и 15 - разные люди
+        return 0.0
+    if a[0] != b[0]:
+        # Опечатки допускаются только после первой буквы: Bevin и Levin - разные люди
+        return 0.0
+    if len(a) == 1 or len(b) == 1:
+        return INITIAL_SIMILARITY
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def name_similarity(a: Tuple[str, ...], b: Tuple[str, ...], minimum: float = 0.0) -> float:
+    """Сходство имен по токенам от 0 до 1
+
+    Каждый токен более короткого имени сопоставляется с самым похожим
+    токеном другого: порядок токенов и лишние отчества не важны, инициал
+    совпадает с началом полного имени. Имя из одного токена (только
+    фамилия) совпадает с полным именем не больше чем на
+    PARTIAL_NAME_SIMILARITY. Сравнение прекращается, как только результат
+    заведомо ниже minimum.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return 0.0
+    if a == b:
+        return 1.0
+    if len(a) == 1 < len(b):
+        minimum /= PARTIAL_NAME_SIMILARITY
+    total = 0.0
+    for position, token in enumerate(a):
+        if token in b:
+            total += 1.0
+        else:
+            best = 0.0
+            for other in b:
+                similarity = token_similarity(token, other)
+                if similarity > best:
+                    best = similarity
+            total += best
+        if total + len(a) - position - 1 < minimum * len(a):
+            return 0.0
+    similarity = total / len(a)
+    return similarity * PARTIAL_NAME_SIMILARITY if len(a) == 1 < len(b) else similarity
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if a is b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def blocking_keys(name: Tuple[str, ...], company: Tuple[str, ...]) -> List[str]:
+    """Ключи блокировки записи: кандидаты на совпадение - записи с общим ключом
+
+    При весах по умолчанию записи с известными компаниями совпадают только
+    при общей компании, поэтому ключи с компанией (первые два ее токена и
+    один токен имени) переживают опечатку или инициал во втором токене
+    имени и лишние отчества. Записи без компании совпадают только по
+    полному имени. Запись без имени ни с чем не сравнивается.
+    """
+    if not name:
+        return []
+    keys = ['n:' + ' '.join(sorted(name))]
+    if company:
+        prefix = 'c:' + ' '.join(company[:2]) + ':'
+        keys += [prefix + token for token in dict.fromkeys(name) if len(token) > 1]
+    else:
+        first, last = name[0], name[-1]
+        keys += [f'l:{last}:{first[0]}', f'l:{first}:{last[0]}']
+    return keys
+
+
+class PersonIndex:
+    """Блокирующий индекс записей спикеров с объединением совпадений в кластеры
+
+    Каждая запись сравнивается только с записями, у которых есть общий
+    ключ блокировки (не больше block_limit на ключ), поэтому число
+    сравнений растет линейно с числом записей. Совпавшие записи
+    объединяются в систему непересекающихся множеств; корень кластера -
+    его самая ранняя запись. Кластеры не объединяются, если полные имена
+    в них несовместимы: J Smith похож и на John Smith, и на Jane Smith,
+    но не связывает их в одного человека.
+    """
+
+    def __init__(self, threshold: float = DEDUPE_THRESHOLD,
+                 min_name_similarity: float = DEDUPE_MIN_NAME_SIMILARITY,
+                 block_limit: int = DEDUPE_BLOCK_LIMIT):
+        self.threshold = threshold
+        self.min_name_similarity = min_name_similarity
+        self.block_limit = block_limit
+        self.names: List[Tuple[str, ...]] = []
+        self.companies: List[FrozenSet[str]] = []
+        self.positions: List[FrozenSet[str]] = []
+        self.parent: List[int] = []
+        # Корень кластера -> полные имена его записей (без инициалов), см. compatible
+        self.full_names: Dict[int, Set[Tuple[str, ...]]] = {}
+        self.blocks: Dict[str, List[int]] = {}
+        # Одинаковые множества токенов компаний и должностей хранятся в одном экземпляре
+        self._sets: Dict[FrozenSet[str], FrozenSet[str]] = {}
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(self, name: str, company: str, position: str) -> int:
+        """Добавляет запись, объединяя ее с совпавшими кандидатами; возвращает ее номер"""
+        name_tokens = tokens(name, NAME_STOPWORDS)
+        company_tokens = tokens(company, COMPANY_STOPWORDS)
+        index = len(self.parent)
+        self.parent.append(index)
+        self.names.append(name_tokens)
+        self.companies.append(self._intern(frozenset(company_tokens)))
+        self.positions.append(self._intern(frozenset(tokens(position))))
+        if sum(len(token) > 1 for token in name_tokens) > 1:
+            self.full_names[index] = {name_tokens}
+
+        compared = set()
+        root = index
+        for key in blocking_keys(name_tokens, company_tokens):
+            block = self.blocks.setdefault(key, [])
+            for other in block:
+                if other in compared:
+                    continue
+                compared.add(other)
+                if (self.find(other) != root and self.score(index, other) >= self.threshold
+                        and self.compatible(other, index)):
+                    self.union(other, index)
+                    root = self.find(index)
+            if len(block) < self.block_limit:
+                block.append(index)
+        return index
+
+    def _intern(self, values: FrozenSet[str]) -> FrozenSet[str]:
+        return self._sets.setdefault(values, values)
+
+    def score(self, a: int, b: int) -> float:
+        """Оценка совпадения двух записей от 0 до 1 (0, если она заведомо ниже порога)
+
+        Поле, пустое у обеих записей, не учитывается: веса остальных полей
+        нормируются, так что записи без компании и должности совпадают по
+        одному имени. Поле, пустое у одной из записей, дает UNKNOWN_SIMILARITY.
+        """
+        self.comparisons += 1
+        weight, rest = NAME_WEIGHT, 0.0
+        for field_weight, values in ((COMPANY_WEIGHT, (self.companies[a], self.companies[b])),
+                                     (POSITION_WEIGHT, (self.positions[a], self.positions[b]))):
+            if any(values):
+                weight += field_weight
+                rest += field_weight * (jaccard(*values) if all(values) else UNKNOWN_SIMILARITY)
+        # Сходство имени, без которого порог не набрать: сравнение имен - самая дорогая часть
+        required = max(self.min_name_similarity, (self.threshold * weight - rest) / NAME_WEIGHT)
+        if required > 1:
+            return 0.0
+        name = name_similarity(self.names[a], self.names[b], required)
+        if name < required:
+            return 0.0
+        return (NAME_WEIGHT * name + rest) / weight
+
+    def find(self, index: int) -> int:
+        parent = self.parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def compatible(self, a: int, b: int) -> bool:
+        """Можно ли объединить кластеры записей a и b: каждое полное имя одного
+        похоже на каждое полное имя другого не меньше чем на min_name_similarity"""
+        first = self.full_names.get(self.find(a), ())
+        second = self.full_names.get(self.find(b), ())
+        return all(name_similarity(x, y, self.min_name_similarity) >= self.min_name_similarity
+                   for x in first for y in second)
+
+    def union(self, a: int, b: int) -> None:
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            root, child = min(a, b), max(a, b)
+            self.parent[child] = root
+            names = self.full_names.pop(child, None)
+            if names:
+                self.full_names.setdefault(root, set()).update(names)
+
+    def clusters(self) -> Dict[int, List[int]]:
+        """Кластеры: корень -> номера записей по порядку добавления"""
+        result: Dict[int, List[int]] = {}
+        for index in range(len(self.parent)):
+            result.setdefault(self.find(index), []).append(index)
+        return result
+
+
+class PersonRegistry:
+    """Реестр person_id в файле SQLite: источник записи (speaker_url) -> человек
+
+    Хранит поля записей, поэтому люди из прошлых запусков участвуют в
+    сопоставлении без исходных файлов, и их person_id не меняется.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS people (
+            source TEXT PRIMARY KEY,
+            person_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            company TEXT NOT NULL,
+            position TEXT NOT NULL,
+            updated REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_people_person_id ON people(person_id);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(sqlite3.connect(path)) as conn:
+            conn.executescript(self.SCHEMA)
+
+    def load(self) -> List[Tuple[str, str, str, str, str]]:
+        """(source, person_id, name, company, position) в порядке первого появления"""
+        with closing(sqlite3.connect(self.path)) as conn:
+            return conn.execute(
+                "SELECT source, person_id, name, company, position FROM people ORDER BY rowid").fetchall()
+
+    def save(self, rows: Iterable[Tuple[str, str, str, str, str]]) -> None:
+        now = time.time()
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany(
+                """INSERT INTO people VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(source) DO UPDATE SET person_id = excluded.person_id, name = excluded.name,
+                       company = excluded.company, position = excluded.position, updated = excluded.updated""",
+                [row + (now,) for row in rows])
+
+
+def new_person_id(source: str) -> str:
+    """person_id нового человека: по источнику его первой записи"""
+    return 'p' + hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+
+
+@dataclass
+class DedupeReport:
+    """Итог сопоставления: записи входных файлов, люди среди них и число сравнений"""
+    records: int = 0
+    people: int = 0
+    new_people: int = 0
+    merged_ids: int = 0
+    comparisons: int = 0
+
+    def summary(self) -> str:
+        return (f"записей: {self.records}, людей: {self.people} (новых: {self.new_people}, "
+                f"объединено прежних: {self.merged_ids}), сравнений: {self.comparisons}")
+
+
+def resolve_people(filenames: List[str], output_file: str, registry: Optional[PersonRegistry] = None,
+                   index: Optional[PersonIndex] = None) -> DedupeReport:
+    """Присваивает записям файлов результатов person_id и пишет их в output_file
+
+    Записи с одинаковым speaker_url (повторные прогоны) считаются одной
+    записью. Кластер получает person_id самой ранней своей записи из
+    реестра; если реестр объединил несколько прежних person_id, остается
+    самый ранний.
+    """
+    index = index or PersonIndex()
+    sources: List[str] = []
+    details: List[Optional[Tuple[str, str, str]]] = []
+    known_ids: List[Optional[str]] = []
+    positions: Dict[str, int] = {}
+    first_of_person: Dict[str, int] = {}
+
+    for source, person_id, name, company, position in (registry.load() if registry else []):
+        number = index.add(name, company, position)
+        sources.append(source)
+        details.append((name, company, position))
+        known_ids.append(person_id)
+        positions[source] = number
+        # Прежние объединения сохраняются, даже если оценка изменилась
+        index.union(first_of_person.setdefault(person_id, number), number)
+
+    records: List[Tuple[int, Tuple[str, ...]]] = []
+    columns = {column: position for position, column in enumerate(SPEAKER_COLUMNS)}
+    url, slug = columns['speaker_url'], columns['speaker_slug']
+    name, company, position = columns['name'], columns['company'], columns['position']
+    for filename in filenames:
+        for values in SpeakerTable.load(filename).rows():
+            source = values[url] or values[slug]
+            number = positions.get(source)
+            if number is None:
+                number = index.add(values[name], values[company], values[position])
+                positions[source] = number
+                sources.append(source)
+                details.append(None)
+                known_ids.append(None)
+            # В реестр попадают поля последней версии записи
+            details[number] = (values[name], values[company], values[position])
+            records.append((number, values))
+
+    person_ids: List[str] = [''] * len(index)
+    in_output = {number for number, _ in records}
+    report = DedupeReport(records=len(records), comparisons=index.comparisons)
+    for root, members in index.clusters().items():
+        previous = [known_ids[member] for member in members if known_ids[member]]
+        if previous:
+            person_id = previous[0]
+            report.merged_ids += len(set(previous)) - 1
+        else:
+            person_id = new_person_id(sources[root])
+            report.new_people += 1
+        if not in_output.isdisjoint(members):
+            report.people += 1
+        for member in members:
+            person_ids[member] = person_id
+
+    if registry:
+        registry.save(
+            (sources[number], person_ids[number]) + details[number]
+            for number in range(len(index))
+            if number in in_output or known_ids[number] != person_ids[number]
+        )
+
+    tmp_filename = output_file + '.part'
+    with open(tmp_filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(OUTPUT_COLUMNS)
+        writer.writerows((person_ids[number],) + tuple(values) for number, values in records)
+    os.replace(tmp_filename, output_file)
+    return report
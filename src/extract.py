@@ -0,0 +1,224 @@
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import (
+    BASE_URL, LISTING_HREF_MARKERS, PARSER_BACKEND, SESSION_ITEM_CLASS, SPEAKER_DETAIL_PATH, SPEAKER_ENTRY_CLASS
+)
+from src.logsetup import LOGGER_NAME
+from src.metrics import Metrics
+from src.models import ListingPage, Session, Speaker, SpeakerSlug
+from src.normalize import clean_text, extract_slug_from_javascript, parse_session_time
+from src.parsing import Node, index_by_class, parse_html, parse_links, resolve_backend
+
+
+class SpeakerExtractor:
+    """Извлечение данных спикеров из страниц сайта DSEI, без сети
+
+    Парсер наследует от него; процессы повторного извлечения из архива
+    используют его напрямую, без транспорта и настройки логирования.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, parser_backend: str = PARSER_BACKEND,
+                 detail_path: str = SPEAKER_DETAIL_PATH, metrics: Optional[Metrics] = None):
+        self.logger = logging.getLogger(LOGGER_NAME)
+        self.base_url = base_url.rstrip('/')
+        self.speaker_detail_url = self.base_url + detail_path
+        self.parser_backend = resolve_backend(parser_backend)
+        self.metrics = metrics or Metrics()
+
+    def parse_page(self, content: bytes, class_prefix: Optional[str] = None) -> Node:
+        """Строит HTML-дерево выбранным парсером (см. parse_html)"""
+        with self.metrics.timer('parse'):
+            return parse_html(content, self.parser_backend, class_prefix)
+
+    def parse_listing(self, content: bytes) -> ListingPage:
+        """Разбирает страницу списка: в дерево попадают только ссылки на спикеров и страницы"""
+        with self.metrics.timer('parse'):
+            root = parse_links(content, self.parser_backend, LISTING_HREF_MARKERS)
+        return self.analyze_listing_page(root)
+
+    def analyze_listing_page(self, soup: Node) -> ListingPage:
+        """Один проход по ссылкам страницы списка: slug спикеров и номер последней страницы"""
+        listing = ListingPage()
+        seen_slugs = set()  # Для более эффективной дедупликации по slug
+
+        for link in soup.find_all('a'):
+            href = link.attr('href')
+            if not href:
+                continue
+
+            # Ссылки пагинации
+            if 'page=' in href:
+                try:
+                    # Извлекаем номер страницы из href
+                    listing.max_page = max(listing.max_page, int(href.split('page=')[1].split('&')[0]))
+                except (ValueError, IndexError):
+                    pass
+
+            # Ссылки с JavaScript функцией openRemoteModal
+            if 'openRemoteModal' not in href or 'speakers/' not in href:
+                continue
+
+            slug = extract_slug_from_javascript(href)
+            if not slug or slug in seen_slugs:  # Проверяем только по slug
+                continue
+            seen_slugs.add(slug)
+
+            # Имя спикера: из aria-label или из текста ссылки
+            name = link.attr('aria-label') or link.text().strip()
+            name = clean_text(name) if name else ""
+
+            listing.slugs.append(SpeakerSlug(slug=slug, name=name))
+            self.logger.info("Найден спикер: %s (slug: %s)", name, slug, extra={'stage': 'listing', 'slug': slug})
+
+        return listing
+
+    def extract_speakers_slugs_from_page(self, soup: Node) -> List[SpeakerSlug]:
+        """Извлекает список slug спикеров со страницы"""
+        return self.analyze_listing_page(soup).slugs
+
+    def get_max_page(self, soup: Node) -> int:
+        """Возвращает максимальный номер страницы из ссылок пагинации (0 если их нет)"""
+        return self.analyze_listing_page(soup).max_page
+
+    def extract_speaker_details(self, soup: Node, slug: str) -> Speaker:
+        """Извлекает детальную информацию о спикере
+
+        Дерево обходится один раз: все элементы m-speaker-entry__* собираются
+        в индекс, из которого затем заполняются поля.
+        """
+        speaker = Speaker()
+        speaker.speaker_slug = slug
+        speaker.speaker_url = f"{self.speaker_detail_url}/{slug}"
+
+        index = index_by_class(soup, SPEAKER_ENTRY_CLASS)
+
+        # Имя спикера
+        title_elem = index.get(('h2', 'm-speaker-entry__item__title'))
+        if title_elem:
+            speaker.name = clean_text(title_elem.text())
+
+        # Детали (позиция, компания, страна)
+        if ('div', 'm-speaker-entry__item__details') in index:
+            # Позиция
+            position_elem = index.get(('span', 'm-speaker-entry__item__details__position'))
+            if position_elem:
+                speaker.position = clean_text(position_elem.text()).rstrip(',')
+
+            # Компания
+            company_elem = index.get(('span', 'm-speaker-entry__item__details__company'))
+            if company_elem:
+                speaker.company = clean_text(company_elem.text())
+
+            # Страна
+            country_elem = index.get(('div', 'm-speaker-entry__item__details__company__country'))
+            if country_elem:
+                speaker.country = clean_text(country_elem.text())
+
+        # Описание
+        description_elem = index.get(('div', 'm-speaker-entry__item__description'))
+        if description_elem:
+            # Получаем весь текст, очищаем от HTML тегов
+            description_text = description_elem.text()
+            speaker.description = clean_text(description_text)
+
+        # Социальные сети
+        social_list = index.get(('ul', 'm-speaker-entry__item__social'))
+        if social_list:
+            social_links = []
+            for social_item in social_list.find_all('li'):
+                link = social_item.find('a')
+                if link:
+                    href = link.attr('href')
+                    if href:
+                        social_links.append(href)
+            speaker.social_network = '; '.join(social_links)
+
+        # Информация о сессиях: все сессии, в колонках session_* - первая
+        speaker.sessions = self.extract_sessions(soup, index)
+        if speaker.sessions:
+            first = speaker.sessions[0]
+            speaker.session_date = first.date
+            speaker.session_time = first.time
+            speaker.session_location = first.location
+            speaker.session_topic_link = first.topic_link
+            speaker.session_topic_title = first.topic_title
+
+        return speaker
+
+    def extract_sessions(self, soup: Node, index: Optional[Dict[Tuple[str, str], Node]] = None) -> List[Session]:
+        """Извлекает все сессии спикера (index - уже построенный index_by_class)"""
+        if index is None:
+            index = index_by_class(soup, SPEAKER_ENTRY_CLASS)
+
+        # Локация указывается в деталях спикера и относится ко всем его сессиям
+        location_elem = index.get(('div', 'm-speaker-entry__item__details__location'))
+        location = clean_text(location_elem.text()) if location_elem else ''
+
+        sessions = [self._build_session(index_by_class(item, SESSION_ITEM_CLASS), location)
+                    for item in soup.find_all('li', SESSION_ITEM_CLASS)]
+        if not sessions:
+            # Поля сессии вне элемента списка
+            session = self._build_session(index, location)
+            if session != Session():
+                sessions.append(session)
+        return sessions
+
+    def _build_session(self, index: Dict[Tuple[str, str], Node], location: str) -> Session:
+        """Заполняет сессию из индекса элементов одного элемента списка сессий"""
+        session = Session(location=location)
+
+        # Дата сессии
+        date_elem = index.get(('div', SESSION_ITEM_CLASS + '__date'))
+        if date_elem:
+            session.date = clean_text(date_elem.text())
+
+        # Время сессии
+        time_elem = index.get(('div', SESSION_ITEM_CLASS + '__time'))
+        if time_elem:
+            session.time = parse_session_time(time_elem.text())
+
+        # Ссылка и название темы
+        topic_link_elem = index.get(('a', SESSION_ITEM_CLASS + '__title'))
+        if topic_link_elem:
+            href = topic_link_elem.attr('href')
+            if href:
+                session.topic_link = href if href.startswith('http') else urljoin(self.base_url, href)
+            session.topic_title = clean_text(topic_link_elem.text())
+
+        return session
+
+    def extract_session_info(self, soup: Node, index: Optional[Dict[Tuple[str, str], Node]] = None) -> Dict[str, str]:
+        """Информация о первой сессии спикера (все сессии - extract_sessions)"""
+        sessions = self.extract_sessions(soup, index)
+        session = sessions[0] if sessions else Session()
+        return {
+            'date': session.date,
+            'time': session.time,
+            'location': session.location,
+            'topic_link': session.topic_link,
+            'topic_title': session.topic_title
+        }
+
+    def extract_session_description(self, soup: Node) -> str:
+        """Описание со страницы сессии (мета-тег og:description или description)"""
+        for meta in soup.find_all('meta'):
+            if meta.attr('property') == 'og:description' or meta.attr('name') == 'description':
+                return clean_text(meta.attr('content'))
+        return ""
+
+    def build_speaker(self, soup: Node, speaker_slug: SpeakerSlug) -> Speaker:
+        """Извлекает данные спикера, дополняя их сведениями со страницы списка"""
+        with self.metrics.timer('extract'):
+            speaker = self.extract_speaker_details(soup, speaker_slug.slug)
+
+        # Если имя не удалось извлечь из детальной страницы, используем из списка
+        if not speaker.name and speaker_slug.name:
+            speaker.name = speaker_slug.name
+
+        return speaker
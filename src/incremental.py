@@ -0,0 +1,79 @@
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from src.columnar import read_rows
+from src.models import Session, Speaker
+from src.sinks import sessions_filename
+from src.storage import SpeakerDatabase
+
+
+@dataclass
+class IncrementalReport:
+    """Итоги инкрементального прогона"""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def summary(self) -> str:
+        return (f"новых: {len(self.added)}, изменено: {len(self.changed)}, "
+                f"удалено: {len(self.removed)}, без изменений: {self.unchanged}")
+
+
+def _read_rows(filename: str) -> List[dict]:
+    if filename.endswith('.parquet'):
+        return read_rows(filename)
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        if filename.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+
+def load_baseline(filename: str) -> Dict[str, Speaker]:
+    """Загружает результат предыдущего прогона (CSV, JSONL, Parquet или SQLite) вместе с сессиями: slug -> Speaker"""
+    if not os.path.exists(filename):
+        return {}
+
+    if filename.endswith('.sqlite'):
+        db = SpeakerDatabase(filename, readonly=True)
+        try:
+            return db.load_speakers()
+        finally:
+            db.close()
+
+    speakers = {
+        row['speaker_slug']: Speaker.from_dict(row)
+        for row in _read_rows(filename)
+        if row.get('speaker_slug')
+    }
+    if os.path.exists(sessions_filename(filename)):
+        for row in _read_rows(sessions_filename(filename)):
+            speaker = speakers.get(row.get('speaker_slug', ''))
+            if speaker:
+                speaker.sessions.append(Session(**{name: row.get(name) or "" for name in Session.__dataclass_fields__}))
+    return speakers
+
+
+def state_filename(output_file: str) -> str:
+    """Файл хэшей рядом с результатом: у каждого результата (события) свой"""
+    return os.path.splitext(output_file)[0] + '.state.json'
+
+
+def load_state(state_file: str) -> Dict[str, str]:
+    """Загружает хэши содержимого детальных страниц: slug -> sha256"""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('hashes', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state_file: str, hashes: Dict[str, str]) -> None:
+    """Атомарно сохраняет хэши содержимого"""
+    tmp_file = state_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'hashes': hashes}, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp_file, state_file)
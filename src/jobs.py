@@ -0,0 +1,272 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config.settings import (
+    BASE_URL, SPEAKERS_LIST_PATH, SPEAKER_DETAIL_PATH, SPEAKERS_LIST_PARAMS, SPEAKER_DETAIL_PARAMS,
+    OUTPUT_FORMAT, OUTPUT_FILES, MAX_WORKERS, REQUESTS_PER_SECOND, ADAPTIVE_RATE_LIMIT,
+    PARSER_BACKEND, TRANSPORT, ENRICH_SESSIONS, JOBS_DIR, JOB_LEASE_TIMEOUT, JOB_MAX_ATTEMPTS
+)
+from src.columnar import dataset_file
+
+JOB_NAME_PATTERN = re.compile(r'^[\w.-]+$')
+
+
+@dataclass
+class Job:
+    """Одно событие на платформе сайта: откуда брать спикеров и куда писать результат"""
+    name: str
+    base_url: str = BASE_URL
+    list_path: str = SPEAKERS_LIST_PATH
+    detail_path: str = SPEAKER_DETAIL_PATH
+    list_params: Dict[str, str] = field(default_factory=lambda: dict(SPEAKERS_LIST_PARAMS))
+    detail_params: Dict[str, str] = field(default_factory=lambda: dict(SPEAKER_DETAIL_PARAMS))
+    output_file: str = ""
+    output_format: str = OUTPUT_FORMAT
+    workers: int = MAX_WORKERS
+    host_rps: float = REQUESTS_PER_SECOND  # общий лимит хоста, делится между его заданиями
+    adaptive: bool = ADAPTIVE_RATE_LIMIT
+    parser_backend: str = PARSER_BACKEND
+    transport: str = TRANSPORT
+    cache: bool = False
+    enrich_sessions: bool = ENRICH_SESSIONS
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.base_url).netloc
+
+    @property
+    def checkpoint_file(self) -> str:
+        return os.path.splitext(self.output_file)[0] + '.checkpoint.jsonl'
+
+    @property
+    def metrics_file(self) -> str:
+        return os.path.splitext(self.output_file)[0] + '.metrics.json'
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Job':
+        return cls(**json.loads(text))
+
+
+@dataclass
+class JobSpec:
+    """Файл заданий: события, лимиты хостов и объединенный результат"""
+    jobs: List[Job]
+    merged_file: str
+    output_format: str = OUTPUT_FORMAT
+
+
+def _build_job(values: Dict[str, Any], host_limits: Dict[str, float], output_dir: str,
+               dataset: Optional[str] = None) -> Job:
+    values = dict(values)
+    name = values.get('name', '')
+    if not JOB_NAME_PATTERN.match(name):
+        raise ValueError(f"Недопустимое имя задания: {name!r} (буквы, цифры, '.', '-', '_')")
+
+    # Короткая запись события: searchgroup страницы списка и детальных страниц
+    list_params = dict(values.pop('list_params', SPEAKERS_LIST_PARAMS))
+    detail_params = dict(values.pop('detail_params', SPEAKER_DETAIL_PARAMS))
+    if 'searchgroup' in values:
+        list_params['searchgroup'] = values.pop('searchgroup')
+    if 'detail_searchgroup' in values:
+        detail_params['searchgroup'] = values.pop('detail_searchgroup')
+
+    known = {item.name for item in fields(Job)}
+    unknown = sorted(set(values) - known)
+    if unknown:
+        raise ValueError(f"Задание {name}: неизвестные поля {', '.join(unknown)}")
+
+    job = Job(list_params=list_params, detail_params=detail_params, **values)
+    if job.output_format not in OUTPUT_FILES:
+        raise ValueError(f"Задание {name}: неизвестный формат вывода {job.output_format}")
+    if 'host_rps' not in values:
+        job.host_rps = host_limits.get(job.host, REQUESTS_PER_SECOND)
+    if dataset and not job.output_file:
+        # Раздел набора данных Parquet: event=<имя задания>/run_date=<дата постановки в очередь>
+        if job.output_format != 'parquet':
+            raise ValueError(f"Задание {name}: набор данных dataset пишется только в формате parquet")
+        job.output_file = dataset_file(dataset, name)
+    if not job.output_file:
+        job.output_file = os.path.join(output_dir, f"{name}.{job.output_format}")
+    return job
+
+
+def load_spec(filename: str) -> JobSpec:
+    """Читает файл заданий в формате JSON
+
+    {"output_dir": ..., "merged_file": ..., "dataset": ..., "defaults": {...},
+     "host_limits": {"www.dsei.co.uk": 1.0}, "jobs": [{"name": ..., "searchgroup": ...}, ...]}
+
+    Поля задания (кроме name) можно вынести в defaults. С dataset задания
+    формата parquet пишут разделы набора данных (см. src.columnar) вместо
+    файлов в output_dir. Бросает ValueError при ошибке в файле.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Файл заданий {filename} не является JSON: {e}")
+
+    if not isinstance(data, dict) or not data.get('jobs'):
+        raise ValueError(f"В файле {filename} нет списка jobs")
+
+    output_dir = data.get('output_dir', JOBS_DIR)
+    defaults = data.get('defaults', {})
+    host_limits = data.get('host_limits', {})
+    dataset = data.get('dataset')
+    jobs = [_build_job({**defaults, **values}, host_limits, output_dir, dataset) for values in data['jobs']]
+
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Повторяющиеся имена заданий: {', '.join(duplicates)}")
+
+    output_format = data.get('output_format', defaults.get('output_format', OUTPUT_FORMAT))
+    merged_file = data.get('merged_file') or os.path.join(output_dir, f"merged.{output_format}")
+    return JobSpec(jobs, merged_file, output_format)
+
+
+class WorkQueue:
+    """Очередь заданий в файле SQLite
+
+    Исполнители (процессы одной машины или нескольких машин с общим
+    каталогом) забирают задания с арендой на lease_timeout секунд и
+    продлевают ее, пока работают. Задание упавшего исполнителя после
+    истечения аренды снова выдается, но не больше max_attempts раз.
+    Захват выполняется в транзакции BEGIN IMMEDIATE, поэтому одно задание
+    не достанется двум исполнителям.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            name TEXT PRIMARY KEY,
+            host TEXT NOT NULL,
+            spec TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_until REAL,
+            speakers INTEGER,
+            error TEXT,
+            updated REAL
+        )
+    """
+
+    def __init__(self, path: str, lease_timeout: float = JOB_LEASE_TIMEOUT,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max(1, max_attempts)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Журнал отката (не WAL): WAL требует общей памяти и не работает на сетевых дисках
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, jobs: List[Job], reset: bool = False) -> None:
+        """Добавляет задания; у существующих обновляет описание, а при reset - и состояние"""
+        now = time.time()
+        on_conflict = "spec = excluded.spec, host = excluded.host"
+        if reset:
+            on_conflict += (", status = 'pending', worker = NULL, attempts = 0, lease_until = NULL,"
+                            " speakers = NULL, error = NULL, updated = excluded.updated")
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO jobs (name, host, spec, updated) VALUES (?, ?, ?, ?) "
+                f"ON CONFLICT(name) DO UPDATE SET {on_conflict}",
+                [(job.name, job.host, job.to_json(), now) for job in jobs]
+            )
+            conn.execute("COMMIT")
+
+    def claim(self, worker: str) -> Optional[Tuple[Job, int]]:
+        """Забирает следующее задание, возвращает его и номер попытки (или None)"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Аренда истекла, а попытки кончились - задание больше не выдается
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'истекла аренда', updated = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT name, spec, attempts FROM jobs "
+                "WHERE status = 'pending' OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY rowid LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "lease_until = ?, error = NULL, updated = ? WHERE name = ?",
+                (worker, now + self.lease_timeout, now, row['name'])
+            )
+            conn.execute("COMMIT")
+        return Job.from_json(row['spec']), row['attempts'] + 1
+
+    def heartbeat(self, name: str, worker: str) -> Optional[int]:
+        """Продлевает аренду; возвращает число работающих заданий того же хоста
+
+        None - аренда потеряна (задание отдано другому исполнителю).
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated = ? "
+                "WHERE name = ? AND worker = ? AND status = 'running'",
+                (now + self.lease_timeout, now, name, worker)
+            ).rowcount
+            if not updated:
+                return None
+            return conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'running' AND lease_until >= ? "
+                "AND host = (SELECT host FROM jobs WHERE name = ?)",
+                (now, name)
+            ).fetchone()[0]
+
+    def complete(self, name: str, worker: str, speakers: int) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', speakers = ?, lease_until = NULL, updated = ? "
+                "WHERE name = ? AND worker = ?",
+                (speakers, time.time(), name, worker)
+            )
+
+    def fail(self, name: str, worker: str, error: str) -> None:
+        """Возвращает задание в очередь, а после max_attempts попыток помечает как failed"""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                "error = ?, lease_until = NULL, updated = ? WHERE name = ? AND worker = ?",
+                (self.max_attempts, error, time.time(), name, worker)
+            )
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Состояние всех заданий в порядке добавления"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT name, host, status, worker, attempts, speakers, error FROM jobs ORDER BY rowid"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def unfinished(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'running')"
+            ).fetchone()[0]
@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+
+from src.models import Speaker, SpeakerSlug
+
+
+@dataclass
+class JournalState:
+    """Состояние, восстановленное из журнала"""
+    slugs: List[SpeakerSlug] = field(default_factory=list)
+    listing_complete: bool = False
+    speakers: Dict[str, Speaker] = field(default_factory=dict)
+    # Спикеры без детальной страницы (HTTP 4xx): повторно не запрашиваются
+    skipped: Set[str] = field(default_factory=set)
+
+
+class CheckpointJournal:
+    """Журнал контрольных точек в формате JSONL (только дозапись)
+
+    Каждая запись - одна строка: найденный slug, отметка о завершении
+    обхода списка, готовые данные спикера или пропущенный спикер. Записи
+    сбрасываются на диск (flush + fsync) пачками по flush_every штук;
+    недописанная последняя строка после сбоя при загрузке игнорируется,
+    а при продолжении прогона отрезается.
+    """
+
+    def __init__(self, path: str, flush_every: int):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._file = None
+
+    def load(self) -> JournalState:
+        """Читает журнал предыдущего прогона"""
+        state = JournalState()
+        if not os.path.exists(self.path):
+            return state
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # строка, оборванная при сбое
+
+                kind = record.get('type')
+                if kind == 'slug':
+                    state.slugs.append(SpeakerSlug(slug=record['slug'], name=record.get('name', '')))
+                elif kind == 'listing_complete':
+                    state.listing_complete = True
+                elif kind == 'speaker':
+                    speaker = Speaker.from_dict(record['data'])
+                    state.speakers[speaker.speaker_slug] = speaker
+                elif kind == 'skipped':
+                    state.skipped.add(record['slug'])
+
+        return state
+
+    def open(self, resume: bool) -> JournalState:
+        """Открывает журнал на дозапись; без resume начинает его заново"""
+        state = self.load() if resume else JournalState()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if resume:
+            self._truncate_torn_line()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        return state
+
+    def _truncate_torn_line(self) -> None:
+        """Отрезает строку, оборванную при сбое: иначе к ней приклеится первая новая запись"""
+        try:
+            f = open(self.path, 'rb+')
+        except FileNotFoundError:
+            return
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end:
+                f.seek(max(0, end - 4096))
+                chunk = f.read(end - max(0, end - 4096))
+                newline = chunk.rfind(b'\n')
+                if newline != -1:
+                    end = end - len(chunk) + newline + 1
+                    break
+                end -= len(chunk)
+            if end != size:
+                f.truncate(end)
+
+    def _append(self, record: dict, force_flush: bool = False) -> None:
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._pending += 1
+            if force_flush or self._pending >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def append_slug(self, speaker_slug: SpeakerSlug) -> None:
+        self._append({'type': 'slug', 'slug': speaker_slug.slug, 'name': speaker_slug.name})
+
+    def mark_listing_complete(self) -> None:
+        self._append({'type': 'listing_complete'}, force_flush=True)
+
+    def append_speaker(self, speaker: Speaker) -> None:
+        self._append({'type': 'speaker', 'data': speaker.to_record()})
+
+    def append_skipped(self, slug: str) -> None:
+        self._append({'type': 'skipped', 'slug': slug})
+
+    def close(self) -> None:
+        """Сбрасывает незаписанные записи и закрывает файл"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush_locked()
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Удаляет журнал после успешного завершения прогона"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
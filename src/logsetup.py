@@ -0,0 +1,175 @@
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Mapping, Optional, Union
+
+LOGGER_NAME = 'dsei_scraper'
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Этапы, которые передаются в extra={'stage': ...}: запросы, страницы списка,
+# детальные страницы спикеров и страницы сессий
+STAGES = ('request', 'listing', 'speaker', 'session')
+# Поля extra, которые попадают в JSON Lines
+STRUCTURED_FIELDS = ('stage', 'slug', 'url', 'status', 'attempt', 'latency')
+
+# Фоновый поток записи (None, если остановлен) и его очередь с обработчиками
+_listener: Optional[QueueListener] = None
+_queue: Optional[queue.SimpleQueue] = None
+_handlers: list = []
+_lock = threading.Lock()
+
+
+def parse_level(level: Union[str, int]) -> int:
+    """Уровень логирования по имени (INFO, warning...) или числу"""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Неизвестный уровень логирования: {level}")
+    return value
+
+
+class JSONFormatter(logging.Formatter):
+    """Запись лога одной строкой JSON: время, уровень, поток, сообщение и поля extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for name in STRUCTURED_FIELDS:
+            value = record.__dict__.get(name)
+            if value is not None:
+                data[name] = round(value, 4) if name == 'latency' else value
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class StageFilter(logging.Filter):
+    """Уровень и выборка сообщений по этапам
+
+    Работает в вызывающем потоке до постановки записи в очередь, так что
+    отброшенное сообщение не форматируется. Из сообщений этапа ниже
+    WARNING при выборке пишется каждое N-е; ошибки пишутся всегда.
+    """
+
+    def __init__(self, levels: Mapping[str, Union[str, int]], sample_every: Mapping[str, int]):
+        super().__init__()
+        self.levels = {stage: parse_level(level) for stage, level in levels.items()}
+        self.sample_every = {stage: every for stage, every in sample_every.items() if every > 1}
+        self._counters = {stage: itertools.count() for stage in self.sample_every}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stage = record.__dict__.get('stage')
+        if stage is None:
+            return True
+        if record.levelno < self.levels.get(stage, logging.NOTSET):
+            return False
+        every = self.sample_every.get(stage)
+        if every and record.levelno < logging.WARNING:
+            return next(self._counters[stage]) % every == 0
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Ставит запись в очередь как есть: сообщение собирается в потоке записи
+
+    Очередь не выходит за пределы процесса, поэтому запись не нужно
+    готовить к pickle; аргументы сообщений - строки и числа, которые не
+    меняются после вызова.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _start_listener() -> None:
+    global _listener
+    _listener = QueueListener(_queue, *_handlers)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _stop_on_exit() -> None:
+    atexit.register(stop_logging)
+    # Процессы multiprocessing завершаются через os._exit, минуя atexit
+    multiprocessing = sys.modules.get('multiprocessing')
+    if multiprocessing is not None:
+        from multiprocessing.util import Finalize
+        Finalize(None, stop_logging, exitpriority=0)
+
+
+def _after_fork_in_child() -> None:
+    # Поток записи не переживает fork: в дочернем процессе запускается новый
+    global _lock
+    _lock = threading.Lock()
+    if _listener is not None:
+        _start_listener()
+        _stop_on_exit()
+
+
+def setup_logging(log_file: str, level: Union[str, int] = 'INFO', json_file: Optional[str] = None,
+                  stage_levels: Optional[Dict[str, Union[str, int]]] = None,
+                  sample_every: Optional[Dict[str, int]] = None) -> logging.Logger:
+    """Настройка логирования (один раз на процесс, повторные вызовы возвращают тот же логгер)
+
+    Вызовы логгера только кладут запись в очередь; форматирование и запись
+    в файл и на консоль (и в JSON Lines, если указан json_file) идут в
+    фоновом потоке.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.handlers:
+        return logger
+    logger.setLevel(parse_level(level))
+
+    formatter = logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    for filename in filter(None, (log_file, json_file)):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        handler = logging.FileHandler(filename, encoding='utf-8')
+        handler.setFormatter(JSONFormatter() if filename == json_file else formatter)
+        handlers.append(handler)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    handlers.append(console_handler)
+
+    global _queue, _handlers
+    with _lock:
+        _queue, _handlers = queue.SimpleQueue(), handlers
+        _start_listener()
+    logger.addHandler(_DeferredQueueHandler(_queue))
+    if stage_levels or sample_every:
+        logger.addFilter(StageFilter(stage_levels or {}, sample_every or {}))
+
+    _stop_on_exit()
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+    return logger
+
+
+def flush_logging() -> None:
+    """Дожидается записи всех сообщений, уже поставленных в очередь"""
+    with _lock:
+        if _listener is not None:
+            _stop_listener()
+            _start_listener()
+
+
+def stop_logging() -> None:
+    """Записывает оставшиеся сообщения и останавливает фоновый поток"""
+    with _lock:
+        _stop_listener()
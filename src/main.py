@@ -1,25 +1,210 @@
 #!/usr/bin/env python3
 """
 Главный файл для запуска парсера спикеров DSEI
+
+Команды: scrape (по умолчанию), analyze, dedupe и benchmark. HTTP-клиент,
+HTML-парсер и остальные тяжелые модули импортируются только командой,
+которой они нужны.
 """
 
 import sys
 import os
+import argparse
+import time
 
 # Добавляем корневую директорию в путь Python
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.scraper import DSEISpeakerScraper
+from config.settings import (
+    BASE_URL, MAX_WORKERS, REQUESTS_PER_SECOND, MAX_REQUESTS_PER_SECOND, ADAPTIVE_RATE_LIMIT,
+    PIPELINE_ENABLED, PARALLEL_PAGINATION,
+    CACHE_DIR, CACHE_TTL, CACHE_MAX_BYTES, OUTPUT_FORMAT, OUTPUT_FILES, PARSER_BACKEND, PARSER_BACKENDS,
+    ARCHIVE_DIR, TRANSPORT, TRANSPORT_NAMES, CONNECTION_POOL_SIZE, METRICS_FILE, PROFILE_FILES, ENRICH_SESSIONS,
+    LOG_FILE, LOG_LEVEL, LOG_JSON_FILE, LOG_STAGE_LEVELS, LOG_SAMPLE_EVERY,
+    PEOPLE_FILE, PEOPLE_REGISTRY_FILE, DEDUPE_THRESHOLD, PARQUET_DATASET_DIR, DATASET_EVENT
+)
+from src.logsetup import STAGES, parse_level, setup_logging
+from src.metrics import PROFILERS
 
+COMMANDS = ('scrape', 'analyze', 'dedupe', 'benchmark')
 
-def main():
-    """Главная функция"""
+
+def stage_option(convert):
+    """Тип аргумента ЭТАП=ЗНАЧЕНИЕ для настроек логирования по этапам"""
+    def parse(text: str):
+        stage, sep, value = text.partition('=')
+        if not sep or stage not in STAGES:
+            raise argparse.ArgumentTypeError(f"ожидается ЭТАП=ЗНАЧЕНИЕ, этапы: {', '.join(STAGES)}")
+        try:
+            return stage, convert(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    return parse
+
+
+def filter_option(text: str):
+    """Условие КОЛОНКА=ЗНАЧЕНИЕ для отбора записей и разделов набора данных"""
+    column, sep, value = text.partition('=')
+    if not sep or not column:
+        raise argparse.ArgumentTypeError("ожидается КОЛОНКА=ЗНАЧЕНИЕ, например event=dsei")
+    return column, '=', value
+
+
+def add_scrape_arguments(parser: argparse.ArgumentParser) -> None:
+    """Параметры команды scrape"""
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="Базовый URL сайта (например, локальный тестовый сервер)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help="Количество потоков для загрузки детальных страниц")
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND,
+                        help="Общий лимит запросов в секунду (начальный при адаптивном режиме)")
+    parser.add_argument("--max-rps", type=float, default=MAX_REQUESTS_PER_SECOND,
+                        help="Верхняя граница адаптивного лимита")
+    parser.add_argument("--fixed-rate", dest="adaptive", action="store_false", default=ADAPTIVE_RATE_LIMIT,
+                        help="Не адаптировать лимит запросов")
+    parser.add_argument("--no-pipeline", dest="pipeline", action="store_false", default=PIPELINE_ENABLED,
+                        help="Сначала собрать весь список спикеров, затем загружать детали")
+    parser.add_argument("--sequential-pages", dest="parallel_pagination", action="store_false",
+                        default=PARALLEL_PAGINATION,
+                        help="Загружать страницы списка строго по очереди")
+    parser.add_argument("--cache", action="store_true",
+                        help="Использовать дисковый кэш HTTP-ответов")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="Каталог кэша")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL,
+                        help="Время жизни записи кэша в секундах до перепроверки")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Обновить предыдущий результат: новые спикеры и перепроверка известных через кэш (включает --cache)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Продолжить прерванный прогон по журналу контрольных точек")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FILES), default=OUTPUT_FORMAT,
+                        help="Формат выходного файла (parquet требует pyarrow, см. requirements-optional.txt)")
+    parser.add_argument("--output", default=None,
+                        help="Путь к выходному файлу (по умолчанию data/speakers.<format>)")
+    parser.add_argument("--dataset", nargs="?", const=PARQUET_DATASET_DIR, default=None,
+                        help="Добавить прогон разделом event=<событие>/run_date=<дата> в набор данных "
+                             "Parquet (по умолчанию data/parquet)")
+    parser.add_argument("--event", default=DATASET_EVENT,
+                        help="Событие - раздел набора данных для --dataset")
+    parser.add_argument("--parser", dest="parser_backend", choices=("auto",) + PARSER_BACKENDS, default=PARSER_BACKEND,
+                        help="HTML-парсер (selectolax и lxml - необязательные зависимости, "
+                             "см. requirements-optional.txt)")
+    parser.add_argument("--archive", nargs="?", const=ARCHIVE_DIR, default=None,
+                        help="Сохранять сырые ответы в архив (по умолчанию data/archive)")
+    parser.add_argument("--transport", choices=TRANSPORT_NAMES, default=TRANSPORT,
+                        help="HTTP-клиент: requests (HTTP/1.1) или httpx (HTTP/2, pip install 'httpx[http2]')")
+    parser.add_argument("--pool-size", type=int, default=CONNECTION_POOL_SIZE,
+                        help="Размер пула соединений (по умолчанию по количеству потоков)")
+    parser.add_argument("--metrics", default=METRICS_FILE,
+                        help="Файл JSON-отчета о времени этапов и счетчиках прогона")
+    parser.add_argument("--enrich-sessions", action="store_true", default=ENRICH_SESSIONS,
+                        help="Загрузить страницы сессий (каждую один раз) и дополнить сессии описанием")
+    parser.add_argument("--log-level", type=parse_level, default=LOG_LEVEL,
+                        help="Уровень логирования (DEBUG, INFO, WARNING...)")
+    parser.add_argument("--log-json", nargs="?", const=LOG_JSON_FILE, default=None,
+                        help="Дублировать лог в JSON Lines (по умолчанию logs/scraper.jsonl)")
+    parser.add_argument("--log-stage", type=stage_option(parse_level), action="append", default=[],
+                        metavar="STAGE=LEVEL",
+                        help=f"Уровень логирования этапа ({', '.join(STAGES)}), например request=WARNING")
+    parser.add_argument("--log-sample", type=stage_option(int), action="append", default=[],
+                        metavar="STAGE=N",
+                        help="Писать каждое N-е сообщение этапа ниже WARNING, например listing=10")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=PROFILERS, default=None,
+                        help="Профилировать прогон (cprofile по умолчанию или pyinstrument - pip install pyinstrument)")
+
+
+def parse_args(argv=None):
+    """Разбор аргументов командной строки"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Без команды - парсинг, как раньше: python run.py --workers 8
+    if not argv or argv[0] not in COMMANDS + ('-h', '--help'):
+        argv = ['scrape'] + argv
+
+    parser = argparse.ArgumentParser(description="Парсер спикеров DSEI")
+    commands = parser.add_subparsers(dest="command")
+    add_scrape_arguments(commands.add_parser("scrape", help="Парсинг спикеров (команда по умолчанию)"))
+    analyze = commands.add_parser(
+        "analyze", help="Сводка по результату парсинга",
+        description="Сводка по результату парсинга. Несколько файлов, --diff, --filter и наборы данных "
+                    "требуют pandas, файлы Parquet - pyarrow (см. requirements-optional.txt)")
+    analyze.add_argument("files", nargs="*", default=[OUTPUT_FILES[OUTPUT_FORMAT]],
+                         help="Файлы результатов (CSV, JSONL, Parquet, база SQLite или каталог набора "
+                              "данных Parquet): прогоны, события")
+    analyze.add_argument("--top", type=int, default=5,
+                         help="Сколько самых частых компаний и стран выводить")
+    analyze.add_argument("--diff", dest="previous", default=None,
+                         help="Сравнить с результатом предыдущего прогона")
+    analyze.add_argument("--filter", dest="filters", type=filter_option, action="append", default=None,
+                         metavar="COLUMN=VALUE",
+                         help="Только записи с таким значением, например event=dsei или run_date=2025-09-09 "
+                              "(для Parquet отбор идет при чтении)")
+    dedupe = commands.add_parser("dedupe", help="Объединение записей одного человека с устойчивыми person_id")
+    dedupe.add_argument("files", nargs="+",
+                        help="Файлы результатов (CSV, JSONL или SQLite) разных прогонов и событий")
+    dedupe.add_argument("--output", default=PEOPLE_FILE,
+                        help="Файл записей с person_id (CSV)")
+    dedupe.add_argument("--registry", default=PEOPLE_REGISTRY_FILE,
+                        help="Реестр person_id (SQLite), общий для всех запусков")
+    dedupe.add_argument("--threshold", type=float, default=DEDUPE_THRESHOLD,
+                        help="Минимальная оценка совпадения записей (0-1)")
+    # Параметры benchmark разбирает benchmarks/run_benchmarks.py
+    commands.add_parser("benchmark", add_help=False,
+                        help="Бенчмарки на локальном тестовом сервере (параметры: benchmark --help)")
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'benchmark':
+        args.args = extra
+    elif extra:
+        parser.error(f"неизвестные аргументы: {' '.join(extra)}")
+    return args
+
+
+def scrape(args) -> None:
+    """Команда scrape: полный прогон парсера"""
+    from src.archive import ResponseArchive
+    from src.cache import ResponseCache
+    from src.metrics import profiled
+    from src.scraper import DSEISpeakerScraper
+    
     print("🚀 Запуск парсера спикеров DSEI...")
     print("=" * 50)
     
+    setup_logging(LOG_FILE, args.log_level, args.log_json,
+                  stage_levels={**LOG_STAGE_LEVELS, **dict(args.log_stage)},
+                  sample_every={**LOG_SAMPLE_EVERY, **dict(args.log_sample)})
+    
     try:
-        scraper = DSEISpeakerScraper()
-        scraper.run()
+        if args.dataset:
+            from src.columnar import dataset_file
+            args.output, args.output_format = dataset_file(args.dataset, args.event), 'parquet'
+        # Инкрементальный режим перепроверяет известных спикеров условными запросами через кэш
+        use_cache = args.cache or args.incremental
+        cache = ResponseCache(args.cache_dir, args.cache_ttl, CACHE_MAX_BYTES) if use_cache else None
+        scraper = DSEISpeakerScraper(
+            base_url=args.base_url,
+            max_workers=args.workers,
+            requests_per_second=args.rps,
+            max_requests_per_second=args.max_rps,
+            adaptive=args.adaptive,
+            pipeline=args.pipeline,
+            parallel_pagination=args.parallel_pagination,
+            cache=cache,
+            incremental=args.incremental,
+            resume=args.resume,
+            output_file=args.output,
+            output_format=args.output_format,
+            parser_backend=args.parser_backend,
+            archive=ResponseArchive(args.archive) if args.archive else None,
+            transport=args.transport,
+            pool_size=args.pool_size,
+            metrics_file=args.metrics,
+            enrich_sessions=args.enrich_sessions
+        )
+        with profiled(args.profile, PROFILE_FILES.get(args.profile, "")):
+            complete = scraper.run()
+        if args.profile:
+            print(f"🔬 Профиль сохранен в: {PROFILE_FILES[args.profile]}")
+        if not complete:
+            sys.exit(1)
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Парсинг прерван пользователем")
@@ -30,5 +215,41 @@ def main():
         sys.exit(1)
 
 
+def dedupe(args) -> None:
+    """Команда dedupe: person_id для записей нескольких прогонов и событий"""
+    from src.dedupe import PersonIndex, PersonRegistry, resolve_people
+    
+    start_time = time.time()
+    try:
+        report = resolve_people(args.files, args.output, PersonRegistry(args.registry),
+                                PersonIndex(threshold=args.threshold))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"👥 {report.summary()}")
+    print(f"💾 Результат сохранен в: {args.output}")
+    print(f"⏱️  Время выполнения: {time.time() - start_time:.2f} сек")
+
+
+def main(argv=None):
+    """Главная функция"""
+    args = parse_args(argv)
+    
+    if args.command == 'analyze':
+        from src.analysis import analyze_results
+        try:
+            sys.exit(0 if analyze_results(args.files, args.top, args.previous, args.filters) else 1)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    elif args.command == 'dedupe':
+        dedupe(args)
+    elif args.command == 'benchmark':
+        from benchmarks.run_benchmarks import main as run_benchmarks
+        sys.exit(run_benchmarks(args.args))
+    else:
+        scrape(args)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,154 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Перцентиль q (0-100) по отсортированным значениям, метод ближайшего ранга"""
+    if not sorted_values:
+        return 0.0
+    rank = min(max(1, math.ceil(q / 100 * len(sorted_values))), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+class Metrics:
+    """Таймеры и счетчики этапов парсинга (потокобезопасно)
+
+    Таймер хранит все замеры, чтобы в итоге посчитать перцентили; на
+    десятках тысяч запросов это единицы мегабайт.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self._timers: Dict[str, List[float]] = defaultdict(list)
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Замеряет время выполнения блока"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._timers[name].append(seconds)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def count(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def summary(self, **extra: Any) -> Dict[str, Any]:
+        """Итоговый отчет: счетчики, статистика таймеров (в секундах) и запросов в секунду"""
+        duration = time.monotonic() - self.started
+        with self._lock:
+            counters = {name: (int(value) if value == int(value) else value)
+                        for name, value in sorted(self._counters.items())}
+            timers = {}
+            for name, values in sorted(self._timers.items()):
+                ordered = sorted(values)
+                timers[name] = {
+                    'count': len(ordered),
+                    'total': round(sum(ordered), 6),
+                    'mean': round(sum(ordered) / len(ordered), 6),
+                    'p50': round(percentile(ordered, 50), 6),
+                    'p95': round(percentile(ordered, 95), 6),
+                    'p99': round(percentile(ordered, 99), 6),
+                    'max': round(ordered[-1], 6),
+                }
+
+        report = {
+            'duration': round(duration, 3),
+            'requests_per_second': round(counters.get('requests', 0) / duration, 3) if duration else 0.0,
+            'counters': counters,
+            'timers': timers,
+        }
+        report.update(extra)
+        return report
+
+    def write_json(self, filename: str, **extra: Any) -> Dict[str, Any]:
+        """Записывает отчет в JSON-файл и возвращает его"""
+        report = self.summary(**extra)
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+
+@contextmanager
+def profiled(profiler: Optional[str], output_file: str) -> Iterator[None]:
+    """Профилирует блок и сохраняет результат в output_file
+
+    cprofile профилирует и потоки, запущенные внутри блока (пул загрузки,
+    обход списка), и сохраняет объединенную статистику в формате pstats;
+    pyinstrument видит только основной поток и сохраняет HTML-отчет.
+    """
+    if not profiler:
+        yield
+        return
+
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise ValueError("pyinstrument не установлен: pip install pyinstrument")
+        profiler_obj = Profiler()
+        profiler_obj.start()
+        try:
+            yield
+        finally:
+            profiler_obj.stop()
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(profiler_obj.output_html())
+        return
+
+    if profiler != 'cprofile':
+        raise ValueError(f"Неизвестный профилировщик: {profiler}")
+
+    import cProfile
+    import pstats
+
+    thread_profilers: List[cProfile.Profile] = []
+    profilers_lock = threading.Lock()
+
+    def start_thread_profiler(frame, event, arg):
+        # Вызывается один раз в каждом новом потоке и заменяет себя профилировщиком
+        thread_profiler = cProfile.Profile()
+        with profilers_lock:
+            thread_profilers.append(thread_profiler)
+        thread_profiler.enable()
+
+    main_profiler = cProfile.Profile()
+    threading.setprofile(start_thread_profiler)
+    main_profiler.enable()
+    try:
+        yield
+    finally:
+        main_profiler.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(main_profiler)
+        with profilers_lock:
+            for thread_profiler in thread_profilers:
+                stats.add(thread_profiler)
+        stats.dump_stats(output_file)
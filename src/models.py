@@ -1,8 +1,23 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from typing import Optional, List
 
 
-@dataclass
+@dataclass(slots=True)
+class Session:
+    """Сессия спикера: один элемент списка сессий на детальной странице"""
+    date: str = ""
+    time: str = ""
+    location: str = ""
+    topic_link: str = ""
+    topic_title: str = ""
+    topic_description: str = ""  # со страницы сессии, заполняется при обогащении (--enrich-sessions)
+
+
+# Колонки дочернего файла сессий: slug спикера и поля сессии
+SESSION_COLUMNS = ['speaker_slug'] + list(Session.__dataclass_fields__)
+
+
+@dataclass(slots=True)
 class Speaker:
     """Модель данных спикера"""
     speaker_url: str = ""
@@ -18,6 +33,8 @@ class Speaker:
     session_location: str = ""
     session_topic_link: str = ""
     session_topic_title: str = ""
+    # Все сессии спикера; колонки session_* повторяют первую из них
+    sessions: List[Session] = field(default_factory=list)
 
     def to_dict(self) -> dict:
         """Преобразует объект в словарь"""
@@ -37,9 +54,38 @@ class Speaker:
             'session_topic_title': self.session_topic_title
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Speaker':
+        """Создает объект из словаря (например, строки CSV или записи журнала с sessions)"""
+        speaker = cls(**{name: data.get(name) or "" for name in SPEAKER_COLUMNS})
+        speaker.sessions = [Session(**session) for session in data.get('sessions') or []]
+        return speaker
+
+    def session_rows(self) -> List[list]:
+        """Строки дочернего файла сессий в порядке SESSION_COLUMNS"""
+        return [[self.speaker_slug, session.date, session.time, session.location, session.topic_link,
+                 session.topic_title, session.topic_description] for session in self.sessions]
+
+    def to_record(self) -> dict:
+        """Словарь вместе со списком сессий (для журнала контрольных точек)"""
+        record = self.to_dict()
+        record['sessions'] = [asdict(session) for session in self.sessions]
+        return record
+
+
+# Порядок колонок в выходных файлах (сессии пишутся отдельным дочерним файлом)
+SPEAKER_COLUMNS = [name for name in Speaker.__dataclass_fields__ if name != 'sessions']
+
 
 @dataclass
 class SpeakerSlug:
     """Модель для хранения slug спикера"""
     slug: str
     name: str = ""
+
+
+@dataclass
+class ListingPage:
+    """Результат разбора страницы списка: slug спикеров и номер последней страницы (0 если пагинации нет)"""
+    slugs: List[SpeakerSlug] = field(default_factory=list)
+    max_page: int = 0
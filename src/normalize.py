@@ -0,0 +1,59 @@
+import html
+import re
+from functools import lru_cache
+
+# Шаблоны компилируются один раз при импорте
+SLUG_PATTERN = re.compile(r"speakers/([^'\"]+)")
+SESSION_TIME_PATTERN = re.compile(r'(\d{2}:\d{2})\s*[–-]\s*(\d{2}:\d{2})')
+
+# Невидимые символы, которые не считаются пробелами и удаляются целиком
+_INVISIBLE = str.maketrans('', '', '\u200b\u200c\u200d\u2060\ufeff\xad')
+
+# Короткие значения (страна, компания, должность) часто повторяются - их результат запоминается
+MEMO_MAX_LENGTH = 80
+MEMO_SIZE = 4096
+
+
+def normalize_text(text: str) -> str:
+    """Декодирует HTML-сущности, удаляет невидимые символы и схлопывает пробелы
+
+    Все пробельные символы (включая неразрывный пробел) превращаются
+    в один пробел, пробелы по краям удаляются.
+    """
+    if not text:
+        return ""
+    if '&' in text:
+        text = html.unescape(text)
+    return ' '.join(text.translate(_INVISIBLE).split())
+
+
+_normalize_short = lru_cache(maxsize=MEMO_SIZE)(normalize_text)
+
+
+def clean_text(text: str) -> str:
+    """Очищает текст от лишних символов и пробелов"""
+    if not text:
+        return ""
+    if len(text) <= MEMO_MAX_LENGTH:
+        return _normalize_short(text)
+    return normalize_text(text)
+
+
+def extract_slug_from_javascript(js_text: str) -> str:
+    """Извлекает slug из JavaScript кода"""
+    # Ищем паттерн 'speakers/slug'
+    match = SLUG_PATTERN.search(js_text)
+    return match.group(1) if match else ""
+
+
+def parse_session_time(time_text: str) -> str:
+    """Парсит время сессии из HTML"""
+    if not time_text:
+        return ""
+
+    # Ищем паттерн времени HH:MM - HH:MM
+    match = SESSION_TIME_PATTERN.search(time_text)
+    if match:
+        return f"{match.group(1)} – {match.group(2)}"
+
+    return clean_text(time_text)
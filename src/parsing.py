@@ -0,0 +1,212 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+from config.settings import PARSER_BACKENDS
+
+
+class Node(ABC):
+    """Элемент HTML-дерева, независимый от парсера
+
+    Код извлечения данных работает только через этот интерфейс,
+    поэтому результат не зависит от выбранного парсера.
+    """
+
+    @abstractmethod
+    def find(self, tag: str, class_name: Optional[str] = None) -> Optional['Node']:
+        """Первый потомок с тегом tag (и классом class_name, если указан)"""
+
+    @abstractmethod
+    def find_all(self, tag: str, class_name: Optional[str] = None) -> List['Node']:
+        """Все потомки с тегом tag (и классом class_name, если указан)"""
+
+    @abstractmethod
+    def text(self) -> str:
+        """Текст элемента вместе с потомками"""
+
+    @abstractmethod
+    def attr(self, name: str) -> str:
+        """Значение атрибута или пустая строка"""
+
+    @property
+    @abstractmethod
+    def tag_name(self) -> str:
+        """Имя тега"""
+
+    @abstractmethod
+    def iter_elements(self) -> Iterator['Node']:
+        """Все элементы-потомки в порядке документа"""
+
+    def iter_with_class(self, class_fragment: str) -> Iterator['Node']:
+        """Элементы-потомки, в атрибуте class которых встречается class_fragment"""
+        for element in self.iter_elements():
+            if class_fragment in element.attr('class'):
+                yield element
+
+
+class SoupNode(Node):
+    """Элемент дерева BeautifulSoup (html.parser или lxml)"""
+
+    __slots__ = ('tag',)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def find(self, tag: str, class_name: Optional[str] = None) -> Optional[Node]:
+        found = self.tag.find(tag, class_=class_name) if class_name else self.tag.find(tag)
+        return SoupNode(found) if found is not None else None
+
+    def find_all(self, tag: str, class_name: Optional[str] = None) -> List[Node]:
+        found = self.tag.find_all(tag, class_=class_name) if class_name else self.tag.find_all(tag)
+        return [SoupNode(item) for item in found]
+
+    def text(self) -> str:
+        return self.tag.get_text()
+
+    def attr(self, name: str) -> str:
+        value = self.tag.get(name)
+        if value is None:
+            return ""
+        # Многозначные атрибуты (class) BeautifulSoup возвращает списком
+        return ' '.join(value) if isinstance(value, list) else str(value)
+
+    @property
+    def tag_name(self) -> str:
+        return self.tag.name
+
+    def iter_elements(self) -> Iterator[Node]:
+        for element in self.tag.descendants:
+            if isinstance(element, Tag):
+                yield SoupNode(element)
+
+
+class LexborNode(Node):
+    """Элемент дерева selectolax (движок lexbor)"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    @staticmethod
+    def _selector(tag: str, class_name: Optional[str]) -> str:
+        return f"{tag}.{class_name}" if class_name else tag
+
+    def find(self, tag: str, class_name: Optional[str] = None) -> Optional[Node]:
+        found = self.node.css_first(self._selector(tag, class_name))
+        return LexborNode(found) if found is not None else None
+
+    def find_all(self, tag: str, class_name: Optional[str] = None) -> List[Node]:
+        return [LexborNode(item) for item in self.node.css(self._selector(tag, class_name))]
+
+    def text(self) -> str:
+        return self.node.text(deep=True)
+
+    def attr(self, name: str) -> str:
+        return self.node.attributes.get(name) or ""
+
+    @property
+    def tag_name(self) -> str:
+        return self.node.tag
+
+    def iter_elements(self) -> Iterator[Node]:
+        nodes = self.node.traverse()
+        next(nodes, None)  # traverse() начинается с самого элемента
+        for node in nodes:
+            yield LexborNode(node)
+
+    def iter_with_class(self, class_fragment: str) -> Iterator[Node]:
+        # Отбор выполняется движком lexbor без обхода дерева в Python
+        for node in self.node.css(f'[class*="{class_fragment}"]'):
+            yield LexborNode(node)
+
+
+def _class_strainer(class_prefix: Optional[str]) -> Optional[SoupStrainer]:
+    """Ограничивает разбор BeautifulSoup элементами с классом на class_prefix и их потомками"""
+    if not class_prefix:
+        return None
+    return SoupStrainer(class_=lambda value: value is not None and value.startswith(class_prefix))
+
+
+def _link_strainer(href_markers: Tuple[str, ...]) -> SoupStrainer:
+    """Ограничивает разбор BeautifulSoup ссылками, в href которых есть один из маркеров"""
+    return SoupStrainer('a', href=lambda value: value is not None and any(marker in value for marker in href_markers))
+
+
+def _parse_html_parser(content: bytes, strainer: Optional[SoupStrainer] = None) -> Node:
+    return SoupNode(BeautifulSoup(content, 'html.parser', parse_only=strainer))
+
+
+def _parse_lxml(content: bytes, strainer: Optional[SoupStrainer] = None) -> Node:
+    return SoupNode(BeautifulSoup(content, 'lxml', parse_only=strainer))
+
+
+def _parse_selectolax(content: bytes, strainer: Optional[SoupStrainer] = None) -> Node:
+    # lexbor строит полное дерево быстрее, чем BeautifulSoup фильтрует разметку,
+    # поэтому strainer здесь не используется
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(content)
+    # BeautifulSoup не включает содержимое script и style в get_text()
+    tree.strip_tags(['script', 'style'])
+    return LexborNode(tree.root)
+
+
+PARSERS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'html.parser': _parse_html_parser,
+}
+
+# Порядок выбора при backend="auto": от быстрого к медленному
+AUTO_ORDER = PARSER_BACKENDS
+
+
+def is_available(backend: str) -> bool:
+    """Установлена ли библиотека, нужная парсеру"""
+    try:
+        if backend == 'selectolax':
+            import selectolax.lexbor  # noqa: F401
+        elif backend == 'lxml':
+            import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return backend in PARSERS
+
+
+def resolve_backend(backend: str) -> str:
+    """Возвращает имя парсера; для "auto" - самый быстрый из установленных"""
+    if backend == 'auto':
+        return next(name for name in AUTO_ORDER if is_available(name))
+    if not is_available(backend):
+        raise ValueError(f"Парсер недоступен: {backend}")
+    return backend
+
+
+def parse_html(content: bytes, backend: str, class_prefix: Optional[str] = None) -> Node:
+    """Строит дерево указанным парсером (имя должно быть уже разрешено resolve_backend)
+
+    С class_prefix BeautifulSoup разбирает только элементы, класс которых
+    начинается с этого префикса, и их содержимое - остальная страница
+    в дерево не попадает.
+    """
+    return PARSERS[backend](content, _class_strainer(class_prefix))
+
+
+def parse_links(content: bytes, backend: str, href_markers: Tuple[str, ...]) -> Node:
+    """Дерево для поиска ссылок: BeautifulSoup разбирает только ссылки с маркерами в href
+
+    Остальные элементы страницы (меню, подвал, ссылки без маркеров)
+    в дерево не попадают; у selectolax дерево строится полностью.
+    """
+    return PARSERS[backend](content, _link_strainer(href_markers))
+
+
+def index_by_class(root: Node, class_prefix: str) -> Dict[Tuple[str, str], Node]:
+    """Один проход по дереву: первый элемент для каждой пары (тег, класс на class_prefix)"""
+    index: Dict[Tuple[str, str], Node] = {}
+    for element in root.iter_with_class(class_prefix):
+        for class_name in element.attr('class').split():
+            if class_name.startswith(class_prefix):
+                index.setdefault((element.tag_name, class_name), element)
+    return index
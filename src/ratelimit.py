@@ -0,0 +1,198 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class RateLimiter:
+    """Глобальный ограничитель частоты запросов (token bucket)
+
+    Потокобезопасен: все рабочие потоки делят один экземпляр, поэтому
+    суммарная нагрузка на сайт не зависит от количества потоков.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Блокирует поток до получения токена, возвращает время ожидания"""
+        with self._lock:
+            now = time.monotonic()
+            rate = self.requests_per_second
+            if rate <= 0:
+                wait = 0.0
+            else:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+                self._updated = now
+                # Токен берется в долг: следующие потоки встанут в очередь за этим
+                self._tokens -= 1
+                wait = -self._tokens / rate if self._tokens < 0 else 0.0
+            wait = max(wait, self._paused_until - now)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def on_success(self, latency: float) -> None:
+        """Успешный ответ (у постоянного ограничителя ничего не меняет)"""
+
+    def on_throttle(self) -> None:
+        """Сервер ограничивает нас (у постоянного ограничителя ничего не меняет)"""
+
+    def set_limit(self, requests_per_second: float) -> None:
+        """Задает новый лимит (например, долю общего лимита хоста)"""
+        with self._lock:
+            self.requests_per_second = requests_per_second
+
+    def pause(self, seconds: float) -> None:
+        """Приостанавливает все запросы на seconds (например, по Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Ограничитель с адаптацией скорости по схеме AIMD
+
+    Пока ответы быстрые и без ошибок, скорость растет аддитивно (примерно
+    на increase_step запросов/сек за каждую секунду работы); при 429, 503
+    или таймауте она умножается на decrease_factor, но не чаще раза
+    в decrease_cooldown секунд - одновременные ошибки нескольких потоков
+    считаются одним сигналом.
+    """
+
+    def __init__(self, requests_per_second: float, min_requests_per_second: float,
+                 max_requests_per_second: float, target_latency: float,
+                 increase_step: float = 0.5, decrease_factor: float = 0.5,
+                 decrease_cooldown: float = 1.0, burst: int = 1):
+        super().__init__(requests_per_second, burst)
+        self.min_requests_per_second = min_requests_per_second
+        self.max_requests_per_second = max(max_requests_per_second, requests_per_second)
+        self.target_latency = target_latency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self._last_decrease = float('-inf')
+
+    def on_success(self, latency: float) -> None:
+        """Успешный ответ: ускоряемся, если сервер отвечает быстро"""
+        if latency > self.target_latency:
+            return
+        with self._lock:
+            rate = self.requests_per_second
+            self.requests_per_second = min(self.max_requests_per_second,
+                                           rate + self.increase_step / max(rate, 1.0))
+
+    def set_limit(self, requests_per_second: float) -> None:
+        """Задает верхнюю границу адаптации, текущая скорость не превышает ее"""
+        with self._lock:
+            self.max_requests_per_second = requests_per_second
+            self.requests_per_second = min(self.requests_per_second, requests_per_second)
+
+    def on_throttle(self) -> None:
+        """Сервер перегружен или ограничивает нас: резко снижаем скорость"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+            self._last_decrease = now
+            self.requests_per_second = max(self.min_requests_per_second,
+                                           self.requests_per_second * self.decrease_factor)
+
+
+class CircuitOpenError(Exception):
+    """Запрос отклонен: цепь разомкнута после серии ошибок"""
+
+
+class CircuitBreaker:
+    """Размыкатель цепи перед всеми запросами
+
+    После failure_threshold ошибок подряд цепь размыкается и запросы
+    отклоняются сразу, без обращения к сайту. Через reset_timeout секунд
+    пропускается пробный запрос: успех замыкает цепь, ошибка снова ее
+    размыкает. retry_in() подсказывает, сколько ждать до следующей
+    попытки, open_for - сколько цепь разомкнута без перерыва.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        # Первое размыкание после последнего успеха (повторные размыкания его не сдвигают)
+        self._open_since: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    @property
+    def open_for(self) -> float:
+        """Сколько секунд цепь разомкнута без единого успешного запроса"""
+        with self._lock:
+            return 0.0 if self._open_since is None else time.monotonic() - self._open_since
+
+    def retry_in(self) -> float:
+        """Секунды до момента, когда имеет смысл снова вызвать before_request()"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            if self._probe_in_flight:
+                # Ждем исхода пробного запроса
+                return min(1.0, self.reset_timeout)
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def before_request(self) -> None:
+        """Проверяет цепь перед запросом, при разомкнутой цепи бросает CircuitOpenError"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probe_in_flight:
+                raise CircuitOpenError("слишком много ошибок подряд, запросы приостановлены")
+            # Полуоткрытое состояние: пропускаем один пробный запрос
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._open_since = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self._open_since is None:
+                    self._open_since = self._opened_at
+            self._probe_in_flight = False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Разбирает заголовок Retry-After (секунды или HTTP-дата) в секунды ожидания"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Экспоненциальная задержка перед повтором со случайным разбросом (full jitter)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
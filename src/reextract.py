@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Повторное извлечение данных спикеров из архива сырых ответов (без сети)
+
+Архив наполняется при парсинге с флагом --archive. Разбор страниц
+выполняется параллельно в нескольких процессах.
+"""
+
+import sys
+import os
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# Добавляем корневую директорию в путь Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import (
+    ARCHIVE_DIR, OUTPUT_FORMAT, OUTPUT_FILES, PARSER_BACKEND, SINK_BATCH_SIZE,
+    SPEAKERS_LIST_PATH, SPEAKER_DETAIL_PATH, SPEAKER_ENTRY_CLASS
+)
+from src.archive import ResponseArchive
+from src.extract import SpeakerExtractor
+from src.models import Speaker, SpeakerSlug
+from src.sinks import open_sink
+
+# Состояние процесса-исполнителя (создается в _init_worker): без сети и логирования
+_archive = None
+_extractor = None
+
+
+def _init_worker(archive_dir: str, base_url: str, parser_backend: str) -> None:
+    global _archive, _extractor
+    _archive = ResponseArchive(archive_dir)
+    _extractor = SpeakerExtractor(base_url, parser_backend)
+
+
+def _extract_listing(digest: str) -> List[SpeakerSlug]:
+    return _extractor.parse_listing(_archive.read(digest)).slugs
+
+
+def _extract_speaker(job: Tuple[str, SpeakerSlug]) -> Speaker:
+    digest, speaker_slug = job
+    page = _extractor.parse_page(_archive.read(digest), SPEAKER_ENTRY_CLASS)
+    return _extractor.build_speaker(page, speaker_slug)
+
+
+def classify_records(archive: ResponseArchive) -> Tuple[List[Tuple[int, str]], Dict[str, str], str]:
+    """Делит последние записи архива на страницы списка и детальные страницы
+
+    Возвращает [(номер страницы, sha256)], {slug: sha256} и базовый URL сайта.
+    """
+    listing_pages = []
+    detail_pages = {}
+    base_url = ""
+
+    for record in archive.latest().values():
+        parts = urlsplit(record['url'])
+        base_url = base_url or f"{parts.scheme}://{parts.netloc}"
+
+        if parts.path.rstrip('/') == SPEAKERS_LIST_PATH:
+            try:
+                page = int(record['params'].get('page', 1))
+            except (TypeError, ValueError):
+                continue
+            listing_pages.append((page, record['sha256']))
+        elif parts.path.startswith(SPEAKER_DETAIL_PATH + '/'):
+            slug = parts.path[len(SPEAKER_DETAIL_PATH) + 1:]
+            detail_pages[slug] = record['sha256']
+
+    listing_pages.sort()
+    return listing_pages, detail_pages, base_url
+
+
+def reextract(archive_dir: str, output_file: str, output_format: str,
+              workers: int, parser_backend: str) -> int:
+    """Извлекает спикеров из архива и записывает их в output_file, возвращает их количество"""
+    archive = ResponseArchive(archive_dir)
+    listing_pages, detail_pages, base_url = classify_records(archive)
+    if not detail_pages:
+        print(f"❌ В архиве {archive_dir} нет детальных страниц спикеров")
+        return 0
+
+    print(f"📦 Страниц списка: {len(listing_pages)}, детальных страниц: {len(detail_pages)}")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(archive_dir, base_url, parser_backend)) as executor:
+        # Порядок спикеров - как при парсинге: по страницам списка
+        speaker_slugs: Dict[str, SpeakerSlug] = {}
+        for page_slugs in executor.map(_extract_listing, [digest for _, digest in listing_pages]):
+            for speaker_slug in page_slugs:
+                speaker_slugs.setdefault(speaker_slug.slug, speaker_slug)
+
+        # Детальные страницы, которых нет в сохраненных страницах списка, идут в конце
+        for slug in sorted(detail_pages):
+            speaker_slugs.setdefault(slug, SpeakerSlug(slug=slug))
+
+        jobs = [(detail_pages[slug], speaker_slug)
+                for slug, speaker_slug in speaker_slugs.items() if slug in detail_pages]
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+        with open_sink(output_file, output_format, SINK_BATCH_SIZE) as sink:
+            for speaker in executor.map(_extract_speaker, jobs, chunksize=chunksize):
+                sink.write(speaker)
+            sink.commit()
+            return sink.count
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Повторное извлечение спикеров из архива ответов")
+    parser.add_argument("--archive", default=ARCHIVE_DIR,
+                        help="Каталог архива")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Количество процессов")
+    parser.add_argument("--parser", dest="parser_backend", default=PARSER_BACKEND,
+                        help="HTML-парсер")
+    parser.add_argument("--format", dest="output_format", choices=sorted(OUTPUT_FILES), default=OUTPUT_FORMAT,
+                        help="Формат выходного файла")
+    parser.add_argument("--output", default=None,
+                        help="Путь к выходному файлу (по умолчанию data/speakers.<format>)")
+    return parser.parse_args()
+
+
+def main():
+    """Главная функция"""
+    args = parse_args()
+    output_file = args.output or OUTPUT_FILES[args.output_format]
+
+    start_time = time.time()
+    count = reextract(args.archive, output_file, args.output_format, max(1, args.workers), args.parser_backend)
+    if not count:
+        sys.exit(1)
+
+    print(f"\n✅ Извлечено спикеров: {count}")
+    print(f"💾 Результат сохранен в: {output_file}")
+    print(f"⏱️  Время выполнения: {time.time() - start_time:.2f} сек")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Парсинг нескольких событий по файлу заданий
+
+Задания ставятся в очередь SQLite и выполняются несколькими процессами;
+к той же очереди можно подключить исполнители на других машинах
+(флаг --worker), если файл очереди лежит на общем диске. Лимит запросов
+хоста делится поровну между его заданиями, которые выполняются в данный
+момент на всех исполнителях. Каждое задание пишет свой результат, после
+завершения всех заданий строится объединенный файл без повторов.
+"""
+
+import sys
+import os
+import argparse
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+# Добавляем корневую директорию в путь Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import (
+    CACHE_DIR, CACHE_TTL, CACHE_MAX_BYTES, JOB_QUEUE_FILE, JOB_PROCESSES, JOB_HEARTBEAT_INTERVAL, SINK_BATCH_SIZE
+)
+from src.cache import ResponseCache
+from src.incremental import load_baseline
+from src.jobs import Job, JobSpec, WorkQueue, load_spec
+from src.models import Session
+from src.scraper import DSEISpeakerScraper
+from src.sinks import open_sink
+from src.table import SpeakerTable
+
+
+def host_share(job: Job, running: int) -> float:
+    """Доля лимита хоста на одно задание (0 - без ограничения)"""
+    return job.host_rps / max(1, running)
+
+
+def run_job(job: Job, attempt: int, queue: WorkQueue, worker: str) -> Tuple[bool, int, str]:
+    """Выполняет одно задание, пока продлевается его аренда
+
+    Возвращает (успех, количество спикеров, текст ошибки).
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(job.output_file)), exist_ok=True)
+    running = queue.heartbeat(job.name, worker)
+    if running is None:
+        return False, 0, "аренда потеряна"
+
+    share = host_share(job, running)
+    scraper = DSEISpeakerScraper(
+        base_url=job.base_url,
+        max_workers=job.workers,
+        requests_per_second=share,
+        max_requests_per_second=share,
+        adaptive=job.adaptive and share > 0,
+        cache=ResponseCache(CACHE_DIR, CACHE_TTL, CACHE_MAX_BYTES) if job.cache else None,
+        # Повторная попытка продолжает журнал прерванной
+        resume=attempt > 1,
+        output_file=job.output_file,
+        output_format=job.output_format,
+        parser_backend=job.parser_backend,
+        transport=job.transport,
+        metrics_file=job.metrics_file,
+        list_path=job.list_path,
+        detail_path=job.detail_path,
+        list_params=job.list_params,
+        detail_params=job.detail_params,
+        checkpoint_file=job.checkpoint_file,
+        enrich_sessions=job.enrich_sessions
+    )
+    scraper.logger.info("Задание %s (попытка %d): %s, %s запр/сек", job.name, attempt, job.host, share or 'без лимита')
+
+    stop = threading.Event()
+
+    def keep_lease() -> None:
+        # Продление аренды; доля лимита следует за числом работающих заданий хоста
+        while not stop.wait(JOB_HEARTBEAT_INTERVAL):
+            running = queue.heartbeat(job.name, worker)
+            if running is None:
+                # Задание уже может выполнять другой исполнитель с тем же журналом и файлами
+                scraper.abandon(f"аренда задания {job.name} потеряна")
+                return
+            if job.host_rps > 0:
+                scraper.rate_limiter.set_limit(host_share(job, running))
+
+    heartbeat = threading.Thread(target=keep_lease, name=f"job-lease-{job.name}", daemon=True)
+    heartbeat.start()
+    try:
+        complete = scraper.run()
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    if scraper.abandoned:
+        return False, scraper.speakers_count, "аренда потеряна"
+    if scraper.stop_event.is_set():
+        return False, scraper.speakers_count, scraper.abort_reason or "прервано"
+    if not complete:
+        return False, scraper.speakers_count, scraper.incomplete_reason() or "нет результата, подробности в логе"
+    return True, scraper.speakers_count, ""
+
+
+def work(queue_file: str) -> List[str]:
+    """Цикл исполнителя: берет задания из очереди, пока они есть"""
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue(queue_file)
+    finished = []
+    while True:
+        claimed = queue.claim(worker)
+        if claimed is None:
+            return finished
+        job, attempt = claimed
+        try:
+            ok, count, error = run_job(job, attempt, queue, worker)
+        except Exception as e:
+            ok, count, error = False, 0, str(e)
+        if ok:
+            queue.complete(job.name, worker, count)
+        else:
+            queue.fail(job.name, worker, error)
+        finished.append(job.name)
+
+
+def merge_outputs(spec: JobSpec, queue: WorkQueue) -> Tuple[int, int]:
+    """Объединяет результаты выполненных заданий в spec.merged_file и его файл сессий
+
+    Повторы определяются по speaker_url (один спикер в нескольких событиях
+    одного сайта); приоритет у заданий, стоящих в файле раньше. Сессии
+    спикера берутся из первого задания, в котором они есть. Объединенный
+    результат (в том числе база SQLite) строится заново.
+    Возвращает (количество записей, количество повторов).
+    """
+    done = {row['name'] for row in queue.status() if row['status'] == 'done'}
+    merged = SpeakerTable()
+    sessions: Dict[str, List[Session]] = {}
+    duplicates = 0
+    for job in spec.jobs:
+        if job.name in done and os.path.exists(job.output_file):
+            duplicates += merged.merge(SpeakerTable.load(job.output_file))
+            for speaker in load_baseline(job.output_file).values():
+                if speaker.sessions:
+                    sessions.setdefault(speaker.speaker_url, speaker.sessions)
+
+    os.makedirs(os.path.dirname(os.path.abspath(spec.merged_file)), exist_ok=True)
+    # Базу SQLite commit() дополняет, а не переписывает: новая база строится
+    # в .part и заменяет прежнюю целиком, при ошибке прежняя остается
+    target = spec.merged_file
+    if spec.output_format == 'sqlite':
+        target = spec.merged_file + '.part'
+        if os.path.exists(target):
+            os.remove(target)
+    with open_sink(target, spec.output_format, SINK_BATCH_SIZE) as sink:
+        for speaker in merged:
+            speaker.sessions = sessions.get(speaker.speaker_url, [])
+            sink.write(speaker)
+        sink.commit()
+    if target != spec.merged_file:
+        os.replace(target, spec.merged_file)
+    return len(merged), duplicates
+
+
+def print_status(queue: WorkQueue) -> None:
+    for row in queue.status():
+        line = f"  {row['name']:<24} {row['status']:<8} попыток: {row['attempts']}"
+        if row['speakers'] is not None:
+            line += f", спикеров: {row['speakers']}"
+        if row['error']:
+            line += f", ошибка: {row['error']}"
+        print(line)
+
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Парсинг нескольких событий по файлу заданий")
+    parser.add_argument("spec", help="Файл заданий (JSON)")
+    parser.add_argument("--processes", type=int, default=JOB_PROCESSES,
+                        help="Количество процессов-исполнителей")
+    parser.add_argument("--queue", default=JOB_QUEUE_FILE,
+                        help="Файл очереди SQLite (общий для всех машин)")
+    parser.add_argument("--reset", action="store_true",
+                        help="Выполнить все задания заново, даже завершенные")
+    parser.add_argument("--worker", action="store_true",
+                        help="Только выполнять задания из очереди (дополнительная машина)")
+    parser.add_argument("--merge-only", action="store_true",
+                        help="Только объединить результаты выполненных заданий")
+    return parser.parse_args()
+
+
+def main():
+    """Главная функция"""
+    args = parse_args()
+    try:
+        spec = load_spec(args.spec)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    queue = WorkQueue(args.queue)
+    start_time = time.time()
+
+    if not args.merge_only:
+        if not args.worker:
+            queue.add(spec.jobs, reset=args.reset)
+        processes = max(1, args.processes)
+        print(f"📋 Заданий: {len(spec.jobs)}, процессов: {processes}, очередь: {args.queue}")
+        try:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                for future in [executor.submit(work, args.queue) for _ in range(processes)]:
+                    future.result()
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Выполнение заданий прервано, незавершенные задания вернутся в очередь")
+            sys.exit(1)
+
+    print("\n📊 Состояние заданий:")
+    print_status(queue)
+
+    if args.worker:
+        return
+    unfinished = queue.unfinished()
+    if unfinished:
+        print(f"\n⏳ Не завершено заданий: {unfinished}, объединение отложено")
+        sys.exit(1)
+
+    count, duplicates = merge_outputs(spec, queue)
+    print(f"\n✅ Объединено спикеров: {count} (повторов убрано: {duplicates})")
+    print(f"💾 Результат сохранен в: {spec.merged_file}")
+    print(f"⏱️  Время выполнения: {time.time() - start_time:.2f} сек")
+
+
+if __name__ == "__main__":
+    main()
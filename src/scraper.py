@@ -1,118 +1,287 @@
-import requests
 import time
-import re
-from typing import List, Optional, Union, Dict, Any
-from urllib.parse import urljoin, urlencode
-from bs4 import BeautifulSoup, Tag
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Queue
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set, Tuple
 from tqdm import tqdm
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.settings import *
-from src.models import Speaker, SpeakerSlug
-from src.utils import (
-    setup_logging, extract_slug_from_javascript, clean_text,
-    parse_session_time, save_to_csv, delay_request
+from config.settings import (
+    BASE_URL, SPEAKERS_LIST_PATH, SPEAKER_DETAIL_PATH, SPEAKERS_LIST_PARAMS, SPEAKER_DETAIL_PARAMS,
+    HEADERS, REQUEST_TIMEOUT, TRANSPORT, CONNECTION_POOL_SIZE, HTTP2_ENABLED, CONNECT_RETRIES,
+    PARSER_BACKEND, SPEAKER_ENTRY_CLASS, ENRICH_SESSIONS,
+    MAX_WORKERS, REQUESTS_PER_SECOND, ADAPTIVE_RATE_LIMIT, MIN_REQUESTS_PER_SECOND, MAX_REQUESTS_PER_SECOND,
+    TARGET_LATENCY, PIPELINE_ENABLED, PIPELINE_QUEUE_SIZE, PARALLEL_PAGINATION,
+    OUTPUT_FORMAT, OUTPUT_FILES, SINK_BATCH_SIZE, LOG_FILE,
+    CHECKPOINT_FILE, CHECKPOINT_INTERVAL, METRICS_FILE,
+    MAX_RETRIES, RETRY_STATUSES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, RETRY_AFTER_MAX,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, CIRCUIT_MAX_OPEN_TIME, ensure_dirs
 )
+from src.models import ListingPage, Speaker, SpeakerSlug
+from src.archive import ResponseArchive
+from src.cache import ResponseCache
+from src.extract import SpeakerExtractor
+from src.journal import CheckpointJournal, JournalState
+from src.metrics import Metrics
+from src.incremental import IncrementalReport, load_baseline, load_state, save_state, state_filename
+from src.parsing import Node
+from src.ratelimit import (
+    AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError, RateLimiter,
+    backoff_delay, parse_retry_after
+)
+from src.sinks import open_sink
+from src.transport import TransportError, TransportTimeout, create_transport
+from src.logsetup import setup_logging, flush_logging
+from src.utils import delay_request
 
 
-class DSEISpeakerScraper:
+class DSEISpeakerScraper(SpeakerExtractor):
     """Основной класс для парсинга спикеров с сайта DSEI"""
     
-    def __init__(self):
-        self.logger = setup_logging(LOG_FILE)
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+    def __init__(self, base_url: str = BASE_URL, max_workers: int = MAX_WORKERS,
+                 requests_per_second: float = REQUESTS_PER_SECOND,
+                 max_requests_per_second: float = MAX_REQUESTS_PER_SECOND,
+                 adaptive: bool = ADAPTIVE_RATE_LIMIT, pipeline: bool = PIPELINE_ENABLED,
+                 parallel_pagination: bool = PARALLEL_PAGINATION, cache: Optional[ResponseCache] = None,
+                 incremental: bool = False, resume: bool = False,
+                 output_file: Optional[str] = None, output_format: str = OUTPUT_FORMAT,
+                 parser_backend: str = PARSER_BACKEND, archive: Optional[ResponseArchive] = None,
+                 transport: str = TRANSPORT, pool_size: Optional[int] = CONNECTION_POOL_SIZE,
+                 metrics_file: Optional[str] = METRICS_FILE,
+                 list_path: str = SPEAKERS_LIST_PATH, detail_path: str = SPEAKER_DETAIL_PATH,
+                 list_params: Optional[Dict[str, str]] = None, detail_params: Optional[Dict[str, str]] = None,
+                 checkpoint_file: str = CHECKPOINT_FILE, enrich_sessions: bool = ENRICH_SESSIONS):
+        ensure_dirs()
+        setup_logging(LOG_FILE)
+        # Базовый URL можно подменить, например, на локальный тестовый сервер.
+        # Таймеры и счетчики этапов, отчет пишется в metrics_file в конце run()
+        super().__init__(base_url, parser_backend, detail_path, Metrics())
+        self.speakers_list_url = self.base_url + list_path
+        # Параметры запросов задают событие (searchgroup) на платформе сайта
+        self.list_params = dict(SPEAKERS_LIST_PARAMS if list_params is None else list_params)
+        self.detail_params = dict(SPEAKER_DETAIL_PARAMS if detail_params is None else detail_params)
+        self.max_workers = max(1, max_workers)
+        # Соединение на каждый поток загрузки и на обход списка в конвейере
+        self.transport = create_transport(
+            transport, pool_size or self.max_workers + 1, HEADERS, CONNECT_RETRIES, HTTP2_ENABLED
+        )
+        if adaptive:
+            self.rate_limiter = AdaptiveRateLimiter(
+                requests_per_second, MIN_REQUESTS_PER_SECOND, max_requests_per_second, TARGET_LATENCY
+            )
+        else:
+            self.rate_limiter = RateLimiter(requests_per_second)
+        self.circuit_breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+        self.pipeline = pipeline
+        self.parallel_pagination = parallel_pagination
+        self.cache = cache
+        self.archive = archive
+        self.incremental = incremental
+        self.enrich_sessions = enrich_sessions
+        self.output_format = output_format
+        self.output_file = output_file or OUTPUT_FILES[output_format]
+        self.incremental_report: Optional[IncrementalReport] = None
+        self._incremental_hashes: Optional[Dict[str, str]] = None
+        # Журнал контрольных точек для продолжения прерванного прогона
+        self.journal = CheckpointJournal(checkpoint_file, CHECKPOINT_INTERVAL)
+        self.resume = resume
+        self._resumed = JournalState()
+        self.listing_failed = False
+        # Slug спикеров, которых не удалось загрузить: с ними прогон неполный
+        self.failed_slugs: List[str] = []
+        # Slug спикеров, чьей страницы нет (HTTP 4xx): прогон с ними полный
+        self.skipped_slugs: List[str] = []
+        # URL, на которые сервер ответил 4xx: повтор не поможет
+        self._missing_urls: Set[str] = set()
+        self._failed_lock = threading.Lock()
+        # Выставляется при прерывании: потоки прекращают новые запросы
+        self.stop_event = threading.Event()
+        self.abort_reason = ""
+        # Прогон передан другому исполнителю: его файлы и журнал больше не трогаем
+        self.abandoned = False
+        self.metrics_file = metrics_file
         self.speakers_slugs: List[SpeakerSlug] = []
-        self.speakers_data: List[Speaker] = []
+        self.speakers_count = 0
+        
+    def fetch(self, url: str, params: Optional[Dict[str, Any]] = None, retries: int = MAX_RETRIES) -> Optional[bytes]:
+        """Получает тело страницы, при включенном кэше - через него
+
+        В архив (если он включен) попадают только тела, загруженные из сети
+        с ответом 200: ответы из кэша и по 304 индекс архива не дублируют.
+        """
+        cache_key = None
+        cached = None
+        if self.cache:
+            cache_key = self.cache.make_key(url, params)
+            cached = self.cache.get(cache_key)
+            if cached and self.cache.is_fresh(cached):
+                self.metrics.incr('cache_hits')
+                self.logger.info("Страница из кэша: %s", cached.url, extra={'stage': 'request', 'url': url, 'status': 'cached'})
+                return cached.content
         
-    def get_page(self, url: str, params: Optional[Dict[str, Any]] = None, retries: int = MAX_RETRIES) -> Optional[BeautifulSoup]:
-        """Получает страницу и возвращает объект BeautifulSoup"""
         for attempt in range(retries):
+            if self.stop_event.is_set():
+                return None
+            if not self.wait_for_circuit(url):
+                return None
+            
+            self.logger.info("Запрос к %s (попытка %d/%d)", url, attempt + 1, retries,
+                             extra={'stage': 'request', 'url': url, 'attempt': attempt + 1})
+            if attempt:
+                self.metrics.incr('retries')
+            self.metrics.observe('rate_limit_wait', self.rate_limiter.acquire())
+            self.metrics.incr('requests')
+            started = time.monotonic()
+            retry_after = None
+            throttled = False
+            
             try:
-                self.logger.info(f"Запрос к {url} (попытка {attempt + 1}/{retries})")
-                
-                response = self.session.get(
+                response = self.transport.get(
                     url, 
                     params=params, 
+                    headers=self.cache.conditional_headers(cached) if cached else None,
                     timeout=REQUEST_TIMEOUT
                 )
-                response.raise_for_status()
+            except TransportTimeout as e:
+                error = str(e)
+                throttled = True
+                self.metrics.incr('timeouts')
+            except TransportError as e:
+                error = str(e)
+            else:
+                latency = time.monotonic() - started
+                self.logger.debug("%s %s %s: %s", response.http_version, response.status_code, response.url, response.timings)
+                self.metrics.observe('request', response.timings.total)
+                self.metrics.observe('ttfb', response.timings.ttfb)
+                self.metrics.incr('bytes_downloaded', len(response.content))
+                self.metrics.incr(f'http_{response.status_code}')
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                self.logger.info(f"Успешно получена страница: {response.url}")
-                return soup
-                
-            except requests.RequestException as e:
-                self.logger.error(f"Ошибка запроса {url}: {e}")
-                if attempt < retries - 1:
-                    delay_request(2 ** attempt)  # Экспоненциальная задержка
+                if response.status_code in RETRY_STATUSES:
+                    error = f"HTTP {response.status_code}"
+                    throttled = response.status_code in (429, 503)
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
                 else:
-                    self.logger.error(f"Не удалось получить страницу после {retries} попыток")
+                    # Сервер ответил по существу - цепь в порядке
+                    self.circuit_breaker.record_success()
                     
-        return None
-    
-    def extract_speakers_slugs_from_page(self, soup: BeautifulSoup) -> List[SpeakerSlug]:
-        """Извлекает список slug спикеров со страницы"""
-        slugs = []
-        seen_slugs = set()  # Для более эффективной дедупликации по slug
-        
-        # Ищем все ссылки с JavaScript функцией openRemoteModal
-        speaker_links = soup.find_all('a')
-        
-        for link in speaker_links:
-            if not isinstance(link, Tag):
-                continue
-                
-            href = link.get('href')
-            if not href or 'openRemoteModal' not in str(href) or 'speakers/' not in str(href):
-                continue
-                
-            slug = extract_slug_from_javascript(str(href))
+                    # Страница не изменилась - используем закэшированную копию
+                    if cached and response.status_code == 304:
+                        self.rate_limiter.on_success(latency)
+                        self.cache.touch(cache_key, cached)
+                        self.logger.info("Страница не изменилась: %s", response.url,
+                                         extra={'stage': 'request', 'url': url, 'status': 304, 'latency': latency})
+                        return cached.content
+                    
+                    if response.status_code >= 400:
+                        # Повтор не поможет (например, 404)
+                        self.logger.warning("Страница недоступна %s: HTTP %s", url, response.status_code,
+                                            extra={'stage': 'request', 'url': url, 'status': response.status_code})
+                        with self._failed_lock:
+                            self._missing_urls.add(url)
+                        return None
+                    
+                    self.rate_limiter.on_success(latency)
+                    if self.cache:
+                        self.cache.put(cache_key, response.url, response.content, response.headers)
+                    if self.archive:
+                        self.archive.store(url, params, response.content)
+                    self.logger.info("Успешно получена страница: %s", response.url,
+                                     extra={'stage': 'request', 'url': url, 'status': response.status_code,
+                                            'latency': latency})
+                    return response.content
             
-            if slug and slug not in seen_slugs:  # Проверяем только по slug
-                seen_slugs.add(slug)
-                
-                # Попробуем получить имя спикера
-                name = ""
-                # Ищем в aria-label
-                aria_label = link.get('aria-label')
-                if aria_label:
-                    name = clean_text(str(aria_label))
+            self.metrics.incr('errors')
+            self.circuit_breaker.record_failure()
+            if throttled:
+                self.rate_limiter.on_throttle()
+            self.logger.error("Ошибка запроса %s: %s", url, error,
+                              extra={'stage': 'request', 'url': url, 'attempt': attempt + 1})
+            
+            if attempt < retries - 1:
+                if retry_after is not None:
+                    # Пауза общая для всех потоков: следующий acquire() ее дождется
+                    self.logger.info("Сервер просит подождать %.0f сек", retry_after, extra={'stage': 'request', 'url': url})
+                    self.rate_limiter.pause(min(retry_after, RETRY_AFTER_MAX))
                 else:
-                    # Ищем в тексте ссылки или рядом
-                    text_content = link.get_text(strip=True)
-                    if text_content:
-                        name = clean_text(text_content)
-                
-                speaker_slug = SpeakerSlug(slug=slug, name=name)
-                slugs.append(speaker_slug)
-                self.logger.info(f"Найден спикер: {name} (slug: {slug})")
-        
-        return slugs
+                    with self.metrics.timer('retry_backoff'):
+                        delay_request(backoff_delay(attempt, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX))
+            else:
+                self.logger.error("Не удалось получить страницу после %d попыток", retries,
+                                  extra={'stage': 'request', 'url': url})
+                    
+        return None
+    
+    def wait_for_circuit(self, url: str) -> bool:
+        """Ждет, пока размыкатель цепи пропустит запрос
+
+        Пока цепь разомкнута, поток ждет пробного запроса, а не пропускает
+        спикера. Если цепь не замыкается дольше CIRCUIT_MAX_OPEN_TIME,
+        прогон останавливается как неполный. Возвращает False, если запрос
+        делать не нужно.
+        """
+        while True:
+            try:
+                self.circuit_breaker.before_request()
+                return True
+            except CircuitOpenError as e:
+                if self.circuit_breaker.open_for >= CIRCUIT_MAX_OPEN_TIME:
+                    self.abort(f"цепь разомкнута дольше {CIRCUIT_MAX_OPEN_TIME} сек: {e}")
+                    return False
+                delay = self.circuit_breaker.retry_in()
+                self.logger.warning("Запрос к %s ждет %.0f сек: %s", url, delay, e,
+                                    extra={'stage': 'request', 'url': url})
+                if self.stop_event.wait(delay):
+                    return False
+    
+    def abort(self, reason: str) -> None:
+        """Останавливает прогон: новые запросы не делаются, результат считается неполным"""
+        if not self.stop_event.is_set():
+            self.abort_reason = reason
+            self.logger.error("Прогон остановлен: %s", reason)
+            self.stop_event.set()
+    
+    def abandon(self, reason: str) -> None:
+        """Останавливает прогон, не трогая его файлы: журнал закрывается сразу,
+        результат не фиксируется и не переименовывается, метрики не пишутся
+        (например, аренду задания получил другой исполнитель)"""
+        self.abandoned = True
+        self.abort(reason)
+        self.journal.close()
+    
+    @contextmanager
+    def thread_pool(self):
+        """Пул потоков, который при Ctrl-C или ошибке прекращает все оставшиеся загрузки"""
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        failed = True
+        try:
+            yield executor
+            failed = False
+        finally:
+            if failed:
+                self.stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=failed)
+    
+    def get_page(self, url: str, params: Optional[Dict[str, Any]] = None, retries: int = MAX_RETRIES,
+                 class_prefix: Optional[str] = None) -> Optional[Node]:
+        """Получает страницу и возвращает корень ее HTML-дерева"""
+        with self.metrics.timer('get_page'):
+            content = self.fetch(url, params, retries)
+            if content is None:
+                return None
+            return self.parse_page(content, class_prefix)
     
-    def check_for_next_page(self, soup: BeautifulSoup, current_page: int) -> bool:
+    def check_for_next_page(self, listing: ListingPage, current_page: int) -> bool:
         """Проверяет есть ли следующая страница"""
-        # Ищем все ссылки с page= в href
-        all_links = soup.find_all('a', href=True)
-        page_numbers = []
-        
-        for link in all_links:
-            href = link.get('href', '')
-            if 'page=' in href:
-                try:
-                    # Извлекаем номер страницы из href
-                    page_num = int(href.split('page=')[1].split('&')[0])
-                    page_numbers.append(page_num)
-                except (ValueError, IndexError):
-                    continue
-        
-        if page_numbers:
-            max_page = max(page_numbers)
-            self.logger.info(f"Максимальная страница: {max_page}, текущая: {current_page}")
-            return current_page < max_page
+        if listing.max_page:
+            self.logger.info("Максимальная страница: %d, текущая: %d", listing.max_page, current_page,
+                             extra={'stage': 'listing'})
+            return current_page < listing.max_page
         
         return False
     
@@ -120,222 +289,540 @@ class DSEISpeakerScraper:
         """Этап 1: Получение списка всех спикеров и их slug"""
         self.logger.info("=== ЭТАП 1: Получение списка спикеров ===")
         
-        all_slugs = []
+        all_slugs = list(self.discover_speakers())
+        
+        self.logger.info("Всего найдено %d уникальных спикеров", len(all_slugs))
+        return all_slugs
+    
+    def get_listing_page(self, page: int) -> Optional[ListingPage]:
+        """Загружает и разбирает одну страницу списка спикеров"""
+        self.logger.info("Обработка страницы %d", page, extra={'stage': 'listing'})
+        
+        # Формируем параметры запроса
+        params = self.list_params.copy()
+        params['page'] = str(page)
+        
+        with self.metrics.timer('get_page'):
+            content = self.fetch(self.speakers_list_url, params)
+            if content is None:
+                return None
+            return self.parse_listing(content)
+    
+    def _new_slugs_from_page(self, listing: ListingPage, page: int, seen_slugs: set) -> Optional[List[SpeakerSlug]]:
+        """Возвращает новые slug страницы или None, если спикеров на ней нет"""
+        page_slugs = listing.slugs
+        
+        if not page_slugs:
+            self.logger.info("На странице %d не найдено спикеров. Завершение.", page, extra={'stage': 'listing'})
+            return None
+        
+        # Фильтруем дубликаты между страницами
+        new_slugs = []
+        for speaker_slug in page_slugs:
+            if speaker_slug.slug not in seen_slugs:
+                seen_slugs.add(speaker_slug.slug)
+                new_slugs.append(speaker_slug)
+        
+        self.logger.info("На странице %d найдено %d спикеров (%d новых)", page, len(page_slugs), len(new_slugs),
+                         extra={'stage': 'listing'})
+        return new_slugs
+    
+    def iter_speakers_list(self) -> Iterator[SpeakerSlug]:
+        """Обходит страницы списка и отдает новые slug сразу по мере обнаружения
+
+        После первой страницы, когда известно число страниц, остальные
+        загружаются параллельно; если число страниц за время обхода выросло,
+        обход продолжается последовательно.
+        """
         seen_slugs = set()  # Глобальная дедупликация между страницами
+        self.listing_failed = False
         page = 1
+        listing = self.get_listing_page(page)
         
-        while True:
-            self.logger.info(f"Обработка страницы {page}")
-            
-            # Формируем параметры запроса
-            params = SPEAKERS_LIST_PARAMS.copy()
-            params['page'] = str(page)
-            
-            soup = self.get_page(SPEAKERS_LIST_URL, params)
-            if not soup:
-                self.logger.error(f"Не удалось получить страницу {page}")
-                break
-            
-            # Извлекаем slug со страницы
-            page_slugs = self.extract_speakers_slugs_from_page(soup)
-            
-            if not page_slugs:
-                self.logger.info(f"На странице {page} не найдено спикеров. Завершение.")
-                break
-            
-            # Фильтруем дубликаты между страницами
-            new_slugs = []
-            for speaker_slug in page_slugs:
-                if speaker_slug.slug not in seen_slugs:
-                    seen_slugs.add(speaker_slug.slug)
-                    new_slugs.append(speaker_slug)
-            
-            all_slugs.extend(new_slugs)
-            self.logger.info(f"На странице {page} найдено {len(page_slugs)} спикеров ({len(new_slugs)} новых)")
+        while listing:
+            new_slugs = self._new_slugs_from_page(listing, page, seen_slugs)
+            if new_slugs is None:
+                return
+            yield from new_slugs
             
             # Проверяем есть ли следующая страница
-            if not self.check_for_next_page(soup, page):
+            if not self.check_for_next_page(listing, page):
                 self.logger.info("Достигнута последняя страница")
-                break
+                return
+            
+            max_page = listing.max_page
+            if self.parallel_pagination and max_page - page > 1:
+                pages = list(range(page + 1, max_page + 1))
+                self.logger.info("Параллельная загрузка страниц %d-%d", pages[0], pages[-1])
+                
+                # executor.map отдает страницы по порядку, поэтому дедупликация
+                # и порядок slug такие же, как при последовательном обходе
+                with self.thread_pool() as executor:
+                    for page, listing in zip(pages, executor.map(self.get_listing_page, pages)):
+                        if not listing:
+                            self.logger.error("Не удалось получить страницу %d", page)
+                            self.listing_failed = True
+                            return
+                        new_slugs = self._new_slugs_from_page(listing, page, seen_slugs)
+                        if new_slugs is None:
+                            return
+                        yield from new_slugs
+                        max_page = max(max_page, listing.max_page)
                 
+                if max_page <= page:
+                    self.logger.info("Достигнута последняя страница")
+                    return
+                self.logger.info("Число страниц выросло до %d, продолжаем последовательно", max_page)
+            
             page += 1
-            delay_request(DELAY_BETWEEN_REQUESTS)
+            listing = self.get_listing_page(page)
         
-        self.logger.info(f"Всего найдено {len(all_slugs)} уникальных спикеров")
-        return all_slugs
+        self.logger.error("Не удалось получить страницу %d", page)
+        self.listing_failed = True
     
-    def extract_speaker_details(self, soup: BeautifulSoup, slug: str) -> Speaker:
-        """Извлекает детальную информацию о спикере"""
-        speaker = Speaker()
-        speaker.speaker_slug = slug
-        speaker.speaker_url = f"{SPEAKER_DETAIL_URL}/{slug}"
-        
-        # Имя спикера
-        title_elem = soup.find('h2', class_='m-speaker-entry__item__title')
-        if title_elem:
-            speaker.name = clean_text(title_elem.get_text())
-        
-        # Детали (позиция, компания, страна)
-        details_elem = soup.find('div', class_='m-speaker-entry__item__details')
-        if details_elem and isinstance(details_elem, Tag):
-            # Позиция
-            position_elem = details_elem.find('span', class_='m-speaker-entry__item__details__position')
-            if position_elem:
-                speaker.position = clean_text(position_elem.get_text()).rstrip(',')
-            
-            # Компания
-            company_elem = details_elem.find('span', class_='m-speaker-entry__item__details__company')
-            if company_elem:
-                speaker.company = clean_text(company_elem.get_text())
-            
-            # Страна
-            country_elem = details_elem.find('div', class_='m-speaker-entry__item__details__company__country')
-            if country_elem:
-                speaker.country = clean_text(country_elem.get_text())
-        
-        # Описание
-        description_elem = soup.find('div', class_='m-speaker-entry__item__description')
-        if description_elem:
-            # Получаем весь текст, очищаем от HTML тегов
-            description_text = description_elem.get_text()
-            speaker.description = clean_text(description_text)
-        
-        # Социальные сети
-        social_list = soup.find('ul', class_='m-speaker-entry__item__social')
-        if social_list and isinstance(social_list, Tag):
-            social_links = []
-            for social_item in social_list.find_all('li'):
-                if isinstance(social_item, Tag):
-                    link = social_item.find('a')
-                    if link and isinstance(link, Tag):
-                        href = link.get('href')
-                        if href:
-                            social_links.append(str(href))
-            speaker.social_network = '; '.join(social_links)
-        
-        # Информация о сессиях
-        sessions_info = self.extract_session_info(soup)
-        if sessions_info:
-            speaker.session_date = sessions_info.get('date', '')
-            speaker.session_time = sessions_info.get('time', '')
-            speaker.session_location = sessions_info.get('location', '')
-            speaker.session_topic_link = sessions_info.get('topic_link', '')
-            speaker.session_topic_title = sessions_info.get('topic_title', '')
+    def discover_speakers(self) -> Iterator[SpeakerSlug]:
+        """Обход списка с записью найденных slug в журнал контрольных точек"""
+        resumed = self._resumed
+        if resumed.listing_complete:
+            self.logger.info("Список спикеров восстановлен из журнала: %d", len(resumed.slugs))
+            yield from resumed.slugs
+            return
+        
+        journaled = {speaker_slug.slug for speaker_slug in resumed.slugs}
+        for speaker_slug in self.iter_speakers_list():
+            if speaker_slug.slug not in journaled:
+                self.journal.append_slug(speaker_slug)
+            yield speaker_slug
         
+        if not self.listing_failed:
+            self.journal.mark_listing_complete()
+    
+    def fetch_session_description(self, url: str) -> str:
+        """Загружает страницу сессии и извлекает ее описание (пустая строка при ошибке)"""
+        try:
+            soup = self.get_page(url)
+        except Exception as e:
+            self.logger.error("Ошибка при загрузке страницы сессии %s: %s", url, e, extra={'stage': 'session', 'url': url})
+            return ""
+        if not soup:
+            self.logger.error("Не удалось получить страницу сессии %s", url, extra={'stage': 'session', 'url': url})
+            return ""
+        self.metrics.incr('session_pages')
+        return self.extract_session_description(soup)
+    
+    def iter_enriched(self, speakers: Iterable[Speaker]) -> Iterator[Speaker]:
+        """Дополняет сессии спикеров описаниями со страниц сессий
+
+        Многие спикеры выступают на одних и тех же сессиях, поэтому каждая
+        уникальная ссылка загружается один раз (через кэш, если он включен)
+        в отдельном пуле потоков, параллельно с загрузкой спикеров. Спикер
+        отдается дальше, когда готовы все его сессии; порядок сохраняется.
+        """
+        descriptions: Dict[str, Future] = {}
+        waiting: deque = deque()
+        references = 0
+        
+        def join(speaker: Speaker) -> Speaker:
+            for session in speaker.sessions:
+                if session.topic_link:
+                    session.topic_description = descriptions[session.topic_link].result()
+            return speaker
+        
+        def ready(speaker: Speaker) -> bool:
+            return all(descriptions[session.topic_link].done()
+                       for session in speaker.sessions if session.topic_link)
+        
+        with self.thread_pool() as executor:
+            for speaker in speakers:
+                for session in speaker.sessions:
+                    if session.topic_link:
+                        references += 1
+                        if session.topic_link not in descriptions:
+                            descriptions[session.topic_link] = executor.submit(
+                                self.fetch_session_description, session.topic_link
+                            )
+                waiting.append(speaker)
+                while waiting and ready(waiting[0]):
+                    yield join(waiting.popleft())
+            while waiting:
+                yield join(waiting.popleft())
+        
+        self.logger.info("Страниц сессий загружено: %d на %d ссылок спикеров", len(descriptions), references)
+    
+    def fetch_speaker(self, speaker_slug: SpeakerSlug) -> Optional[Speaker]:
+        """Загружает детальную страницу одного спикера и извлекает данные"""
+        done = self._resumed.speakers.get(speaker_slug.slug)
+        if done:
+            return done
+        if speaker_slug.slug in self._resumed.skipped:
+            self.record_skipped(speaker_slug.slug)
+            return None
+        
+        started = time.monotonic()
+        self.logger.info("Обработка спикера: %s", speaker_slug.slug,
+                         extra={'stage': 'speaker', 'slug': speaker_slug.slug})
+        
+        # Формируем URL для детальной информации
+        detail_url = f"{self.speaker_detail_url}/{speaker_slug.slug}"
+        
+        soup = self.get_page(detail_url, self.detail_params, class_prefix=SPEAKER_ENTRY_CLASS)
+        if not soup and self.is_missing(detail_url):
+            self.logger.warning("Страницы спикера %s нет, спикер пропущен", speaker_slug.slug,
+                                extra={'stage': 'speaker', 'slug': speaker_slug.slug})
+            self.record_skipped(speaker_slug.slug)
+            self.journal.append_skipped(speaker_slug.slug)
+            return None
+        if not soup:
+            self.logger.error("Не удалось получить данные для спикера %s", speaker_slug.slug,
+                              extra={'stage': 'speaker', 'slug': speaker_slug.slug})
+            self.record_failure(speaker_slug.slug)
+            return None
+        
+        speaker = self.build_speaker(soup, speaker_slug)
+        self.journal.append_speaker(speaker)
+        self.logger.info("Данные спикера %s успешно извлечены", speaker.name,
+                         extra={'stage': 'speaker', 'slug': speaker_slug.slug, 'latency': time.monotonic() - started})
         return speaker
     
-    def extract_session_info(self, soup: BeautifulSoup) -> Dict[str, str]:
-        """Извлекает информацию о сессиях"""
-        session_info = {
-            'date': '',
-            'time': '',
-            'location': '',
-            'topic_link': '',
-            'topic_title': ''
-        }
-        
-        # Дата сессии
-        date_elem = soup.find('div', class_='m-speaker-entry__item__sessions__list__item__date')
-        if date_elem:
-            session_info['date'] = clean_text(date_elem.get_text())
-        
-        # Время сессии  
-        time_elem = soup.find('div', class_='m-speaker-entry__item__sessions__list__item__time')
-        if time_elem:
-            session_info['time'] = parse_session_time(time_elem.get_text())
-        
-        # Локация
-        location_elem = soup.find('div', class_='m-speaker-entry__item__details__location')
-        if location_elem:
-            session_info['location'] = clean_text(location_elem.get_text())
-        
-        # Ссылка и название темы
-        topic_link_elem = soup.find('a', class_='m-speaker-entry__item__sessions__list__item__title')
-        if topic_link_elem and isinstance(topic_link_elem, Tag):
-            href = topic_link_elem.get('href')
-            if href:
-                href_str = str(href)
-                if href_str and not href_str.startswith('http'):
-                    session_info['topic_link'] = urljoin(BASE_URL, href_str)
-                else:
-                    session_info['topic_link'] = href_str
-            
-            session_info['topic_title'] = clean_text(topic_link_elem.get_text())
+    def record_failure(self, slug: str) -> None:
+        """Отмечает спикера, которого не удалось загрузить"""
+        with self._failed_lock:
+            self.failed_slugs.append(slug)
+    
+    def record_skipped(self, slug: str) -> None:
+        """Отмечает спикера без детальной страницы: повторный прогон его не загрузит"""
+        with self._failed_lock:
+            self.skipped_slugs.append(slug)
+    
+    def is_missing(self, url: str) -> bool:
+        """Ответил ли сервер на url ошибкой 4xx (в отличие от сбоя после всех повторов)"""
+        with self._failed_lock:
+            return url in self._missing_urls
+    
+    def incomplete_reason(self) -> str:
+        """Почему результат прогона неполный (пустая строка для полного прогона)"""
+        if self.stop_event.is_set():
+            return self.abort_reason or "прогон остановлен"
+        if self.listing_failed:
+            return "список спикеров загружен не полностью"
+        if self.failed_slugs:
+            return f"не удалось загрузить спикеров: {len(self.failed_slugs)}"
+        return ""
+    
+    def refresh_speaker(self, speaker_slug: SpeakerSlug, previous: Optional[Speaker],
+                        hashes: Dict[str, str]) -> Tuple[str, Optional[Speaker]]:
+        """Инкрементальное обновление одного спикера
+
+        Возвращает статус (added, changed, unchanged, missing, failed) и актуальные данные.
+        Известные спикеры перепроверяются всегда; с кэшем неизменившаяся
+        страница стоит условного запроса с ответом 304.
+        """
+        detail_url = f"{self.speaker_detail_url}/{speaker_slug.slug}"
+        content = self.fetch(detail_url, self.detail_params)
+        if content is None and self.is_missing(detail_url):
+            self.logger.warning("Страницы спикера %s нет, спикер пропущен", speaker_slug.slug,
+                                extra={'stage': 'speaker', 'slug': speaker_slug.slug})
+            return 'missing', None
+        if content is None:
+            self.logger.error("Не удалось получить данные для спикера %s", speaker_slug.slug,
+                              extra={'stage': 'speaker', 'slug': speaker_slug.slug})
+            return 'failed', previous
         
-        return session_info
+        content_hash = hashlib.sha256(content).hexdigest()
+        if previous and hashes.get(speaker_slug.slug) == content_hash:
+            return 'unchanged', previous
+        
+        hashes[speaker_slug.slug] = content_hash
+        speaker = self.build_speaker(self.parse_page(content, SPEAKER_ENTRY_CLASS), speaker_slug)
+        if previous is None:
+            return 'added', speaker
+        # Страница могла измениться в частях, которые мы не извлекаем
+        return ('unchanged' if speaker == previous else 'changed'), speaker
     
     def scrape_speaker_details(self, speaker_slugs: List[SpeakerSlug]) -> List[Speaker]:
         """Этап 2: Получение детальной информации по каждому спикеру"""
+        return list(self.iter_speaker_details(speaker_slugs))
+    
+    def iter_speaker_details(self, speaker_slugs: List[SpeakerSlug]) -> Iterator[Speaker]:
+        """Этап 2, потоковый вариант: отдает спикеров по мере загрузки в порядке списка"""
         self.logger.info("=== ЭТАП 2: Получение детальной информации ===")
+        self.logger.info("Потоков: %d, лимит: %s запр/сек", self.max_workers, self.rate_limiter.requests_per_second)
+        
+        # executor.map возвращает результаты в порядке входного списка,
+        # поэтому порядок спикеров не зависит от порядка завершения запросов
+        with self.thread_pool() as executor:
+            results = executor.map(self.fetch_speaker, speaker_slugs)
+            for speaker in tqdm(results, total=len(speaker_slugs), desc="Обработка спикеров"):
+                if speaker:
+                    yield speaker
+    
+    def scrape_pipelined(self) -> List[Speaker]:
+        """Этапы 1 и 2 одновременно, см. iter_pipelined"""
+        return list(self.iter_pipelined())
+    
+    def iter_pipelined(self) -> Iterator[Speaker]:
+        """Этапы 1 и 2 одновременно: slug передаются потокам загрузки через очередь
+
+        Очередь ограничена PIPELINE_QUEUE_SIZE: если потоки загрузки не успевают,
+        обход страниц списка приостанавливается, и память не растет. Спикеры
+        отдаются в порядке обнаружения slug, как только готов очередной из них.
+        """
+        self.logger.info("=== ЭТАПЫ 1+2: Конвейерная обработка спикеров ===")
+        self.logger.info("Потоков: %d, лимит: %s запр/сек", self.max_workers, self.rate_limiter.requests_per_second)
+        
+        queue: Queue = Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        # Готовые результаты, ожидающие своей очереди на выдачу: индекс -> спикер (None при ошибке)
+        ready: Dict[int, Optional[Speaker]] = {}
+        condition = threading.Condition()
+        active_workers = self.max_workers
+        progress = tqdm(desc="Обработка спикеров")
+        start_time = time.time()
+        
+        def produce() -> None:
+            try:
+                for index, speaker_slug in enumerate(self.discover_speakers()):
+                    if self.stop_event.is_set():
+                        break
+                    self.speakers_slugs.append(speaker_slug)
+                    queue.put((index, speaker_slug))
+            except Exception as e:
+                self.logger.error("Ошибка при обходе списка спикеров: %s", e, exc_info=True, extra={'stage': 'listing'})
+                self.listing_failed = True
+            finally:
+                # По одному маркеру завершения на каждый поток загрузки
+                for _ in range(self.max_workers):
+                    queue.put(None)
+        
+        def consume() -> None:
+            nonlocal active_workers
+            while True:
+                item = queue.get()
+                if item is None:
+                    break
+                index, speaker_slug = item
+                try:
+                    speaker = self.fetch_speaker(speaker_slug)
+                except Exception as e:
+                    self.logger.error("Ошибка при обработке спикера %s: %s", speaker_slug.slug, e, exc_info=True,
+                                      extra={'stage': 'speaker', 'slug': speaker_slug.slug})
+                    self.record_failure(speaker_slug.slug)
+                    speaker = None
+                with condition:
+                    ready[index] = speaker
+                    progress.update(1)
+                    condition.notify()
+            with condition:
+                active_workers -= 1
+                condition.notify()
+        
+        self.speakers_slugs = []
+        threads = [threading.Thread(target=produce, name="speakers-list")]
+        threads += [threading.Thread(target=consume, name=f"speaker-details-{i}") for i in range(self.max_workers)]
+        for thread in threads:
+            thread.start()
         
+        next_index = 0
+        first = True
+        try:
+            while True:
+                with condition:
+                    while next_index not in ready and active_workers:
+                        condition.wait()
+                    if next_index not in ready:
+                        break
+                    speaker = ready.pop(next_index)
+                next_index += 1
+                if speaker:
+                    if first:
+                        self.logger.info("Первый спикер получен через %.2f сек", time.time() - start_time)
+                        first = False
+                    yield speaker
+        finally:
+            if active_workers:
+                # Прерывание или досрочное закрытие: потоки дочитывают очередь без запросов
+                self.stop_event.set()
+            for thread in threads:
+                thread.join()
+            progress.close()
+        
+        self.logger.info("Всего найдено %d уникальных спикеров", len(self.speakers_slugs))
+    
+    def scrape_incremental(self) -> List[Speaker]:
+        """Обновляет результат предыдущего прогона, загружая только новых и изменившихся спикеров"""
+        baseline = load_baseline(self.output_file)
+        hashes = load_state(state_filename(self.output_file))
+        self.logger.info("Загружено %d спикеров из предыдущего прогона", len(baseline))
+        
+        self.speakers_slugs = self.scrape_speakers_list()
+        if not self.speakers_slugs:
+            return []
+        
+        self.logger.info("=== ЭТАП 2: Инкрементальное обновление ===")
+        if not self.cache:
+            self.logger.info("Кэш выключен: страницы известных спикеров загружаются целиком")
+        
+        report = IncrementalReport()
         speakers = []
         
-        for speaker_slug in tqdm(speaker_slugs, desc="Обработка спикеров"):
-            self.logger.info(f"Обработка спикера: {speaker_slug.slug}")
-            
-            # Формируем URL для детальной информации
-            detail_url = f"{SPEAKER_DETAIL_URL}/{speaker_slug.slug}"
-            
-            soup = self.get_page(detail_url, SPEAKER_DETAIL_PARAMS)
-            if not soup:
-                self.logger.error(f"Не удалось получить данные для спикера {speaker_slug.slug}")
-                continue
-            
-            speaker = self.extract_speaker_details(soup, speaker_slug.slug)
-            
-            # Если имя не удалось извлечь из детальной страницы, используем из списка
-            if not speaker.name and speaker_slug.name:
-                speaker.name = speaker_slug.name
-            
-            speakers.append(speaker)
-            self.logger.info(f"Данные спикера {speaker.name} успешно извлечены")
-            
-            delay_request(DELAY_BETWEEN_REQUESTS)
+        def refresh(speaker_slug: SpeakerSlug) -> Tuple[str, Optional[Speaker]]:
+            return self.refresh_speaker(speaker_slug, baseline.get(speaker_slug.slug), hashes)
+        
+        with self.thread_pool() as executor:
+            results = executor.map(refresh, self.speakers_slugs)
+            for speaker_slug, (status, speaker) in zip(self.speakers_slugs, tqdm(results, total=len(self.speakers_slugs), desc="Обновление спикеров")):
+                if status == 'added':
+                    report.added.append(speaker_slug.slug)
+                elif status == 'changed':
+                    report.changed.append(speaker_slug.slug)
+                elif status == 'unchanged':
+                    report.unchanged += 1
+                if status == 'missing':
+                    self.record_skipped(speaker_slug.slug)
+                    if speaker_slug.slug in baseline:
+                        report.removed.append(speaker_slug.slug)
+                if status == 'failed':
+                    self.record_failure(speaker_slug.slug)
+                if speaker:
+                    speakers.append(speaker)
+        
+        discovered = {speaker_slug.slug for speaker_slug in self.speakers_slugs}
+        report.removed += [slug for slug in baseline if slug not in discovered]
+        # Хэши сохраняются только вместе с результатом (см. run): иначе изменения неполного прогона потеряются
+        self._incremental_hashes = {slug: value for slug, value in hashes.items() if slug in discovered}
+        
+        self.incremental_report = report
+        self.logger.info("Инкрементальное обновление: %s", report.summary())
+        for label, slugs in (("Новые", report.added), ("Изменены", report.changed), ("Удалены", report.removed)):
+            if slugs:
+                self.logger.info("%s: %s", label, ', '.join(slugs))
         
         return speakers
     
-    def run(self) -> None:
-        """Запуск полного процесса парсинга"""
+    def run(self) -> bool:
+        """Запуск полного процесса парсинга
+
+        Результат фиксируется, а журнал удаляется только после полного
+        прогона. Если список загружен не весь, часть спикеров не загрузилась
+        или прогон остановлен, предыдущий результат остается на месте, а
+        журнал - для продолжения с --resume. Возвращает True для полного прогона.
+        """
         self.logger.info("=== НАЧАЛО ПАРСИНГА СПИКЕРОВ DSEI ===")
         start_time = time.time()
         
         try:
-            # Этап 1: Получение списка спикеров
-            self.speakers_slugs = self.scrape_speakers_list()
+            if self.abandoned:
+                return False
+            self._resumed = self.journal.open(self.resume)
+            if self.resume:
+                self.logger.info("Продолжение по журналу: %d slug, %d спикеров уже обработано",
+                                 len(self._resumed.slugs), len(self._resumed.speakers))
             
-            if not self.speakers_slugs:
-                self.logger.error("Не найдено ни одного спикера. Завершение работы.")
-                return
+            if self.incremental:
+                # Обновление результатов предыдущего прогона
+                speakers = self.scrape_incremental()
+            elif self.pipeline:
+                # Этапы 1 и 2 выполняются параллельно
+                speakers = self.iter_pipelined()
+            else:
+                # Этап 1: Получение списка спикеров
+                self.speakers_slugs = self.scrape_speakers_list()
+                
+                # Этап 2: Получение детальной информации
+                speakers = self.iter_speaker_details(self.speakers_slugs)
             
-            # Этап 2: Получение детальной информации
-            self.speakers_data = self.scrape_speaker_details(self.speakers_slugs)
+            if self.enrich_sessions:
+                speakers = self.iter_enriched(speakers)
             
-            if not self.speakers_data:
-                self.logger.error("Не удалось получить детальную информацию ни по одному спикеру.")
-                return
+            # Спикеры записываются по мере извлечения, в памяти они не накапливаются
+            with open_sink(self.output_file, self.output_format, SINK_BATCH_SIZE) as sink:
+                for speaker in speakers:
+                    with self.metrics.timer('write'):
+                        sink.write(speaker)
+                
+                if self.abandoned:
+                    # Файлы .part закрываются без переименования
+                    self.logger.error("Прогон оставлен (%s): результат не сохранен", self.abort_reason)
+                    return False
+                
+                if not self.speakers_slugs:
+                    self.logger.error("Не найдено ни одного спикера. Завершение работы.")
+                    return False
+                
+                if not sink.count:
+                    self.logger.error("Не удалось получить детальную информацию ни по одному спикеру.")
+                    return False
+                
+                self.speakers_count = sink.count
+                if self.skipped_slugs:
+                    self.logger.warning("Пропущены спикеры без страницы: %s", ', '.join(self.skipped_slugs))
+                reason = self.incomplete_reason()
+                # Итоговый файл заменяется только полным результатом
+                saved = sink.finish(complete=not reason)
+                if reason:
+                    self.logger.warning("Результат неполный (%s): %d спикеров сохранено в %s, предыдущий "
+                                        "результат не изменен, журнал %s сохранен для --resume",
+                                        reason, sink.count, saved, self.journal.path)
+                    if self.failed_slugs:
+                        self.logger.warning("Не загружены: %s", ', '.join(self.failed_slugs))
+                    print(f"\n⚠️  Результат неполный ({reason}): {sink.count} спикеров сохранено в {saved}")
+                    print(f"💾 Предыдущий результат не изменен, продолжить прогон: --resume")
+                    return False
             
-            # Сохранение результатов
-            speakers_dict = [speaker.to_dict() for speaker in self.speakers_data]
-            save_to_csv(speakers_dict, SPEAKERS_CSV_FILE)
+            if self._incremental_hashes is not None:
+                save_state(state_filename(self.output_file), self._incremental_hashes)
+            # Результат сохранен, журнал больше не нужен
+            self.journal.remove()
             
             # Итоги
             end_time = time.time()
             duration = end_time - start_time
             
             self.logger.info("=== ПАРСИНГ ЗАВЕРШЕН ===")
-            self.logger.info(f"Всего найдено спикеров: {len(self.speakers_slugs)}")
-            self.logger.info(f"Успешно обработано: {len(self.speakers_data)}")
-            self.logger.info(f"Время выполнения: {duration:.2f} секунд")
-            self.logger.info(f"Результат сохранен в: {SPEAKERS_CSV_FILE}")
+            self.logger.info("Всего найдено спикеров: %d", len(self.speakers_slugs))
+            self.logger.info("Успешно обработано: %d", self.speakers_count)
+            self.logger.info("Время выполнения: %.2f секунд", duration)
+            self.logger.info("Результат сохранен в: %s", self.output_file)
             
             print(f"\n✅ Парсинг успешно завершен!")
-            print(f"📊 Обработано спикеров: {len(self.speakers_data)}")
-            print(f"💾 Результат сохранен в: {SPEAKERS_CSV_FILE}")
+            print(f"📊 Обработано спикеров: {self.speakers_count}")
+            if self.skipped_slugs:
+                print(f"⏭️  Пропущено спикеров без страницы: {len(self.skipped_slugs)}")
+            print(f"💾 Результат сохранен в: {self.output_file}")
             print(f"⏱️  Время выполнения: {duration:.2f} сек")
+            if self.incremental_report:
+                print(f"🔄 Изменения: {self.incremental_report.summary()}")
+            self.logger.info("Транспорт %s: %s", self.transport.name, self.transport.stats.summary())
+            print(f"🔌 Соединения: {self.transport.stats.new_connections} на {self.transport.stats.requests} запросов")
+            return True
             
         except Exception as e:
-            self.logger.error(f"Критическая ошибка при парсинге: {e}", exc_info=True)
+            self.logger.error("Критическая ошибка при парсинге: %s", e, exc_info=True)
             print(f"❌ Ошибка: {e}")
+            return False
         
         finally:
-            self.session.close()
+            self.journal.close()
+            self.transport.close()
+            self.write_metrics()
+            flush_logging()
+    
+    def write_metrics(self) -> None:
+        """Записывает отчет о таймерах и счетчиках прогона в metrics_file"""
+        if not self.metrics_file or self.abandoned:
+            return
+        try:
+            report = self.metrics.write_json(
+                self.metrics_file,
+                speakers=self.speakers_count,
+                new_connections=self.transport.stats.new_connections,
+                final_requests_per_second_limit=round(self.rate_limiter.requests_per_second, 3)
+            )
+        except OSError as e:
+            self.logger.error("Не удалось записать метрики в %s: %s", self.metrics_file, e)
+            return
+        timers = report['timers']
+        if 'request' in timers:
+            request = timers['request']
+            self.logger.info("Запросы: p50=%.3fs p95=%.3fs p99=%.3fs, %s запр/сек",
+                             request['p50'], request['p95'], request['p99'], report['requests_per_second'])
+        self.logger.info("Метрики сохранены в: %s", self.metrics_file)
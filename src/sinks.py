@@ -0,0 +1,291 @@
+import csv
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Type
+
+from config.settings import PARQUET_ROW_GROUP_SIZE
+from src import columnar
+from src.models import Speaker, SESSION_COLUMNS, SPEAKER_COLUMNS
+from src.storage import SpeakerDatabase
+
+
+def sessions_filename(filename: str) -> str:
+    """Дочерний файл сессий: speakers.csv -> speakers.sessions.csv"""
+    root, ext = os.path.splitext(filename)
+    return root + '.sessions' + ext
+
+
+def partial_filename(filename: str) -> str:
+    """Неполный результат прогона: speakers.csv -> speakers.partial.csv"""
+    root, ext = os.path.splitext(filename)
+    return root + '.partial' + ext
+
+
+def _create_path(path: str) -> str:
+    """Готовит путь к новому временному файлу: прежний файл удаляется, а не
+    перезаписывается, так что приемник, оставленный другим процессом с тем
+    же путем, пишет в свою (уже удаленную) копию и не портит новую"""
+    if os.path.exists(path):
+        os.remove(path)
+    return path
+
+
+def _fsync_path(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SpeakerSink(ABC):
+    """Потоковая запись спикеров в файл
+
+    Записи пишутся во временный файл <filename>.part по мере извлечения
+    и сбрасываются на диск пачками по batch_size, поэтому частичный
+    результат виден во время парсинга. Итоговый файл заменяется только
+    через finish(complete=True) (или commit()); неполный прогон сохраняется
+    под partial_filename(), а при ошибке остается в .part - в обоих случаях
+    предыдущий результат не меняется. Все сессии спикеров пишутся так же в
+    дочерний файл sessions_filename().
+    """
+
+    def __init__(self, filename: str, batch_size: int):
+        self.filename = filename
+        self.tmp_filename = filename + '.part'
+        self.sessions_filename = sessions_filename(filename)
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self._file = open(_create_path(self.tmp_filename), 'w', newline='', encoding='utf-8')
+        self._sessions_file = open(_create_path(self.sessions_filename + '.part'), 'w', newline='', encoding='utf-8')
+        self._write_header()
+
+    def _write_header(self) -> None:
+        pass
+
+    @abstractmethod
+    def _write_record(self, speaker: Speaker) -> None:
+        """Записывает одного спикера (вызывается под self._lock)"""
+
+    def write(self, speaker: Speaker) -> None:
+        with self._lock:
+            self._write_record(speaker)
+            self.count += 1
+            if self.count % self.batch_size == 0:
+                self._file.flush()
+                self._sessions_file.flush()
+
+    def _targets(self, filename: str) -> list:
+        """Пары (открытый файл, путь для переименования); сессии - первыми"""
+        return [(self._sessions_file, sessions_filename(filename)), (self._file, filename)]
+
+    def _finish_locked(self, filename: str) -> None:
+        for file, target in self._targets(filename):
+            file.flush()
+            os.fsync(file.fileno())
+            file.close()
+            os.replace(file.name, target)
+
+    def commit(self) -> None:
+        """Фиксирует результат: сброс на диск и переименование в итоговые файлы"""
+        with self._lock:
+            self._finish_locked(self.filename)
+
+    def finish(self, complete: bool) -> str:
+        """Завершает запись: полный результат фиксируется, неполный сохраняется отдельно
+
+        Возвращает путь, под которым сохранен результат.
+        """
+        if complete:
+            self.commit()
+            return self.filename
+        filename = partial_filename(self.filename)
+        with self._lock:
+            self._finish_locked(filename)
+        return filename
+
+    def close(self) -> None:
+        """Закрывает файлы без фиксации (частичный результат остается в .part)"""
+        with self._lock:
+            for file in (self._file, self._sessions_file):
+                if not file.closed:
+                    file.close()
+
+    def __enter__(self) -> 'SpeakerSink':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class CSVSink(SpeakerSink):
+    """Запись в CSV с колонками в порядке SPEAKER_COLUMNS"""
+
+    def _write_header(self) -> None:
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(SPEAKER_COLUMNS)
+        self._sessions_writer = csv.writer(self._sessions_file)
+        self._sessions_writer.writerow(SESSION_COLUMNS)
+
+    def _write_record(self, speaker: Speaker) -> None:
+        self._writer.writerow([getattr(speaker, column) for column in SPEAKER_COLUMNS])
+        self._sessions_writer.writerows(speaker.session_rows())
+
+
+class JSONLSink(SpeakerSink):
+    """Запись в JSON Lines: один спикер - одна строка"""
+
+    def _write_record(self, speaker: Speaker) -> None:
+        self._file.write(json.dumps(speaker.to_dict(), ensure_ascii=False))
+        self._file.write('\n')
+        for row in speaker.session_rows():
+            self._sessions_file.write(json.dumps(dict(zip(SESSION_COLUMNS, row)), ensure_ascii=False))
+            self._sessions_file.write('\n')
+
+
+class SQLiteSink(SpeakerSink):
+    """Запись в базу SQLite (см. SpeakerDatabase) пачками upsert по speaker_slug
+
+    В отличие от файловых приемников база не переписывается: пачки
+    пишутся во временную базу <filename>.part, а commit() переносит ее
+    в основную одной транзакцией upsert - спикеры предыдущих прогонов
+    остаются, измененные обновляются вместе с сессиями и ссылками, а
+    неполный прогон основную базу не меняет.
+    """
+
+    def __init__(self, filename: str, batch_size: int):
+        self.filename = filename
+        self.tmp_filename = filename + '.part'
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._batch = []
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self._staging = SpeakerDatabase(_create_path(self.tmp_filename))
+
+    def _write_record(self, speaker: Speaker) -> None:
+        self._batch.append(speaker)
+        if len(self._batch) >= self.batch_size:
+            self._flush_locked()
+
+    def write(self, speaker: Speaker) -> None:
+        with self._lock:
+            self._write_record(speaker)
+            self.count += 1
+
+    def _flush_locked(self) -> None:
+        batch, self._batch = self._batch, []
+        self._staging.upsert(batch)
+
+    def commit(self) -> None:
+        """Записывает оставшуюся пачку и переносит временную базу в основную"""
+        with self._lock:
+            self._flush_locked()
+            self._staging.close()
+            db = SpeakerDatabase(self.filename)
+            try:
+                db.merge_from(self.tmp_filename)
+            finally:
+                db.close()
+            os.remove(self.tmp_filename)
+
+    def finish(self, complete: bool) -> str:
+        if complete:
+            self.commit()
+            return self.filename
+        filename = partial_filename(self.filename)
+        with self._lock:
+            self._flush_locked()
+            self._staging.close()
+            os.replace(self.tmp_filename, filename)
+        return filename
+
+    def close(self) -> None:
+        """Закрывает временную базу; основная база не меняется"""
+        with self._lock:
+            self._batch = []
+            self._staging.close()
+
+
+class ParquetSink(SpeakerSink):
+    """Запись в Parquet по схеме src.columnar группами строк по PARQUET_ROW_GROUP_SIZE
+
+    Записи копятся по колонкам и пишутся в <filename>.part целой группой
+    строк (словарное кодирование и сжатие работают на группе), поэтому
+    частичный результат читается только после commit().
+    """
+
+    def __init__(self, filename: str, batch_size: int):
+        pa = columnar._pyarrow()
+        self.filename = filename
+        self.tmp_filename = filename + '.part'
+        self.sessions_filename = sessions_filename(filename)
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self._writers = {}
+        self._columns = {}
+        for table, tmp_filename in (('speakers', self.tmp_filename), ('sessions', self.sessions_filename + '.part')):
+            self._writers[table] = pa.parquet.ParquetWriter(_create_path(tmp_filename), columnar.schema(table),
+                                                            **columnar.writer_options())
+            self._columns[table] = {name: [] for name in columnar.TABLE_COLUMNS[table]}
+
+    def _write_record(self, speaker: Speaker) -> None:
+        for name, column in self._columns['speakers'].items():
+            column.append(getattr(speaker, name))
+        sessions = self._columns['sessions']
+        for row in speaker.session_rows():
+            for column, value in zip(sessions.values(), row):
+                column.append(value)
+        if len(self._columns['speakers'][SPEAKER_COLUMNS[0]]) >= PARQUET_ROW_GROUP_SIZE:
+            self._flush_locked()
+
+    def write(self, speaker: Speaker) -> None:
+        with self._lock:
+            self._write_record(speaker)
+            self.count += 1
+
+    def _flush_locked(self) -> None:
+        for table, columns in self._columns.items():
+            if next(iter(columns.values())):
+                self._writers[table].write_batch(columnar.record_batch(columns, table))
+            for column in columns.values():
+                column.clear()
+
+    def _finish_locked(self, filename: str) -> None:
+        """Записывает последнюю группу строк, закрывает файлы и переименовывает их"""
+        self._flush_locked()
+        for table, target in (('sessions', sessions_filename(filename)), ('speakers', filename)):
+            writer = self._writers[table]
+            writer.close()
+            _fsync_path(writer.where)
+            os.replace(writer.where, target)
+
+    def close(self) -> None:
+        """Закрывает файлы без фиксации; записи незаписанной группы строк не сохраняются"""
+        with self._lock:
+            for writer in self._writers.values():
+                if writer.is_open:
+                    writer.close()
+
+
+SINKS: Dict[str, Type[SpeakerSink]] = {
+    'csv': CSVSink,
+    'jsonl': JSONLSink,
+    'sqlite': SQLiteSink,
+    'parquet': ParquetSink,
+}
+
+
+def open_sink(filename: str, output_format: str, batch_size: int) -> SpeakerSink:
+    """Создает приемник для указанного формата"""
+    try:
+        sink_class = SINKS[output_format]
+    except KeyError:
+        raise ValueError(f"Неизвестный формат вывода: {output_format}")
+    return sink_class(filename, batch_size)
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import quote
+
+from src.models import Session, Speaker, SPEAKER_COLUMNS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS speakers (
+    speaker_slug TEXT PRIMARY KEY,
+    speaker_url TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '',
+    position TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    country TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    speaker_slug TEXT NOT NULL REFERENCES speakers(speaker_slug) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    date TEXT NOT NULL DEFAULT '',
+    time TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    topic_link TEXT NOT NULL DEFAULT '',
+    topic_title TEXT NOT NULL DEFAULT '',
+    topic_description TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (speaker_slug, ordinal)
+);
+CREATE TABLE IF NOT EXISTS social_links (
+    speaker_slug TEXT NOT NULL REFERENCES speakers(speaker_slug) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (speaker_slug, ordinal)
+);
+CREATE INDEX IF NOT EXISTS idx_speakers_company ON speakers(company);
+CREATE INDEX IF NOT EXISTS idx_speakers_country ON speakers(country);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_sessions_topic_link ON sessions(topic_link);
+
+-- Плоское представление в колонках SPEAKER_COLUMNS (session_* - первая сессия)
+CREATE VIEW IF NOT EXISTS speakers_flat AS
+SELECT s.speaker_url, s.speaker_slug, s.name, s.position, s.company, s.country, s.description,
+       COALESCE((SELECT group_concat(url, '; ') FROM (
+           SELECT url FROM social_links l WHERE l.speaker_slug = s.speaker_slug ORDER BY l.ordinal
+       )), '') AS social_network,
+       COALESCE(f.date, '') AS session_date,
+       COALESCE(f.time, '') AS session_time,
+       COALESCE(f.location, '') AS session_location,
+       COALESCE(f.topic_link, '') AS session_topic_link,
+       COALESCE(f.topic_title, '') AS session_topic_title
+FROM speakers s LEFT JOIN sessions f ON f.speaker_slug = s.speaker_slug AND f.ordinal = 0
+ORDER BY s.rowid;
+"""
+
+SPEAKER_FIELDS = "speaker_slug, speaker_url, name, position, company, country, description, updated_at"
+ON_CONFLICT_UPDATE = """
+ON CONFLICT(speaker_slug) DO UPDATE SET
+    speaker_url = excluded.speaker_url, name = excluded.name, position = excluded.position,
+    company = excluded.company, country = excluded.country, description = excluded.description,
+    updated_at = excluded.updated_at
+"""
+UPSERT_SPEAKER = f"INSERT INTO speakers ({SPEAKER_FIELDS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)" + ON_CONFLICT_UPDATE
+# Перенос спикеров из присоединенной базы staging (WHERE true отделяет SELECT от ON CONFLICT)
+MERGE_SPEAKERS = (f"INSERT INTO speakers ({SPEAKER_FIELDS}) "
+                  f"SELECT {SPEAKER_FIELDS} FROM staging.speakers WHERE true ORDER BY rowid" + ON_CONFLICT_UPDATE)
+
+# Плоская колонка -> (таблица, колонка) для агрегатов по индексам
+COLUMN_SOURCES = {
+    'position': ('speakers', 'position'),
+    'company': ('speakers', 'company'),
+    'country': ('speakers', 'country'),
+    'session_date': ('sessions', 'date'),
+    'session_time': ('sessions', 'time'),
+    'session_location': ('sessions', 'location'),
+    'session_topic_link': ('sessions', 'topic_link'),
+    'session_topic_title': ('sessions', 'topic_title'),
+}
+
+
+def speaker_sessions(speaker: Speaker) -> List[Session]:
+    """Сессии спикера; без списка sessions (например, из CSV) - одна сессия из колонок session_*"""
+    if speaker.sessions:
+        return speaker.sessions
+    session = Session(speaker.session_date, speaker.session_time, speaker.session_location,
+                      speaker.session_topic_link, speaker.session_topic_title)
+    return [session] if session != Session() else []
+
+
+def connect_readonly(path: str, timeout: float = 30) -> sqlite3.Connection:
+    """Открывает базу результатов только для чтения: файл и его схема не меняются
+
+    ValueError, если файла нет или в нем нет представления speakers_flat.
+    """
+    if not os.path.isfile(path):
+        raise ValueError(f"{path}: файл не найден")
+    conn = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True,
+                           timeout=timeout, isolation_level=None, check_same_thread=False)
+    try:
+        found = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'speakers_flat'").fetchone()
+    except sqlite3.DatabaseError as error:
+        conn.close()
+        raise ValueError(f"{path}: не база SQLite ({error})")
+    if not found:
+        conn.close()
+        raise ValueError(f"{path}: нет представления speakers_flat, это не база результатов парсера")
+    return conn
+
+
+class SpeakerDatabase:
+    """Хранилище спикеров в SQLite с нормализованной схемой
+
+    Спикеры, их сессии и ссылки на социальные сети лежат в отдельных
+    таблицах; запись идет пачками upsert по speaker_slug в одной
+    транзакции, так что повторный прогон обновляет базу, а не
+    переписывает ее. Режим WAL позволяет читать базу во время записи,
+    а транзакции BEGIN IMMEDIATE с ожиданием блокировки - писать в нее
+    из нескольких потоков и процессов. С readonly=True база открывается
+    только для чтения (см. connect_readonly).
+    """
+
+    def __init__(self, path: str, timeout: float = 30, readonly: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        if readonly:
+            self._conn = connect_readonly(path, timeout)
+            return
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    def upsert(self, speakers: List[Speaker]) -> None:
+        """Записывает пачку спикеров одной транзакцией, заменяя их сессии и ссылки"""
+        if not speakers:
+            return
+        now = time.time()
+        slugs = [(speaker.speaker_slug,) for speaker in speakers]
+        speaker_rows = [(speaker.speaker_slug, speaker.speaker_url, speaker.name, speaker.position,
+                         speaker.company, speaker.country, speaker.description, now)
+                        for speaker in speakers]
+        session_rows = [(speaker.speaker_slug, ordinal, session.date, session.time, session.location,
+                         session.topic_link, session.topic_title, session.topic_description)
+                        for speaker in speakers
+                        for ordinal, session in enumerate(speaker_sessions(speaker))]
+        link_rows = [(speaker.speaker_slug, ordinal, url)
+                     for speaker in speakers
+                     for ordinal, url in enumerate(filter(None, speaker.social_network.split('; ')))]
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(UPSERT_SPEAKER, speaker_rows)
+                self._conn.executemany("DELETE FROM sessions WHERE speaker_slug = ?", slugs)
+                self._conn.executemany("DELETE FROM social_links WHERE speaker_slug = ?", slugs)
+                self._conn.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", session_rows)
+                self._conn.executemany("INSERT INTO social_links VALUES (?, ?, ?)", link_rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def merge_from(self, path: str) -> None:
+        """Переносит все записи другой базы той же схемы одной транзакцией (upsert по speaker_slug)"""
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS staging", (path,))
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute(MERGE_SPEAKERS)
+                    for table in ('sessions', 'social_links'):
+                        self._conn.execute(f"DELETE FROM {table} WHERE speaker_slug IN "
+                                           f"(SELECT speaker_slug FROM staging.speakers)")
+                        self._conn.execute(f"INSERT INTO {table} SELECT * FROM staging.{table}")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+            finally:
+                self._conn.execute("DETACH DATABASE staging")
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM speakers")[0][0]
+
+    def rows(self) -> Iterator[Tuple[str, ...]]:
+        """Записи кортежами в порядке SPEAKER_COLUMNS (порядок первого добавления)"""
+        return iter(self._query(f"SELECT {', '.join(SPEAKER_COLUMNS)} FROM speakers_flat"))
+
+    def sessions(self) -> Dict[str, List[Session]]:
+        """Все сессии: slug -> список в порядке на странице спикера"""
+        result: Dict[str, List[Session]] = {}
+        for row in self._query("SELECT * FROM sessions ORDER BY speaker_slug, ordinal"):
+            result.setdefault(row[0], []).append(Session(*row[2:]))
+        return result
+
+    def load_speakers(self) -> Dict[str, Speaker]:
+        """Спикеры вместе с сессиями: slug -> Speaker"""
+        sessions = self.sessions()
+        speakers = {}
+        for values in self.rows():
+            speaker = Speaker(*values)
+            speaker.sessions = sessions.get(speaker.speaker_slug, [])
+            speakers[speaker.speaker_slug] = speaker
+        return speakers
+
+    def value_counts(self, name: str) -> Counter:
+        """Количество спикеров по непустым значениям колонки (GROUP BY по индексу)"""
+        if name not in COLUMN_SOURCES:
+            raise ValueError(f"Агрегат по колонке {name} не поддерживается")
+        table, column = COLUMN_SOURCES[name]
+        where = f"{column} != ''" + (" AND ordinal = 0" if table == 'sessions' else "")
+        return Counter(dict(self._query(f"SELECT {column}, COUNT(*) FROM {table} WHERE {where} GROUP BY {column}")))
+
+    def count_nonempty(self, name: str) -> int:
+        if name == 'social_network':
+            return self._query("SELECT COUNT(DISTINCT speaker_slug) FROM social_links")[0][0]
+        if name not in COLUMN_SOURCES:
+            raise ValueError(f"Агрегат по колонке {name} не поддерживается")
+        table, column = COLUMN_SOURCES[name]
+        where = f"{column} != ''" + (" AND ordinal = 0" if table == 'sessions' else "")
+        return self._query(f"SELECT COUNT(*) FROM {table} WHERE {where}")[0][0]
+
+    def speakers_on(self, date: str) -> List[str]:
+        """slug спикеров с сессией в указанный день (по индексу sessions.date)"""
+        return [row[0] for row in self._query(
+            "SELECT DISTINCT speaker_slug FROM sessions WHERE date = ? ORDER BY speaker_slug", (date,))]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
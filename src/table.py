@@ -0,0 +1,228 @@
+import csv
+import json
+import os
+from collections import Counter
+from itertools import islice
+from json.encoder import encode_basestring
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from src.models import Speaker, SPEAKER_COLUMNS
+from src.storage import SpeakerDatabase
+
+# Колонки с часто повторяющимися значениями: одинаковые строки хранятся в одном экземпляре
+INTERNED_COLUMNS = (
+    'position', 'company', 'country', 'session_date', 'session_time',
+    'session_location', 'session_topic_link', 'session_topic_title',
+)
+
+
+class SpeakerTable:
+    """Колоночное хранилище спикеров
+
+    Каждое поле хранится отдельным списком строк, объектов Speaker и
+    словарей на запись не создается. Повторяющиеся значения колонок
+    INTERNED_COLUMNS (страна, компания, дата сессии...) ссылаются на одну
+    строку из общего пула таблицы. Экспорт в CSV, JSONL, Parquet и SQLite идет
+    прямо из колонок.
+    """
+
+    __slots__ = ('columns', '_pool', '_interned')
+
+    def __init__(self):
+        self.columns: Dict[str, List[str]] = {name: [] for name in SPEAKER_COLUMNS}
+        self._pool: Dict[str, str] = {}
+        self._interned = frozenset(INTERNED_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(self.columns[SPEAKER_COLUMNS[0]])
+
+    def _intern(self, value: str) -> str:
+        return self._pool.setdefault(value, value)
+
+    def append_values(self, values: Mapping[str, Optional[str]]) -> None:
+        """Добавляет запись из отображения поле -> значение (строка CSV, JSON-объект)"""
+        for name, column in self.columns.items():
+            value = values.get(name) or ""
+            column.append(self._intern(value) if name in self._interned else value)
+
+    def append(self, speaker: Speaker) -> None:
+        for name, column in self.columns.items():
+            value = getattr(speaker, name)
+            column.append(self._intern(value) if name in self._interned else value)
+
+    def extend(self, speakers: Iterable[Speaker]) -> None:
+        for speaker in speakers:
+            self.append(speaker)
+
+    @classmethod
+    def from_speakers(cls, speakers: Iterable[Speaker]) -> 'SpeakerTable':
+        table = cls()
+        table.extend(speakers)
+        return table
+
+    @classmethod
+    def from_csv(cls, filename: str) -> 'SpeakerTable':
+        table = cls()
+        with open(filename, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            positions = [(header.index(name) if name in header else None, table.columns[name], name in table._interned)
+                         for name in SPEAKER_COLUMNS]
+            for row in reader:
+                for index, column, interned in positions:
+                    value = row[index] if index is not None and index < len(row) else ""
+                    column.append(table._intern(value) if interned else value)
+        return table
+
+    @classmethod
+    def from_jsonl(cls, filename: str) -> 'SpeakerTable':
+        table = cls()
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    table.append_values(json.loads(line))
+        return table
+
+    @classmethod
+    def from_sqlite(cls, filename: str) -> 'SpeakerTable':
+        table = cls()
+        db = SpeakerDatabase(filename, readonly=True)
+        try:
+            for values in db.rows():
+                table.append_values(dict(zip(SPEAKER_COLUMNS, values)))
+        finally:
+            db.close()
+        return table
+
+    @classmethod
+    def from_parquet(cls, filename: str) -> 'SpeakerTable':
+        from src.columnar import read_table
+
+        table = cls()
+        data = read_table(filename, SPEAKER_COLUMNS)
+        for name, column in table.columns.items():
+            if name not in data.column_names:
+                column.extend([""] * data.num_rows)
+                continue
+            for chunk in data.column(name).chunks:
+                if hasattr(chunk, 'dictionary'):
+                    # Словарная колонка: каждое значение декодируется один раз
+                    values = [table._intern(value or "") for value in chunk.dictionary.to_pylist()] + [""]
+                    column.extend([values[index] for index in chunk.indices.fill_null(len(values) - 1).to_pylist()])
+                else:
+                    column.extend([value or "" for value in chunk.to_pylist()])
+        return table
+
+    @classmethod
+    def load(cls, filename: str) -> 'SpeakerTable':
+        """Загружает результат парсинга (формат по расширению: .csv, .jsonl, .parquet или .sqlite)"""
+        if filename.endswith('.jsonl'):
+            return cls.from_jsonl(filename)
+        if filename.endswith('.parquet'):
+            return cls.from_parquet(filename)
+        if filename.endswith('.sqlite'):
+            return cls.from_sqlite(filename)
+        return cls.from_csv(filename)
+
+    def merge(self, other: 'SpeakerTable', key: str = 'speaker_url') -> int:
+        """Добавляет записи other, которых еще нет в таблице (по колонке key)
+
+        У уже известной записи заполняются только пустые поля. Возвращает
+        количество найденных повторов.
+        """
+        positions = {value: index for index, value in enumerate(self.columns[key])}
+        duplicates = 0
+        for values in other.rows():
+            record = dict(zip(SPEAKER_COLUMNS, values))
+            index = positions.get(record[key])
+            if index is None:
+                positions[record[key]] = len(self)
+                self.append_values(record)
+                continue
+            duplicates += 1
+            for name, column in self.columns.items():
+                if not column[index] and record[name]:
+                    column[index] = self._intern(record[name]) if name in self._interned else record[name]
+        return duplicates
+
+    def column(self, name: str) -> List[str]:
+        return self.columns[name]
+
+    def rows(self) -> Iterator[Tuple[str, ...]]:
+        """Записи кортежами в порядке SPEAKER_COLUMNS"""
+        return zip(*(self.columns[name] for name in SPEAKER_COLUMNS))
+
+    def row(self, index: int) -> Speaker:
+        return Speaker(*(self.columns[name][index] for name in SPEAKER_COLUMNS))
+
+    def __iter__(self) -> Iterator[Speaker]:
+        for values in self.rows():
+            yield Speaker(*values)
+
+    def value_counts(self, name: str) -> Counter:
+        """Количество записей по непустым значениям колонки"""
+        counts = Counter(self.columns[name])
+        counts.pop("", None)
+        return counts
+
+    def count_nonempty(self, name: str) -> int:
+        return sum(1 for value in self.columns[name] if value)
+
+    def to_csv(self, filename: str) -> None:
+        """Записывает CSV с колонками в порядке SPEAKER_COLUMNS (как CSVSink)"""
+        tmp_filename = filename + '.part'
+        with open(tmp_filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(SPEAKER_COLUMNS)
+            writer.writerows(self.rows())
+        os.replace(tmp_filename, filename)
+
+    def to_jsonl(self, filename: str) -> None:
+        """Записывает JSON Lines (как JSONLSink) без промежуточного словаря на запись"""
+        # Ключи кодируются один раз, значения - C-функцией экранирования строк json
+        prefixes = ['{' + encode_basestring(SPEAKER_COLUMNS[0]) + ': ']
+        prefixes += [', ' + encode_basestring(name) + ': ' for name in SPEAKER_COLUMNS[1:]]
+        tmp_filename = filename + '.part'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            for values in self.rows():
+                f.write(''.join([prefix + encode_basestring(value) for prefix, value in zip(prefixes, values)]))
+                f.write('}\n')
+        os.replace(tmp_filename, filename)
+
+    def to_parquet(self, filename: str) -> None:
+        """Записывает Parquet по схеме src.columnar (словарные колонки, сжатие zstd, нужен pyarrow)"""
+        from src.columnar import write_table
+
+        write_table(self.columns, filename)
+
+    def to_sqlite(self, filename: str, batch_size: int = 1000) -> None:
+        """Записывает новую базу SQLite (схема SpeakerDatabase, сессия - из колонок session_*)"""
+        tmp_filename = filename + '.part'
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        db = SpeakerDatabase(tmp_filename)
+        try:
+            rows = self.rows()
+            while True:
+                batch = [Speaker(*values) for values in islice(rows, batch_size)]
+                if not batch:
+                    break
+                db.upsert(batch)
+        finally:
+            db.close()
+        os.replace(tmp_filename, filename)
+
+    EXPORTS = {
+        'csv': 'to_csv',
+        'jsonl': 'to_jsonl',
+        'parquet': 'to_parquet',
+        'sqlite': 'to_sqlite',
+    }
+
+    def export(self, filename: str, output_format: str) -> None:
+        """Записывает таблицу в файл указанного формата"""
+        try:
+            method = self.EXPORTS[output_format]
+        except KeyError:
+            raise ValueError(f"Неизвестный формат вывода: {output_format}")
+        getattr(self, method)(filename)
@@ -0,0 +1,323 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+class TransportError(Exception):
+    """Сетевая ошибка запроса (соединение, чтение ответа и т.п.)"""
+
+
+class TransportTimeout(TransportError):
+    """Истек таймаут соединения или чтения"""
+
+
+@dataclass
+class RequestTimings:
+    """Время этапов одного запроса в секундах
+
+    connect включает разрешение имени (DNS) и TCP-соединение: urllib3 и
+    httpcore выполняют их одним вызовом. Для запроса по уже открытому
+    соединению (keep-alive) connect и tls равны нулю.
+    """
+
+    connect: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    total: float = 0.0
+    new_connection: bool = False
+
+    def __str__(self) -> str:
+        return (f"connect={self.connect * 1000:.0f}ms tls={self.tls * 1000:.0f}ms "
+                f"ttfb={self.ttfb * 1000:.0f}ms download={self.download * 1000:.0f}ms "
+                f"total={self.total * 1000:.0f}ms")
+
+
+@dataclass
+class TransportResponse:
+    """Ответ сервера, одинаковый для всех транспортов"""
+
+    url: str
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+    http_version: str
+    timings: RequestTimings
+
+
+class TransportStats:
+    """Накопленные показатели транспорта за прогон (потокобезопасно)"""
+
+    FIELDS = ('connect', 'tls', 'ttfb', 'download', 'total')
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.totals = {name: 0.0 for name in self.FIELDS}
+        self._lock = threading.Lock()
+
+    def record(self, timings: RequestTimings) -> None:
+        with self._lock:
+            self.requests += 1
+            self.new_connections += timings.new_connection
+            for name in self.FIELDS:
+                self.totals[name] += getattr(timings, name)
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.requests:
+                return "запросов не было"
+            averages = ' '.join(f"{name}={self.totals[name] / self.requests * 1000:.0f}ms"
+                                for name in self.FIELDS)
+            handshake = self.totals['connect'] + self.totals['tls']
+            return (f"запросов: {self.requests}, новых соединений: {self.new_connections}, "
+                    f"на установку соединений: {handshake:.2f} сек; в среднем {averages}")
+
+
+def is_installed(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def accept_encoding() -> str:
+    """Значение Accept-Encoding: br только если установлен декодер brotli"""
+    if is_installed('brotli') or is_installed('brotlicffi'):
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+class Transport(ABC):
+    """HTTP-клиент, через который парсер выполняет все запросы
+
+    Все реализации держат пул постоянных соединений, запрашивают сжатые
+    ответы и повторяют только неудавшиеся попытки соединения - запрос до
+    сервера при этом не дошел, поэтому повтор безопасен. Повторы по
+    HTTP-статусам выполняет парсер с учетом ограничителя скорости.
+    """
+
+    name = ''
+
+    def __init__(self):
+        self.stats = TransportStats()
+
+    @abstractmethod
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Mapping[str, str]] = None, timeout: float = 30) -> TransportResponse:
+        """GET-запрос; сетевые ошибки бросаются как TransportError/TransportTimeout"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Закрывает соединения"""
+
+
+# Время установки соединения, измеренное в рабочем потоке urllib3
+_connection_timings = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Замеряет TCP-соединение (вместе с DNS) и TLS-рукопожатие нового соединения"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        _connection_timings.connect = time.perf_counter() - started
+        return sock
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - started
+        _connection_timings.tls = max(0.0, elapsed - getattr(_connection_timings, 'connect', 0.0))
+        _connection_timings.new_connection = True
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class RequestsTransport(Transport):
+    """requests/urllib3: HTTP/1.1 с keep-alive и пулом нужного размера
+
+    По умолчанию urllib3 держит не больше 10 соединений на хост и
+    закрывает лишние, поэтому при большем числе потоков соединения
+    открывались бы заново на каждый запрос.
+    """
+
+    name = 'requests'
+
+    def __init__(self, pool_size: int, headers: Mapping[str, str], connect_retries: int = 0):
+        super().__init__()
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.session.headers['Accept-Encoding'] = accept_encoding()
+        self.session.headers['Connection'] = 'keep-alive'
+        adapter = _TimedHTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=None, connect=connect_retries, read=0, status=0, other=0,
+                              backoff_factor=0.2, raise_on_status=False)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Mapping[str, str]] = None, timeout: float = 30) -> TransportResponse:
+        _connection_timings.connect = 0.0
+        _connection_timings.tls = 0.0
+        _connection_timings.new_connection = False
+
+        started = time.perf_counter()
+        try:
+            # stream=True возвращает ответ сразу после заголовков: так отделяется TTFB от загрузки тела
+            response = self.session.get(url, params=params, headers=headers, timeout=timeout, stream=True)
+            headers_received = time.perf_counter()
+            content = response.content
+        except requests.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+        finished = time.perf_counter()
+
+        timings = RequestTimings(
+            connect=_connection_timings.connect,
+            tls=_connection_timings.tls,
+            download=finished - headers_received,
+            total=finished - started,
+            new_connection=_connection_timings.new_connection
+        )
+        timings.ttfb = max(0.0, headers_received - started - timings.connect - timings.tls)
+        self.stats.record(timings)
+
+        version = response.raw.version if response.raw is not None else 11
+        return TransportResponse(
+            url=response.url,
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            http_version=f"HTTP/{version // 10}.{version % 10}",
+            timings=timings
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HttpxTransport(Transport):
+    """httpx: HTTP/2 (если установлен пакет h2) - все потоки делят несколько соединений
+
+    Время этапов берется из событий trace библиотеки httpcore.
+    """
+
+    name = 'httpx'
+
+    def __init__(self, pool_size: int, headers: Mapping[str, str], connect_retries: int = 0,
+                 http2: bool = True, keepalive_expiry: float = 30):
+        super().__init__()
+        import httpx
+        self._httpx = httpx
+        self.http2 = http2 and is_installed('h2')
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                              keepalive_expiry=keepalive_expiry)
+        client_headers = dict(headers)
+        client_headers['Accept-Encoding'] = accept_encoding()
+        self.client = httpx.Client(
+            headers=client_headers,
+            follow_redirects=True,
+            transport=httpx.HTTPTransport(http2=self.http2, limits=limits, retries=connect_retries)
+        )
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Mapping[str, str]] = None, timeout: float = 30) -> TransportResponse:
+        httpx = self._httpx
+        events: Dict[str, float] = {}
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            events[event_name] = time.perf_counter()
+
+        started = time.perf_counter()
+        try:
+            with self.client.stream('GET', url, params=params, headers=headers, timeout=timeout,
+                                    extensions={'trace': trace}) as response:
+                headers_received = time.perf_counter()
+                content = response.read()
+        except httpx.TimeoutException as e:
+            raise TransportTimeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+        finished = time.perf_counter()
+
+        def duration(stage: str) -> float:
+            start, end = events.get(f'connection.{stage}.started'), events.get(f'connection.{stage}.complete')
+            return end - start if start is not None and end is not None else 0.0
+
+        timings = RequestTimings(
+            connect=duration('connect_tcp'),
+            tls=duration('start_tls'),
+            download=finished - headers_received,
+            total=finished - started,
+            new_connection='connection.connect_tcp.started' in events
+        )
+        timings.ttfb = max(0.0, headers_received - started - timings.connect - timings.tls)
+        self.stats.record(timings)
+
+        return TransportResponse(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            http_version=response.http_version,
+            timings=timings
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+TRANSPORTS = {
+    'requests': RequestsTransport,
+    'httpx': HttpxTransport,
+}
+
+
+def create_transport(name: str, pool_size: int, headers: Mapping[str, str],
+                     connect_retries: int = 0, http2: bool = True) -> Transport:
+    """Создает транспорт по имени; httpx должен быть установлен"""
+    if name not in TRANSPORTS:
+        raise ValueError(f"Неизвестный транспорт: {name}")
+    if name == 'httpx':
+        if not is_installed('httpx'):
+            raise ValueError("Транспорт httpx недоступен: pip install 'httpx[http2]'")
+        return HttpxTransport(pool_size, headers, connect_retries, http2)
+    return RequestsTransport(pool_size, headers, connect_retries)
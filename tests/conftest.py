@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockConfig, running_server
+from src.scraper import DSEISpeakerScraper
+
+# Три страницы списка (20 + 20 + 5), обвязка страниц маленькая: тесты быстрые
+SPEAKERS = 45
+
+
+@pytest.fixture(scope='session', autouse=True)
+def run_dirs(tmp_path_factory):
+    """Каталоги данных и лог парсера - во временном каталоге: тесты не трогают data/ и logs/"""
+    root = tmp_path_factory.mktemp('run')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr('config.settings.DATA_DIR', str(root / 'data'))
+        patch.setattr('config.settings.LOGS_DIR', str(root / 'logs'))
+        patch.setattr('src.scraper.LOG_FILE', str(root / 'logs' / 'scraper.log'))
+        yield root
+
+
+@pytest.fixture(scope='session')
+def site():
+    """Исправный тестовый сервер, общий для всех тестов"""
+    with running_server(MockConfig(speakers=SPEAKERS, page_kb=1)) as base_url:
+        yield base_url
+
+
+@pytest.fixture
+def make_scraper(tmp_path):
+    """Парсер без лимита запросов, все файлы прогона - во временном каталоге"""
+
+    def make(base_url, output_file=None, **kwargs):
+        options = dict(
+            base_url=base_url,
+            max_workers=4,
+            requests_per_second=0,
+            adaptive=False,
+            output_file=str(output_file or tmp_path / 'speakers.csv'),
+            metrics_file=None,
+            checkpoint_file=str(tmp_path / 'checkpoint.jsonl'),
+        )
+        options.update(kwargs)
+        return DSEISpeakerScraper(**options)
+
+    return make
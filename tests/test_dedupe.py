@@ -0,0 +1,92 @@
+import csv
+import sqlite3
+from contextlib import closing
+
+from src.dedupe import PersonIndex, PersonRegistry, resolve_people
+from src.models import SPEAKER_COLUMNS, Speaker
+from src.storage import SpeakerDatabase
+
+
+def clusters(records, order=None):
+    """Кластеры номеров записей records, добавленных в порядке order"""
+    order = order or list(range(len(records)))
+    index = PersonIndex()
+    for number in order:
+        index.add(*records[number])
+    return sorted(sorted(order[member] for member in members) for members in index.clusters().values())
+
+
+def write_results(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, SPEAKER_COLUMNS)
+        writer.writeheader()
+        for slug, name, company, position in rows:
+            writer.writerow({'speaker_url': f'https://example.test/speakers/{slug}', 'speaker_slug': slug,
+                             'name': name, 'company': company, 'position': position})
+
+
+def person_ids(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return {row['speaker_slug']: row['person_id'] for row in csv.DictReader(f)}
+
+
+def test_variants_of_one_name_match():
+    records = [('John Smith', 'BAE Systems', 'CEO'), ('Jon Smith', 'BAE Systems Ltd', 'CEO'),
+               ('Dr. John A. Smith', 'BAE Systems', 'CEO'), ('Smith, John', 'BAE Systems plc', '')]
+    assert clusters(records) == [[0, 1, 2, 3]]
+
+
+def test_different_people_at_one_company_stay_apart():
+    records = [('John Smith', 'BAE Systems', 'CEO'), ('John Brown', 'BAE Systems', 'CEO'),
+               ('John Smith', 'Thales UK', 'Chief Engineer')]
+    assert clusters(records) == [[0], [1], [2]]
+
+
+def test_initial_does_not_bridge_different_first_names():
+    records = [('John Smith', 'BAE', 'CEO'), ('Jane Smith', 'BAE', 'CEO'), ('J Smith', 'BAE', 'CEO')]
+    for order in ([0, 1, 2], [2, 0, 1], [0, 2, 1], [2, 1, 0]):
+        result = clusters(records, order)
+        assert [0, 1] not in result and [0, 1, 2] not in result
+        assert len(result) == 2
+
+
+def test_records_without_company_match_by_full_name():
+    records = [('Maria Evans', '', ''), ('Maria Evans', '', ''), ('Mary Evans', '', ''),
+               ('Maria Evans', 'BAE Systems', 'CEO')]
+    assert clusters(records)[0] == [0, 1]
+    assert [2] in clusters(records)
+
+
+def test_registry_keeps_person_ids(tmp_path):
+    first, second = tmp_path / 'first.csv', tmp_path / 'second.csv'
+    write_results(first, [('john-smith', 'John Smith', 'BAE Systems', 'CEO'),
+                          ('jane-smith', 'Jane Smith', 'BAE Systems', 'CTO')])
+    write_results(second, [('smith-j', 'Jon Smith', 'BAE Systems', 'CEO'),
+                           ('maria-evans', 'Maria Evans', '', '')])
+    registry = PersonRegistry(str(tmp_path / 'people.sqlite'))
+
+    report = resolve_people([str(first)], str(tmp_path / 'people.csv'), registry)
+    assert (report.records, report.people, report.new_people) == (2, 2, 2)
+    before = person_ids(tmp_path / 'people.csv')
+
+    # Второй запуск видит только новый файл: прежние люди берутся из реестра
+    report = resolve_people([str(second)], str(tmp_path / 'people.csv'), registry)
+    after = person_ids(tmp_path / 'people.csv')
+    assert report.new_people == 1
+    assert after['smith-j'] == before['john-smith']
+    assert after['maria-evans'] not in before.values()
+
+
+def test_sqlite_input_is_not_modified(tmp_path):
+    database = tmp_path / 'speakers.sqlite'
+    db = SpeakerDatabase(str(database))
+    db.upsert([Speaker(speaker_slug='maria-evans', speaker_url='https://example.test/speakers/maria-evans',
+                       name='Maria Evans', company='BAE Systems')])
+    db.close()
+    # Чтение не должно переключать базу в WAL и менять ее схему
+    with closing(sqlite3.connect(database)) as conn:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    before = database.read_bytes()
+    report = resolve_people([str(database)], str(tmp_path / 'people.csv'))
+    assert report.records == 1
+    assert database.read_bytes() == before
@@ -0,0 +1,26 @@
+from src.journal import CheckpointJournal
+from src.models import SpeakerSlug
+
+
+def test_resume_after_torn_line(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    path.write_text('{"type": "slug", "slug": "a"}\n{"type": "slug", "slug": "b"', encoding='utf-8')
+    journal = CheckpointJournal(str(path), flush_every=1)
+    state = journal.open(resume=True)
+    assert [entry.slug for entry in state.slugs] == ['a']
+    journal.append_slug(SpeakerSlug(slug='c'))
+    journal.append_slug(SpeakerSlug(slug='d'))
+    journal.close()
+    assert [entry.slug for entry in journal.load().slugs] == ['a', 'c', 'd']
+
+
+def test_resume_without_torn_line(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    path.write_text('{"type": "slug", "slug": "a"}\n', encoding='utf-8')
+    journal = CheckpointJournal(str(path), flush_every=1)
+    journal.open(resume=True)
+    journal.append_skipped('b')
+    journal.close()
+    state = journal.load()
+    assert [entry.slug for entry in state.slugs] == ['a']
+    assert state.skipped == {'b'}
@@ -0,0 +1,16 @@
+from src.metrics import percentile
+
+
+def test_percentile_nearest_rank():
+    hundred = [float(value) for value in range(1, 101)]
+    assert percentile(hundred, 50) == 50
+    assert percentile(hundred, 95) == 95
+    assert percentile(hundred, 99) == 99
+    assert percentile(hundred, 100) == 100
+    ten = [float(value) for value in range(1, 11)]
+    assert percentile(ten, 50) == 5
+    assert percentile(ten, 0) == 1
+    twenty = [float(value) for value in range(1, 21)]
+    assert percentile(twenty, 95) == 19
+    assert percentile([7.0], 99) == 7
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,60 @@
+import glob
+import os
+
+import pytest
+
+from config.settings import LISTING_HREF_MARKERS, SPEAKER_ENTRY_CLASS
+from src.extract import SpeakerExtractor
+from src.parsing import AUTO_ORDER, is_available, parse_html, parse_links
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+# Сохраненные страницы: списки и детальные страницы тестового сервера и страница с редкой разметкой
+PAGES = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'pages', '*.html')))
+REFERENCE_BACKEND = 'html.parser'
+
+
+def read_page(name):
+    with open(os.path.join(FIXTURES_DIR, 'pages', name), 'rb') as f:
+        return f.read()
+
+
+def extract(content, backend):
+    """Извлечение страницы так же, как при парсинге: как списка спикеров и как детальной страницы"""
+    extractor = SpeakerExtractor()
+    listing = extractor.analyze_listing_page(parse_links(content, backend, LISTING_HREF_MARKERS))
+    speaker = extractor.extract_speaker_details(parse_html(content, backend, SPEAKER_ENTRY_CLASS), 'fixture')
+    return listing, speaker
+
+
+@pytest.mark.parametrize('backend', [name for name in AUTO_ORDER if name != REFERENCE_BACKEND])
+@pytest.mark.parametrize('path', PAGES, ids=os.path.basename)
+def test_backends_extract_the_same(path, backend):
+    if not is_available(backend):
+        pytest.skip(f"{backend} не установлен")
+    with open(path, 'rb') as f:
+        content = f.read()
+    assert extract(content, backend) == extract(content, REFERENCE_BACKEND)
+
+
+def test_listing_page():
+    listing, _ = extract(read_page('listing-page-3.html'), REFERENCE_BACKEND)
+    assert [entry.slug for entry in listing.slugs] == [f'{name}-evans-{index}' for index, name in
+                                                       zip(range(40, 45), ('alex', 'maria', 'john', 'olga', 'james'))]
+    assert listing.max_page == 3
+
+
+def test_edge_markup():
+    _, speaker = extract(read_page('speaker-edge.html'), REFERENCE_BACKEND)
+    assert speaker.name == "Dr. Zoë O'Brien-Łukasiewicz"
+    assert speaker.position == 'Head of R&D (Air & Space)'
+    assert speaker.company == 'Société Générale de Défense'
+    assert speaker.country == 'Côte d’Ivoire'
+    assert 'not a paragraph' not in speaker.description
+    assert speaker.social_network == ''
+    # Сессия вне списка сессий, локация - из деталей спикера
+    assert len(speaker.sessions) == 1
+    session = speaker.sessions[0]
+    assert session.time == '09:30 – 10:15'
+    assert session.location == 'ExCeL London, North Hall'
+    assert session.topic_link == 'https://www.dsei.co.uk/sessions/keynote?id=1&lang=en'
+    assert session.topic_title == 'Keynote: Autonomy & Trust'
@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+from benchmarks.mock_server import MockConfig, running_server
+from src.archive import ResponseArchive
+from src.cache import ResponseCache
+from src.incremental import state_filename
+from src.sinks import partial_filename
+from tests.conftest import SPEAKERS
+
+PREVIOUS_RESULT = 'speaker_slug\nprevious-run\n'
+# Seed ошибок тестового сервера, при котором часть спикеров не загружается
+SEED = 0
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def counters(scraper):
+    return scraper.metrics.summary()['counters']
+
+
+@pytest.fixture
+def reference(site, make_scraper, tmp_path):
+    """Результат полного прогона без сбоев"""
+    scraper = make_scraper(site, output_file=tmp_path / 'reference.csv',
+                           checkpoint_file=str(tmp_path / 'reference.jsonl'))
+    assert scraper.run()
+    return read(tmp_path / 'reference.csv')
+
+
+def test_full_run(site, make_scraper, tmp_path, reference):
+    assert reference.count('\n') == SPEAKERS + 1
+    assert not os.path.exists(tmp_path / 'reference.jsonl')
+
+
+def test_resume_after_interrupt(site, make_scraper, tmp_path, reference):
+    output = tmp_path / 'speakers.csv'
+    output.write_text(PREVIOUS_RESULT, encoding='utf-8')
+    interrupted = make_scraper(site)
+    fetch_speaker = interrupted.fetch_speaker
+    fetched = []
+
+    def fetch_and_interrupt(speaker_slug):
+        speaker = fetch_speaker(speaker_slug)
+        fetched.append(speaker_slug.slug)
+        if len(fetched) >= 10:
+            interrupted.stop_event.set()
+        return speaker
+
+    interrupted.fetch_speaker = fetch_and_interrupt
+    assert not interrupted.run()
+    # Прерванный прогон не трогает прежний результат и оставляет журнал
+    assert read(output) == PREVIOUS_RESULT
+    assert os.path.exists(tmp_path / 'checkpoint.jsonl')
+
+    resumed = make_scraper(site, resume=True)
+    assert resumed.run()
+    assert read(output) == reference
+    assert not os.path.exists(tmp_path / 'checkpoint.jsonl')
+    # Спикеры из журнала повторно не загружаются
+    assert counters(resumed)['requests'] < SPEAKERS
+
+
+def test_incremental_revalidates_with_304(site, make_scraper, tmp_path, reference):
+    # Записи кэша сразу устаревают: каждая страница перепроверяется условным запросом
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=0, max_bytes=10 ** 8)
+    assert make_scraper(site, cache=cache).run()
+    updated = make_scraper(site, cache=cache, incremental=True)
+    assert updated.run()
+
+    report = updated.incremental_report
+    assert (report.added, report.changed, report.removed, report.unchanged) == ([], [], [], SPEAKERS)
+    assert counters(updated)['http_304'] == counters(updated)['requests']
+    assert 'http_200' not in counters(updated)
+    assert read(tmp_path / 'speakers.csv') == reference
+    assert os.path.exists(state_filename(str(tmp_path / 'speakers.csv')))
+
+
+def test_incremental_state_saved_only_with_result(site, make_scraper, tmp_path, monkeypatch):
+    monkeypatch.setattr('src.scraper.CIRCUIT_FAILURE_THRESHOLD', 10 ** 6)
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=0, max_bytes=10 ** 8)
+    assert make_scraper(site, cache=cache, incremental=True).run()
+    state_file = state_filename(str(tmp_path / 'speakers.csv'))
+    os.remove(state_file)
+
+    with running_server(MockConfig(speakers=SPEAKERS, page_kb=1, error_rate=0.5, seed=SEED)) as base_url:
+        updated = make_scraper(base_url, cache=cache, incremental=True, max_workers=1)
+        assert not updated.run()
+    # Хэши неполного прогона не сохраняются: следующий прогон перепроверит спикеров заново
+    assert updated.incremental_report.added == []
+    assert not os.path.exists(state_file)
+
+
+def test_partial_failure_keeps_previous_result(make_scraper, tmp_path, monkeypatch):
+    # Один поток без конвейера: ошибки сервера с тем же seed воспроизводятся от прогона к прогону
+    monkeypatch.setattr('src.scraper.CIRCUIT_FAILURE_THRESHOLD', 10 ** 6)
+    output = tmp_path / 'speakers.csv'
+    output.write_text(PREVIOUS_RESULT, encoding='utf-8')
+    with running_server(MockConfig(speakers=SPEAKERS, page_kb=1, error_rate=0.5, seed=SEED)) as base_url:
+        scraper = make_scraper(base_url, max_workers=1, pipeline=False)
+        assert not scraper.run()
+
+    assert scraper.failed_slugs
+    assert 0 < scraper.speakers_count < SPEAKERS
+    assert read(output) == PREVIOUS_RESULT
+    assert read(partial_filename(str(output))).count('\n') == scraper.speakers_count + 1
+    assert os.path.exists(tmp_path / 'checkpoint.jsonl')
+
+
+def test_missing_page_is_skipped(make_scraper, tmp_path):
+    output = tmp_path / 'speakers.csv'
+    with running_server(MockConfig(speakers=SPEAKERS, page_kb=1, missing=1)) as base_url:
+        scraper = make_scraper(base_url)
+        # Страница удаленного спикера (404) не делает прогон неполным
+        assert scraper.run()
+    assert scraper.skipped_slugs == ['james-evans-44']
+    assert not scraper.failed_slugs
+    assert read(output).count('\n') == SPEAKERS
+    assert not os.path.exists(tmp_path / 'checkpoint.jsonl')
+
+
+def test_archive_stores_downloaded_pages_only(site, make_scraper, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=0, max_bytes=10 ** 8)
+    archive = ResponseArchive(str(tmp_path / 'archive'))
+    assert make_scraper(site, cache=cache, archive=archive).run()
+    # Страницы списка и детальные страницы
+    downloaded = read(archive.index_file).count('\n')
+    assert downloaded == SPEAKERS + 3
+    # Повторный прогон получает ответы 304 и в индекс архива ничего не добавляет
+    assert make_scraper(site, cache=cache, archive=archive).run()
+    assert read(archive.index_file).count('\n') == downloaded